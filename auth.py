@@ -15,15 +15,19 @@ import socket
 # Load environment variables
 load_dotenv()
 
-# Initialize MongoDB connection
-try:
-    MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
-    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
-    db = client['stockmarket']
-    users_collection = db['users']
-    users_collection.create_index([("email", pymongo.ASCENDING)], unique=True)
-except Exception as e:
-    st.error(f"Database connection error: {str(e)}")
+# MongoDB connection, opened on first use so the login page renders without waiting for it
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
+_users_collection = None
+
+def get_users_collection():
+    """Return the users collection, connecting and creating the email index on first use"""
+    global _users_collection
+    if _users_collection is None:
+        client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
+        users = client['stockmarket']['users']
+        users.create_index([("email", pymongo.ASCENDING)], unique=True)
+        _users_collection = users
+    return _users_collection
 
 # Email configuration with fallback options
 EMAIL_CONFIG = {
@@ -371,6 +375,7 @@ def signup_user(first_name, last_name, email, password):
         if len(password) < 6:
             return False, "Password must be at least 6 characters"
             
+        users_collection = get_users_collection()
         if users_collection.find_one({"email": email}):
             return False, "Email already registered"
         
@@ -391,6 +396,7 @@ def signup_user(first_name, last_name, email, password):
 def login_user(email, password):
     """Login user"""
     try:
+        users_collection = get_users_collection()
         user = users_collection.find_one({"email": email})
         if user and verify_password(password, user['password']):
             # Set all required session state variables
@@ -0,0 +1,67 @@
+"""
+Benchmark the autoregressive forecast loop with the compiled step against
+model.predict().
+
+Usage:
+    python benchmarks/bench_forecast.py [--steps 60] [--batch 1 16] [--time-steps 10] [--features 4]
+
+Needs TensorFlow. An untrained Live Analysis LSTM forecasts --steps days for
+--batch windows at once, once through model.predict() (FORECAST_COMPILED_STEP=0)
+and once through the traced tf.function step. The first forecast of a model
+includes tracing; the warm time is the best of three further forecasts. The
+predictions of both paths are checked to be identical.
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+
+import numpy as np
+
+from common import best_of, format_seconds
+from stock_analytics.forecasting import COMPILED_STEP_ENV, forecast_scaled
+from stock_analytics.lstm_models import build_live_model
+
+
+def timed_forecasts(model, windows, n_steps):
+    """First (cold) and best warm forecast time, and the predictions"""
+    start = time.perf_counter()
+    predictions = forecast_scaled(model, windows, n_steps)
+    cold = time.perf_counter() - start
+    warm = best_of(lambda: forecast_scaled(model, windows, n_steps))
+    return cold, warm, predictions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=60)
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--time-steps", type=int, default=10)
+    parser.add_argument("--features", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{args.steps} steps, {args.time_steps} x {args.features} windows")
+    print(f"{'batch':>6} {'predict cold':>13} {'warm':>10} {'compiled cold':>14} {'warm':>10} {'speedup':>9}  identical")
+    rng = np.random.default_rng(0)
+    for batch in args.batch:
+        windows = rng.random((batch, args.time_steps, args.features), dtype=np.float32)
+
+        # Step functions are cached per model, so each path gets its own copy of the weights
+        os.environ[COMPILED_STEP_ENV] = "0"
+        predict_model = build_live_model(args.time_steps, args.features)
+        predict_cold, predict_warm, expected = timed_forecasts(predict_model, windows, args.steps)
+
+        os.environ.pop(COMPILED_STEP_ENV)
+        compiled_model = build_live_model(args.time_steps, args.features)
+        compiled_model.set_weights(predict_model.get_weights())
+        compiled_cold, compiled_warm, got = timed_forecasts(compiled_model, windows, args.steps)
+
+        identical = np.array_equal(expected, got)
+        print(f"{batch:>6} {format_seconds(predict_cold):>13} {format_seconds(predict_warm):>10} "
+              f"{format_seconds(compiled_cold):>14} {format_seconds(compiled_warm):>10} "
+              f"{predict_warm / compiled_warm:>8.1f}x  {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark history loading through the local store against a slow provider.
+
+Usage:
+    python benchmarks/bench_history.py [--tickers 50] [--latency 0.05]
+
+Serves synthetic fixtures through LocalFileProvider with a fixed per-request
+latency and compares one request per ticker with grouped batch requests,
+both on a cold store and on a warm store that only needs the latest bars.
+"""
+import argparse
+import datetime
+import os
+import tempfile
+
+from common import best_of, format_seconds
+from make_fixtures import write_fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_history_")
+    os.environ["OHLCV_STORE_DIR"] = os.path.join(workdir, "store")
+    fixtures = os.path.join(workdir, "fixtures")
+    tickers = [f"T{i:04d}" for i in range(args.tickers)]
+    write_fixtures(fixtures, tickers, args.rows)
+
+    from stock_analytics import history
+    from stock_analytics.market_data import LocalFileProvider
+
+    provider = LocalFileProvider(fixtures, latency=args.latency)
+    end = datetime.date.today()
+    start = end - datetime.timedelta(days=int(args.rows * 1.4))
+
+    def reset():
+        for ticker in tickers:
+            history.get_store(provider).delete(ticker)
+
+    def per_ticker():
+        store = history.get_store(provider)
+        for ticker in tickers:
+            store.update(ticker, start, end, provider.history)
+
+    def batched():
+        history.load_stock_data_batch(tickers, start, end, provider=provider)
+
+    print(f"{args.tickers} tickers, {args.latency * 1e3:.0f} ms latency per request")
+    for label, load in (("per-ticker", per_ticker), ("batched", batched)):
+        cold = best_of(lambda: (reset(), load()), repeat=1)
+        warm = best_of(load, repeat=3)
+        print(f"{label:<12} cold {format_seconds(cold):>10}   warm {format_seconds(warm):>10}")
+
+
+if __name__ == "__main__":
+    main()
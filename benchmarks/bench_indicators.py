@@ -0,0 +1,58 @@
+"""
+Benchmark incremental indicator updates against recomputing add_indicators().
+
+Usage:
+    python benchmarks/bench_indicators.py [--sizes 756 5000 50000] [--new-bars 1]
+
+For every history size the incremental cache is primed with the history,
+then --new-bars bars are appended. That refresh is compared with a full
+add_indicators() pass over the extended history, and both frames are
+checked for bit-for-bit equality. Copy-on-write is enabled as in the app. The per-bar cost of IndicatorEngine.update()
+is reported as well.
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from common import best_of, format_seconds, make_ohlcv
+from stock_analytics.indicators import add_indicators
+from stock_analytics.streaming_indicators import IncrementalIndicators, IndicatorEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[756, 5_000, 50_000])
+    parser.add_argument("--new-bars", type=int, default=1)
+    args = parser.parse_args()
+    # As in the app, which lets the cache hand out lazy copies of its frames
+    pd.set_option("mode.copy_on_write", True)
+
+    print(f"{'rows':>8} {'add_indicators':>15} {'incremental':>12} {'speedup':>9} {'per bar':>10}  identical")
+    for n_rows in args.sizes:
+        df = make_ohlcv(n_rows + args.new_bars)
+        history = df.iloc[:n_rows]
+
+        full = best_of(lambda: add_indicators(df))
+
+        # Each timing primes a fresh cache with the history, then times the refresh alone
+        incremental = float("inf")
+        for _ in range(3):
+            cache = IncrementalIndicators()
+            cache.update("T", history)
+            incremental = min(incremental, best_of(lambda: cache.update("T", df), repeat=1))
+
+        engine = IndicatorEngine()
+        rows = df[["High", "Low", "Close"]].to_numpy().tolist()
+        per_bar = best_of(lambda: [engine.update(*row) for row in rows], repeat=1) / len(rows)
+
+        expected = add_indicators(df)
+        got = cache.update("T", df)
+        identical = all(np.array_equal(expected[col].to_numpy(), got[col].to_numpy(), equal_nan=True)
+                        for col in expected.columns)
+        print(f"{n_rows:>8,} {format_seconds(full):>15} {format_seconds(incremental):>12} "
+              f"{full / incremental:>8.1f}x {format_seconds(per_bar):>10}  {identical}")
+
+
+if __name__ == "__main__":
+    main()
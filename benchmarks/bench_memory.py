@@ -0,0 +1,59 @@
+"""
+Measure per-ticker memory of the analysis frames with and without compact mode.
+
+Usage:
+    python benchmarks/bench_memory.py [--tickers 20] [--days 1250]
+
+Every ticker runs the app's pipeline (add_indicators, detect_patterns,
+buyer_seller_ratio, generate_signals). The analysis frame and the signals
+frame held for each ticker are measured as they are (float64 columns,
+object labels) and after compact_frame(). The latest signal of every ticker
+is checked to be the same when the pipeline itself runs on compact frames.
+"""
+import argparse
+
+from common import make_ohlcv
+from stock_analytics.candlestick_patterns import detect_patterns
+from stock_analytics.compact import compact_frame, memory_report
+from stock_analytics.indicators import add_indicators
+from stock_analytics.trading_signals import generate_signals
+from stock_analytics.volume_split import buyer_seller_ratio
+
+
+def pipeline(df, compact=False):
+    """The Prediction tab's frames for one ticker, optionally compacted after every stage"""
+    shrink = compact_frame if compact else (lambda frame: frame)
+    df = shrink(add_indicators(shrink(df)))
+    df = shrink(detect_patterns(df))
+    df, _ = buyer_seller_ratio(df)
+    df = shrink(df)
+    return df, shrink(generate_signals(df))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=20)
+    parser.add_argument("--days", type=int, default=1_250)
+    args = parser.parse_args()
+
+    held, same_signal = {}, True
+    for i in range(args.tickers):
+        df = make_ohlcv(args.days, seed=i)
+        held[f"T{i}"] = pipeline(df)
+        _, signals = pipeline(df, compact=True)
+        same_signal &= str(signals["Signal"].iloc[-1]) == held[f"T{i}"][1]["Signal"].iloc[-1]
+
+    report = memory_report(held)
+    print(f"{args.days:,} days per ticker, analysis + signals frames")
+    print(f"{'ticker':>8} {'before':>10} {'after':>10} {'ratio':>7}")
+    for ticker, row in report.iterrows():
+        print(f"{ticker:>8} {row['before_bytes'] / 1024:>8.0f} KB {row['after_bytes'] / 1024:>7.0f} KB "
+              f"{row['ratio']:>6.2f}x")
+    total = report.loc["Total"]
+    print(f"tickers per GB: {2**30 * args.tickers / total['before_bytes']:,.0f} -> "
+          f"{2**30 * args.tickers / total['after_bytes']:,.0f}")
+    print(f"same latest signal with compact frames: {same_signal}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark panel indicators against add_indicators() run ticker by ticker.
+
+Usage:
+    python benchmarks/bench_panel.py [--tickers 50 500 2000] [--days 1250]
+
+Every ticker gets its own synthetic history with a random listing date, so
+the panel is ragged. The per-ticker loop runs add_indicators() on each
+history; panel_indicators() computes the same columns for the whole
+(dates x tickers) panel at once. The panel values are checked for
+bit-for-bit equality with the per-ticker results.
+"""
+import argparse
+
+import numpy as np
+
+from common import best_of, format_seconds, make_ohlcv
+from stock_analytics.indicators import INDICATOR_COLUMNS, add_indicators
+from stock_analytics.panel_indicators import panel_frames, panel_indicators
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, nargs="+", default=[50, 500, 2_000])
+    parser.add_argument("--days", type=int, default=1_250)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"up to {args.days:,} days per ticker")
+    print(f"{'tickers':>8} {'per ticker':>11} {'panel':>10} {'speedup':>9}  identical")
+    for n_tickers in args.tickers:
+        frames = {}
+        for i in range(n_tickers):
+            df = make_ohlcv(args.days, seed=i)
+            frames[f"T{i}"] = df.iloc[rng.integers(0, args.days // 2):]
+        panels = panel_frames(frames)
+
+        loop = best_of(lambda: [add_indicators(df) for df in frames.values()], repeat=1)
+        panel = best_of(lambda: panel_indicators(panels["Close"], panels["High"], panels["Low"]))
+
+        result = panel_indicators(panels["Close"], panels["High"], panels["Low"])
+        identical = all(
+            np.array_equal(expected[col].to_numpy(), result[col][ticker].loc[expected.index].to_numpy(),
+                           equal_nan=True)
+            for ticker, expected in ((ticker, add_indicators(df)) for ticker, df in frames.items())
+            for col in INDICATOR_COLUMNS)
+        print(f"{n_tickers:>8,} {format_seconds(loop):>11} {format_seconds(panel):>10} "
+              f"{loop / panel:>8.1f}x  {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark incremental pattern updates against recomputing detect_patterns().
+
+Usage:
+    python benchmarks/bench_pattern_cache.py [--sizes 1000 20000 200000] [--new-bars 1]
+
+For every history size the IncrementalPatternDetector is primed with the
+history, then --new-bars bars are appended. That refresh is compared with a
+full detect_patterns() pass over the extended history, and both frames are
+checked to be equal. Copy-on-write is enabled as in the app.
+"""
+import argparse
+
+import pandas as pd
+
+from common import best_of, format_seconds, make_ohlcv
+from stock_analytics.candlestick_patterns import IncrementalPatternDetector, detect_patterns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 20_000, 200_000])
+    parser.add_argument("--new-bars", type=int, default=1)
+    args = parser.parse_args()
+    pd.set_option("mode.copy_on_write", True)
+
+    print(f"{'rows':>8} {'detect_patterns':>16} {'incremental':>12} {'speedup':>9}  identical")
+    for n_rows in args.sizes:
+        df = make_ohlcv(n_rows + args.new_bars)
+        history = df.iloc[:n_rows]
+
+        full = best_of(lambda: detect_patterns(df), repeat=5)
+
+        # Each timing primes a fresh cache with the history, then times the refresh alone
+        incremental = float("inf")
+        for _ in range(5):
+            cache = IncrementalPatternDetector()
+            cache.update("T", history)
+            incremental = min(incremental, best_of(lambda: cache.update("T", df), repeat=1))
+
+        identical = cache.update("T", df).equals(detect_patterns(df))
+        print(f"{n_rows:>8,} {format_seconds(full):>16} {format_seconds(incremental):>12} "
+              f"{full / incremental:>8.1f}x  {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark the vectorized candlestick pattern engine against the original
+per-row detection loop.
+
+Usage:
+    python benchmarks/bench_patterns.py [--sizes 1000 100000 10000000] [--loop-limit 100000]
+
+The legacy loop is only timed up to --loop-limit rows; above that its time is
+extrapolated linearly from the largest measured size (marked "est.").
+"""
+import argparse
+
+import pandas as pd
+
+from common import best_of, format_seconds, make_ohlcv
+from stock_analytics.candlestick_patterns import detect_patterns
+
+
+def legacy_detect_patterns(df):
+    """Reference copy of the original iloc-based loop from app.py"""
+    df_patterns = df.copy()
+    df_patterns['Pattern'] = None
+    df_patterns['Pattern_Type'] = None
+    loc = df_patterns.columns.get_loc
+
+    for i in range(len(df_patterns)):
+        try:
+            if i < 3:
+                continue
+            current_open = float(df_patterns.iloc[i, loc('Open')])
+            current_high = float(df_patterns.iloc[i, loc('High')])
+            current_low = float(df_patterns.iloc[i, loc('Low')])
+            current_close = float(df_patterns.iloc[i, loc('Close')])
+            prev_open = float(df_patterns.iloc[i-1, loc('Open')])
+            prev_high = float(df_patterns.iloc[i-1, loc('High')])
+            prev_low = float(df_patterns.iloc[i-1, loc('Low')])
+            prev_close = float(df_patterns.iloc[i-1, loc('Close')])
+            prev2_open = float(df_patterns.iloc[i-2, loc('Open')])
+            prev2_close = float(df_patterns.iloc[i-2, loc('Close')])
+
+            current_body = abs(current_close - current_open)
+            prev_body = abs(prev_close - prev_open)
+            prev2_body = abs(prev2_close - prev2_open)
+            current_upper_shadow = current_high - max(current_open, current_close)
+            current_lower_shadow = min(current_open, current_close) - current_low
+            is_current_bullish = current_close > current_open
+            is_prev_bullish = prev_close > prev_open
+            is_prev2_bullish = prev2_close > prev2_open
+            avg_body_size = (current_body + prev_body + prev2_body) / 3
+
+            result = None
+            if is_current_bullish:
+                if (current_high - current_close) < current_body * 0.1 and (current_open - current_low) < current_body * 0.1:
+                    result = ("Bullish Marubozu", "Strong Bullish")
+                elif current_lower_shadow > current_body * 2 and current_upper_shadow < current_body * 0.5:
+                    result = ("Bullish Hammer", "Reversal Bullish")
+                elif not is_prev_bullish and is_prev2_bullish and prev_body < avg_body_size * 0.5 and current_body > prev_body * 1.5:
+                    result = ("Morning Star", "Reversal Bullish")
+                elif not is_prev_bullish and current_open < prev_close and current_close > prev_open:
+                    result = ("Bullish Engulfing", "Reversal Bullish")
+                elif not is_prev_bullish and current_open < prev_low and current_close > (prev_open + prev_close) / 2:
+                    result = ("Piercing Line", "Reversal Bullish")
+                elif is_prev_bullish and is_prev2_bullish and current_close > prev_close and prev_close > prev2_close:
+                    result = ("Three White Soldiers", "Continuation Bullish")
+            else:
+                if (current_high - current_open) < current_body * 0.1 and (current_close - current_low) < current_body * 0.1:
+                    result = ("Bearish Marubozu", "Strong Bearish")
+                elif current_upper_shadow > current_body * 2 and current_lower_shadow < current_body * 0.5:
+                    result = ("Bearish Hanging Man", "Reversal Bearish")
+                elif is_prev_bullish and not is_prev2_bullish and prev_body < avg_body_size * 0.5 and current_body > prev_body * 1.5:
+                    result = ("Evening Star", "Reversal Bearish")
+                elif is_prev_bullish and current_open > prev_close and current_close < prev_open:
+                    result = ("Bearish Engulfing", "Reversal Bearish")
+                elif is_prev_bullish and current_open > prev_high and current_close < (prev_open + prev_close) / 2:
+                    result = ("Dark Cloud Cover", "Reversal Bearish")
+                elif not is_prev_bullish and not is_prev2_bullish and current_close < prev_close and prev_close < prev2_close:
+                    result = ("Three Black Crows", "Continuation Bearish")
+
+            if result is not None:
+                df_patterns.iloc[i, loc('Pattern')] = result[0]
+                df_patterns.iloc[i, loc('Pattern_Type')] = result[1]
+        except (ValueError, TypeError):
+            pass
+
+    return df_patterns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 10_000_000])
+    parser.add_argument("--loop-limit", type=int, default=100_000,
+                        help="Largest row count to run the legacy loop on")
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'legacy loop':>14} {'vectorized':>12} {'speedup':>10}  identical")
+    loop_rate = None
+    for n_rows in args.sizes:
+        df = make_ohlcv(n_rows)
+        vector_time = best_of(lambda: detect_patterns(df), repeat=3 if n_rows <= 1_000_000 else 1)
+
+        if n_rows <= args.loop_limit:
+            loop_time = best_of(lambda: legacy_detect_patterns(df), repeat=1)
+            loop_rate = loop_time / n_rows
+            legacy = legacy_detect_patterns(df)
+            fast = detect_patterns(df)
+            identical = (legacy['Pattern'].equals(fast['Pattern'])
+                         and legacy['Pattern_Type'].equals(fast['Pattern_Type']))
+            loop_label = format_seconds(loop_time)
+        elif loop_rate is not None:
+            loop_time = loop_rate * n_rows
+            identical = "n/a"
+            loop_label = f"{format_seconds(loop_time)} est."
+        else:
+            loop_time, identical, loop_label = None, "n/a", "skipped"
+
+        speedup = f"{loop_time / vector_time:,.0f}x" if loop_time else "-"
+        print(f"{n_rows:>12,} {loop_label:>14} {format_seconds(vector_time):>12} {speedup:>10}  {identical}")
+
+
+if __name__ == "__main__":
+    pd.set_option("mode.chained_assignment", None)
+    main()
@@ -0,0 +1,123 @@
+"""
+Measure peak memory of one Prediction request, stage by stage vs. one shared frame.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--days 1250 5000 20000]
+
+Both pipelines run behind st.cache_data like the app, so hashing the inputs
+and pickling the results are counted too. The staged pipeline is the
+original flow: add_indicators, detect_candlestick_patterns and
+calculate_buyer_seller_ratio each cached, each copying the whole frame
+(add_indicators then fills it with ffill().bfill()), and display_data
+copying the frame before taking its last rows. The single-frame pipeline is
+app.analyze_data(): one cached stage that copies the data once, under
+copy-on-write. Peak memory is traced with tracemalloc for a cold request
+(empty cache) and a warm one (cache hit), and the frames are checked to be
+identical.
+"""
+import argparse
+import tracemalloc
+import warnings
+
+import pandas as pd
+import streamlit as st
+from streamlit.logger import set_log_level
+
+from common import make_ohlcv
+from stock_analytics.candlestick_patterns import detect_patterns
+from stock_analytics.indicator_graph import IndicatorGraph
+from stock_analytics.indicators import INDICATOR_COLUMNS, add_indicators
+from stock_analytics.trading_signals import generate_signals
+from stock_analytics.volume_split import buyer_seller_ratio
+
+# Outside `streamlit run`, Streamlit warns about the missing runtime for every cached
+# function; its config is parsed first, since parsing it resets the log level
+st.config.get_option("logger.level")
+set_log_level("error")
+
+
+def legacy_add_indicators(df):
+    """Reference copy of the original add_indicators() copies"""
+    df_copy = df.copy()
+    graph = IndicatorGraph(df_copy, reuse_columns=False)
+    for col in INDICATOR_COLUMNS:
+        df_copy[col] = graph.get(col)
+    return df_copy.ffill().bfill()
+
+
+@st.cache_data
+def staged_indicators(df):
+    return legacy_add_indicators(df)
+
+
+@st.cache_data
+def staged_patterns(df):
+    return detect_patterns(df)
+
+
+@st.cache_data
+def staged_ratio(df):
+    return buyer_seller_ratio(df)
+
+
+@st.cache_data
+def single_frame(data):
+    df = detect_patterns(add_indicators(data), copy=False)
+    return buyer_seller_ratio(df, copy=False)
+
+
+def staged_request(data):
+    df, ratio = staged_ratio(staged_patterns(staged_indicators(data)))
+    generate_signals(df)
+    display = df.copy()
+    display.iloc[-10:].copy()
+    return df
+
+
+def single_frame_request(data):
+    df, ratio = single_frame(data)
+    generate_signals(df)
+    df.iloc[-10:].copy()
+    return df
+
+
+def peak_bytes(request, data):
+    """Peak traced memory of one request, above what was allocated before it"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    request(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, nargs="+", default=[1_250, 5_000, 20_000])
+    args = parser.parse_args()
+    warnings.simplefilter("ignore", FutureWarning)
+
+    print(f"{'days':>8} {'frame':>9}   {'staged cold':>11} {'single cold':>11}   "
+          f"{'staged warm':>11} {'single warm':>11}  identical")
+    for n_days in args.days:
+        data = make_ohlcv(n_days, seed=0)
+        row = []
+        for copy_on_write in (False, True):
+            pd.set_option("mode.copy_on_write", copy_on_write)
+            request = single_frame_request if copy_on_write else staged_request
+            st.cache_data.clear()
+            row.append((peak_bytes(request, data), peak_bytes(request, data)))
+        pd.set_option("mode.copy_on_write", True)
+        result = single_frame_request(data)
+        pd.set_option("mode.copy_on_write", False)
+        identical = staged_request(data).equals(result)
+
+        frame = result.memory_usage(deep=True).sum()
+        (staged_cold, staged_warm), (single_cold, single_warm) = row
+        mb = 2**20
+        print(f"{n_days:>8,} {frame / mb:>6.1f} MB   {staged_cold / mb:>8.1f} MB {single_cold / mb:>8.1f} MB   "
+              f"{staged_warm / mb:>8.1f} MB {single_warm / mb:>8.1f} MB  {identical}")
+
+
+if __name__ == "__main__":
+    main()
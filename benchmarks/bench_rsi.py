@@ -0,0 +1,68 @@
+"""
+Benchmark the RSI kernel against the original pandas calculate_rsi().
+
+Usage:
+    python benchmarks/bench_rsi.py [--tickers 10 500 2000] [--days 2500]
+
+For every panel size the original implementation (boolean-mask assignment
+into gains/losses Series, masked RS divide, double clip) is run ticker by
+ticker, then calculate_rsi() is run ticker by ticker on top of the kernel,
+and finally calculate_rsi_batch() computes the whole panel in one call, with
+SMA and with Wilder smoothing. The SMA results are checked for bit-for-bit
+equality with the original.
+"""
+import argparse
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from common import best_of, format_seconds, make_ohlcv
+from stock_analytics.indicators import calculate_rsi, calculate_rsi_batch
+
+
+def legacy_rsi(data, window=14):
+    """Reference copy of the original calculate_rsi()"""
+    delta = data.diff()
+    gains = pd.Series(0, index=delta.index)
+    losses = pd.Series(0, index=delta.index)
+    gains[delta > 0] = delta[delta > 0]
+    losses[delta < 0] = -delta[delta < 0]
+    avg_gain = gains.rolling(window=window, min_periods=1).mean()
+    avg_loss = losses.rolling(window=window, min_periods=1).mean()
+    rs = pd.Series(0, index=data.index)
+    valid_mask = (avg_loss != 0) & avg_loss.notna() & avg_gain.notna()
+    rs[valid_mask] = avg_gain[valid_mask] / avg_loss[valid_mask]
+    rsi = 100 - (100 / (1 + rs))
+    return rsi.fillna(50).clip(0, 100).clip(0, 100)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, nargs="+", default=[10, 500, 2_000])
+    parser.add_argument("--days", type=int, default=2_500)
+    args = parser.parse_args()
+    # The legacy version upcasts integer Series in place, which pandas warns about on every call
+    warnings.simplefilter("ignore", FutureWarning)
+
+    print(f"{args.days:,} days per ticker")
+    print(f"{'tickers':>8} {'legacy loop':>12} {'kernel loop':>12} {'batch sma':>10} {'batch wilder':>13} "
+          f"{'speedup':>9}  identical")
+    for n_tickers in args.tickers:
+        closes = pd.DataFrame({f"T{i}": make_ohlcv(args.days, seed=i)["Close"].to_numpy()
+                               for i in range(n_tickers)})
+
+        legacy = best_of(lambda: [legacy_rsi(closes[col]) for col in closes.columns], repeat=1)
+        loop = best_of(lambda: [calculate_rsi(closes[col]) for col in closes.columns], repeat=1)
+        batch = best_of(lambda: calculate_rsi_batch(closes))
+        wilder = best_of(lambda: calculate_rsi_batch(closes, method="wilder"))
+
+        result = calculate_rsi_batch(closes)
+        identical = all(np.array_equal(result[col].to_numpy(), legacy_rsi(closes[col]).to_numpy())
+                        for col in closes.columns)
+        print(f"{n_tickers:>8,} {format_seconds(legacy):>12} {format_seconds(loop):>12} {format_seconds(batch):>10} "
+              f"{format_seconds(wilder):>13} {legacy / batch:>8.1f}x  {identical}")
+
+
+if __name__ == "__main__":
+    main()
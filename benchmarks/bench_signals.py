@@ -0,0 +1,228 @@
+"""
+Benchmark columnar signal generation against the original per-row loop.
+
+Usage:
+    python benchmarks/bench_signals.py [--sizes 756 5000 50000] [--loop-limit 50000]
+
+Indicator columns are derived from a synthetic random walk. For every size the
+columnar result (with reasoning built for all rows) is checked against the
+legacy output.
+"""
+import argparse
+import contextlib
+import io
+
+import pandas as pd
+
+from common import best_of, format_seconds, make_ohlcv
+from stock_analytics.trading_signals import generate_signals
+
+
+def add_test_indicators(df):
+    """Attach the indicator columns generate_signals() reads"""
+    close = df['Close']
+    delta = close.diff()
+    gain = delta.clip(lower=0).rolling(14, min_periods=1).mean()
+    loss = (-delta.clip(upper=0)).rolling(14, min_periods=1).mean()
+    df['RSI'] = (100 - 100 / (1 + gain / loss)).fillna(50)
+    df['SMA'] = close.rolling(9).mean()
+    df['EMA_20'] = close.ewm(span=20, adjust=False).mean()
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    df['MACD'] = macd
+    df['MACD_Signal'] = macd.ewm(span=9, adjust=False).mean()
+    return df
+
+
+def legacy_generate_signals(df):
+    """Reference copy of the original iloc-based loop from app.py"""
+    try:
+        # Ensure we have data
+        if df is None or df.empty:
+            # Create a default DataFrame with Neutral signal
+            index = [pd.Timestamp.now()]
+            return pd.DataFrame({
+                'Signal': ['Neutral'],
+                'Confidence': [0],
+                'Reasoning': ['No data available']
+            }, index=index)
+
+        # Create a new DataFrame to store signals
+        signals_df = pd.DataFrame(index=df.index)
+        signals_df['Signal'] = 'Neutral'
+        signals_df['Confidence'] = 0
+        signals_df['Reasoning'] = 'Initializing technical analysis'
+
+        # Process each data point to generate signals
+        for i in range(len(df)):
+            if i < 5:  # Skip the first few rows due to insufficient data for calculations
+                continue
+
+            # Analyze each row of data
+            try:
+                # Get current data point
+                current = df.iloc[i]
+
+                # Initialize variables for signals
+                bullish_signals = 0.0
+                bearish_signals = 0.0
+                neutral_signals = 0.0
+                total_signals = 0.0
+                signal_reasons = []
+
+                # Check RSI oversold/overbought
+                if 'RSI' in df.columns:
+                    try:
+                        rsi_value = float(current['RSI'])
+                        if rsi_value > 70:
+                            bearish_signals += 1.0
+                            signal_reasons.append(f"RSI is overbought ({rsi_value:.1f})")
+                        elif rsi_value < 30:
+                            bullish_signals += 1.0
+                            signal_reasons.append(f"RSI is oversold ({rsi_value:.1f})")
+                        elif rsi_value > 60:
+                            bearish_signals += 0.5
+                            signal_reasons.append(f"RSI is neutral-bearish ({rsi_value:.1f})")
+                        elif rsi_value < 40:
+                            bullish_signals += 0.5
+                            signal_reasons.append(f"RSI is neutral-bullish ({rsi_value:.1f})")
+                        else:
+                            neutral_signals += 1.0
+                            signal_reasons.append(f"RSI is neutral ({rsi_value:.1f})")
+                        total_signals += 1.0
+                    except Exception as e:
+                        print(f"Error processing RSI: {str(e)}")
+            except Exception as e:
+                print(f"Error analyzing row {i}: {str(e)}")
+
+            # Check price relative to moving averages
+            if all(col in df.columns for col in ['Close', 'SMA', 'EMA_20']):
+                try:
+                    price = float(current['Close'])
+                    sma = float(current['SMA'])
+                    ema20 = float(current['EMA_20'])
+
+                    # Price vs SMA
+                    if price > sma * 1.05:
+                        bearish_signals += 1.0
+                        signal_reasons.append(
+                            f"Price ({price:.2f}) significantly above SMA ({sma:.2f})")
+                        total_signals += 1.0
+                    elif price < sma * 0.95:
+                        bullish_signals += 1.0
+                        signal_reasons.append(
+                            f"Price ({price:.2f}) significantly below SMA ({sma:.2f})")
+                        total_signals += 1.0
+
+                    # Price vs EMA
+                    if price > ema20:
+                        bullish_signals += 0.5
+                        signal_reasons.append(f"Price above EMA20")
+                    else:
+                        bearish_signals += 0.5
+                        signal_reasons.append(f"Price below EMA20")
+                except Exception as e:
+                    print(f"Error checking moving averages: {str(e)}")
+
+            # Check MACD if available
+            if all(col in df.columns for col in ['MACD', 'MACD_Signal']):
+                try:
+                    # Convert to float to avoid Series truth value ambiguity
+                    macd = float(current['MACD'])
+                    macd_signal = float(current['MACD_Signal'])
+
+                    if macd > macd_signal:
+                        bullish_signals += 1.0
+                        signal_reasons.append("MACD above signal line")
+                        total_signals += 1.0
+                    else:
+                        bearish_signals += 1.0
+                        signal_reasons.append("MACD below signal line")
+                        total_signals += 1.0
+
+                    # Check MACD histogram direction
+                    if i > 0:
+                        prev_macd = float(df.iloc[i-1]['MACD'])
+                        prev_macd_signal = float(df.iloc[i-1]['MACD_Signal'])
+
+                        prev_hist = prev_macd - prev_macd_signal
+                        curr_hist = macd - macd_signal
+
+                        if curr_hist > prev_hist:
+                            bullish_signals += 0.5
+                            signal_reasons.append("MACD histogram improving")
+                            total_signals += 0.5
+                        else:
+                            bearish_signals += 0.5
+                            signal_reasons.append("MACD histogram deteriorating")
+                except Exception as e:
+                    print(f"Error checking MACD: {str(e)}")
+
+            # Calculate final signal
+            if total_signals > 0:
+                bullish_confidence = (bullish_signals / total_signals) * 100
+                bearish_confidence = (bearish_signals / total_signals) * 100
+                neutral_confidence = (neutral_signals / total_signals) * 100
+
+                if bullish_confidence > bearish_confidence and bullish_confidence > neutral_confidence:
+                    signal = "Buy"
+                    confidence = bullish_confidence
+                elif bearish_confidence > bullish_confidence and bearish_confidence > neutral_confidence:
+                    signal = "Sell"
+                    confidence = bearish_confidence
+                else:
+                    signal = "Neutral"
+                    confidence = neutral_confidence
+
+                # Store signals in DataFrame
+                signals_df.iloc[i, signals_df.columns.get_loc('Signal')] = signal
+                signals_df.iloc[i, signals_df.columns.get_loc('Confidence')] = confidence
+                signals_df.iloc[i, signals_df.columns.get_loc(
+                    'Reasoning')] = ", ".join(signal_reasons)
+            else:
+                # No signals could be calculated
+                signals_df.iloc[i, signals_df.columns.get_loc('Signal')] = "Neutral"
+                signals_df.iloc[i, signals_df.columns.get_loc('Confidence')] = 0
+                signals_df.iloc[i, signals_df.columns.get_loc(
+                    'Reasoning')] = "Insufficient technical signals"
+
+        return signals_df
+
+    except Exception as e:
+        print(f"Error in generate_trading_signals: {str(e)}")
+        # Return a default DataFrame with a single row
+        index = [pd.Timestamp.now()]
+        return pd.DataFrame({
+            'Signal': ['Neutral'],
+            'Confidence': [0],
+            'Reasoning': [f'Error generating signals: {str(e)}']
+        }, index=index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[756, 5_000, 50_000])
+    parser.add_argument("--loop-limit", type=int, default=50_000,
+                        help="Largest row count to run the legacy loop on")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'legacy loop':>12} {'all reasons':>12} {'last reason':>12}  identical")
+    for n_rows in args.sizes:
+        df = add_test_indicators(make_ohlcv(n_rows))
+        fast_time = best_of(lambda: generate_signals(df))
+        all_rows = generate_signals(df, reason_rows=None)
+        full_time = best_of(lambda: generate_signals(df, reason_rows=None), repeat=1)
+
+        if n_rows <= args.loop_limit:
+            with contextlib.redirect_stdout(io.StringIO()):
+                loop_time = best_of(lambda: legacy_generate_signals(df), repeat=1)
+                identical = legacy_generate_signals(df).equals(all_rows)
+            loop_label = format_seconds(loop_time)
+        else:
+            loop_label, identical = "skipped", "n/a"
+
+        print(f"{n_rows:>10,} {loop_label:>12} {format_seconds(full_time):>12} "
+              f"{format_seconds(fast_time):>12}  {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark the vectorized Monte Carlo price simulator against the original
+one-path, one-step-at-a-time random walk from the Prediction tab.
+
+Usage:
+    python benchmarks/bench_simulation.py [--paths 1000 10000 100000] [--days 60] [--loop-limit 10000]
+                                          [--tickers 100] [--panel-paths 10000]
+
+The legacy loop draws a single path per call, so it is timed generating the
+same number of paths path by path; above --loop-limit paths its time is
+extrapolated linearly (marked "est."). The vectorized simulator is timed
+in float64 and float32 together with the size of its path matrix. Finally
+the block-bootstrap scenario engine is timed on --tickers tickers at once.
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from common import best_of, format_seconds, make_ohlcv
+from stock_analytics.simulation import block_bootstrap_bands, simulate_paths, quantile_bands
+
+
+def legacy_random_walk(last_price, daily_returns, future_days):
+    """Reference copy of the original per-day loop from app.py"""
+    volatility = float(daily_returns.std())
+    drift = float(daily_returns.mean())
+    future_pred = []
+    current_price = last_price
+    for i in range(future_days):
+        shock = np.random.normal(0, volatility)
+        next_return = drift + shock
+        current_price = current_price * (1 + next_return)
+        future_pred.append(current_price)
+    return future_pred
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paths", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--loop-limit", type=int, default=10_000)
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--panel-paths", type=int, default=10_000)
+    args = parser.parse_args()
+
+    close = make_ohlcv(1_250)["Close"]
+    daily_returns = close.pct_change().dropna()
+    last_price = float(close.iloc[-1])
+
+    print(f"{args.days} days per path")
+    print(f"{'paths':>9} {'legacy loop':>14} {'float64':>10} {'float32':>10} {'speedup':>9} {'float32 paths':>14}")
+    measured = None
+    for n_paths in args.paths:
+        if n_paths <= args.loop_limit:
+            legacy = best_of(lambda: [legacy_random_walk(last_price, daily_returns, args.days)
+                                      for _ in range(n_paths)], repeat=1)
+            measured = (n_paths, legacy)
+            legacy_label = format_seconds(legacy)
+        else:
+            legacy = measured[1] * n_paths / measured[0]
+            legacy_label = format_seconds(legacy) + " est."
+
+        timings = {}
+        for dtype in (np.float64, np.float32):
+            timings[dtype] = best_of(lambda: quantile_bands(
+                simulate_paths(last_price, daily_returns.values, args.days, n_paths, dtype=dtype)))
+        memory = n_paths * args.days * np.dtype(np.float32).itemsize
+        print(f"{n_paths:>9,} {legacy_label:>14} {format_seconds(timings[np.float64]):>10} "
+              f"{format_seconds(timings[np.float32]):>10} {legacy / timings[np.float32]:>8,.0f}x "
+              f"{memory / 2**20:>11.1f} MB")
+
+    returns = pd.DataFrame({f"T{i:03d}": make_ohlcv(1_250, seed=i)["Close"].pct_change()
+                            for i in range(args.tickers)})
+    last_prices = np.full(args.tickers, last_price)
+    panel = best_of(lambda: block_bootstrap_bands(returns, last_prices, args.days, args.panel_paths), repeat=1)
+    print(f"\nblock bootstrap, {args.tickers} tickers x {args.panel_paths:,} paths x {args.days} days: "
+          f"{format_seconds(panel)}")
+
+
+if __name__ == "__main__":
+    main()
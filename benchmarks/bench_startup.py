@@ -0,0 +1,100 @@
+"""
+Measure app startup and check that pages render without the ML stack.
+
+Usage:
+    python benchmarks/bench_startup.py [--timeout 60]
+
+Each scenario runs app.py in a fresh interpreter through Streamlit's AppTest
+harness and reports the wall-clock time of the first script run, whether it
+raised, and which heavy modules (TensorFlow, scikit-learn, SciPy, yfinance) ended up
+imported. Scenarios:
+
+    import   every stock_analytics module, without the app; Streamlit must not load
+    login    not logged in: the login page
+    tabs     logged in: the dashboard with every tab (IPOs, news, ...) rendered
+
+Market data comes from the local fixture provider so no network is needed.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import ROOT
+
+HEAVY_MODULES = ("tensorflow", "sklearn", "scipy", "yfinance")
+
+SCENARIO = r"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+app = AppTest.from_file({app!r}, default_timeout={timeout})
+if {logged_in!r}:
+    app.session_state["logged_in"] = True
+    app.session_state["username"] = "bench"
+started = time.perf_counter()
+app.run()
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "exceptions": [str(e.message)[:200] for e in app.exception],
+    "heavy": sorted(m for m in {heavy!r} if m in sys.modules),
+}}))
+"""
+
+IMPORT_SCENARIO = r"""
+import importlib, json, pkgutil, sys, time
+started = time.perf_counter()
+import stock_analytics
+for module in pkgutil.iter_modules(stock_analytics.__path__):
+    importlib.import_module("stock_analytics." + module.name)
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "exceptions": [],
+    "heavy": sorted(m for m in {heavy!r} if m in sys.modules),
+}}))
+"""
+
+
+def run_scenario(logged_in, timeout):
+    """Run one scenario in a subprocess and return its JSON report
+
+    logged_in=None runs the package import scenario instead of the app.
+    """
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    env = dict(os.environ,
+               MARKET_DATA_PROVIDER="local",
+               MARKET_DATA_DIR=os.path.join(workdir, "fixtures"),
+               OHLCV_STORE_DIR=os.path.join(workdir, "store"))
+    if logged_in is None:
+        code = IMPORT_SCENARIO.format(heavy=HEAVY_MODULES + ("streamlit",))
+    else:
+        code = SCENARIO.format(app=os.path.join(ROOT, "app.py"), timeout=timeout,
+                               logged_in=logged_in, heavy=HEAVY_MODULES)
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                          capture_output=True, text=True, timeout=timeout * 2)
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "no output")
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    print(f"{'scenario':<10} {'first run':>10}  {'heavy modules loaded':<24} exceptions")
+    for name, logged_in in (("import", None), ("login", False), ("tabs", True)):
+        report = run_scenario(logged_in, args.timeout)
+        heavy = ", ".join(report["heavy"]) or "none"
+        print(f"{name:<10} {report['seconds']:>9.2f}s  {heavy:<24} {len(report['exceptions'])}")
+        for message in report["exceptions"]:
+            print(f"    {message}")
+
+
+if __name__ == "__main__":
+    main()
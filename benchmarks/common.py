@@ -0,0 +1,46 @@
+"""Shared helpers for the benchmark scripts in this directory."""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Make the top-level modules importable when running `python benchmarks/<script>.py`
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def make_ohlcv(n_rows, seed=42, start="2000-01-03"):
+    """Build a synthetic daily OHLCV frame from a seeded random walk"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_rows)))
+    open_ = close * (1 + rng.normal(0, 0.005, n_rows))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.004, n_rows)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.004, n_rows)))
+    volume = rng.integers(100_000, 5_000_000, n_rows)
+    index = pd.date_range(start, periods=n_rows, freq="min" if n_rows > 50_000 else "D")
+    return pd.DataFrame({
+        "Open": open_, "High": high, "Low": low, "Close": close,
+        "Adj Close": close, "Volume": volume,
+    }, index=index)
+
+
+def best_of(func, repeat=3):
+    """Return the best wall-clock time in seconds over `repeat` runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def format_seconds(seconds):
+    """Format a duration for the benchmark tables"""
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds:.2f} s"
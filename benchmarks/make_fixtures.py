@@ -0,0 +1,45 @@
+"""
+Write synthetic history fixtures for the local market-data provider.
+
+Usage:
+    python benchmarks/make_fixtures.py [--root .data/fixtures] [--rows 1500] [--tickers AAPL MSFT ...]
+
+Run the app against them with:
+    MARKET_DATA_PROVIDER=local MARKET_DATA_DIR=.data/fixtures streamlit run app.py
+"""
+import argparse
+import datetime
+
+import pandas as pd
+
+from common import make_ohlcv
+from stock_analytics.market_data import DEFAULT_FIXTURE_DIR, write_fixture_history
+
+DEFAULT_TICKERS = ["AAPL", "MSFT", "GOOGL", "AMZN", "META",
+                   "RELIANCE.NS", "TCS.NS", "HDFCBANK.NS", "INFY.NS", "ICICIBANK.NS"]
+
+
+def write_fixtures(root, tickers, n_rows):
+    """Write one seeded business-day series per ticker, ending yesterday; returns the paths"""
+    end = pd.Timestamp(datetime.date.today() - datetime.timedelta(days=1))
+    index = pd.bdate_range(end=end, periods=n_rows)
+    paths = []
+    for seed, ticker in enumerate(tickers):
+        data = make_ohlcv(n_rows, seed=seed)
+        data.index = index
+        paths.append(write_fixture_history(root, ticker, data))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default=DEFAULT_FIXTURE_DIR)
+    parser.add_argument("--rows", type=int, default=1500)
+    parser.add_argument("--tickers", nargs="+", default=DEFAULT_TICKERS)
+    args = parser.parse_args()
+    for path in write_fixtures(args.root, args.tickers, args.rows):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Refresh saved prediction models for every tracked ticker.
+
+Usage:
+    python refresh_models.py                      # refresh all tracked Live Analysis models once
+    python refresh_models.py --tickers AAPL TCS.NS
+    python refresh_models.py --full               # retrain from scratch instead of warm-starting
+    python refresh_models.py --workers 4 --threads 2
+    python refresh_models.py --at 02:00           # stay running and refresh every night at 02:00
+
+Tickers are tracked once a model has been saved for them, or once the app
+has requested one (see LIVE_MODEL_TRAINING in the README). Each run brings
+the local price history up to date, then lets the model registry decide per
+ticker: models with new bars are fine-tuned from their saved weights,
+unchanged ones are skipped. Tickers are spread over a process pool whose
+workers each limit TensorFlow to --threads intra-op and inter-op threads, so
+workers do not oversubscribe the CPU. Per-ticker timings are stored in each
+model's meta.json and summarised in the registry's last_run.json.
+"""
+import argparse
+import datetime
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from stock_analytics.history import clean_ticker, get_store, resolve_date_range
+from stock_analytics.lstm_models import (LIVE_ARCHITECTURE, LIVE_TIME_STEPS, fine_tune_model,
+                                         live_feature_frame, live_window_start, train_live_model)
+from stock_analytics.market_data import get_provider
+from stock_analytics.model_registry import ModelRegistry
+
+
+def load_live_frame(ticker):
+    """Feature frame for a ticker over the Live Analysis window, from the local store"""
+    now = datetime.datetime.now()
+    start_date, end_date = resolve_date_range(live_window_start(now), now)
+    data = get_store().update(ticker, start_date, end_date, get_provider().history)
+    if data is None or data.empty or len(data) <= LIVE_TIME_STEPS:
+        return None
+    frame, _ = live_feature_frame(data)
+    return frame
+
+
+def init_worker(threads):
+    """Process-pool initializer: cap the math libraries and TensorFlow at `threads` threads"""
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS',
+                'TF_NUM_INTRAOP_THREADS', 'TF_NUM_INTEROP_THREADS'):
+        os.environ[var] = str(threads)
+    try:
+        import tensorflow as tf
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(threads)
+    except ImportError:
+        pass
+
+
+def refresh_ticker(ticker, registry=None, full=False):
+    """
+    Bring one ticker's Live Analysis model up to date.
+
+    Returns:
+        dict: ticker, status ('trained', 'current', 'no data' or 'error'),
+        reason, load_seconds and seconds taken in total
+    """
+    registry = registry or ModelRegistry()
+    started = time.perf_counter()
+    result = {'ticker': ticker}
+    try:
+        frame = load_live_frame(ticker)
+        result['load_seconds'] = round(time.perf_counter() - started, 3)
+        if frame is None:
+            result.update(status='no data', reason='not enough history')
+        else:
+            _, trained, reason = registry.get_or_train(
+                ticker, list(frame.columns), LIVE_TIME_STEPS, frame,
+                lambda f: train_live_model(f, LIVE_TIME_STEPS), LIVE_ARCHITECTURE,
+                fine_tune=None if full else fine_tune_model, force=full,
+                extra={'load_seconds': result['load_seconds'], 'trained_by': 'refresh_models'})
+            result.update(status='trained' if trained else 'current', reason=reason)
+    except Exception as e:
+        result.update(status='error', reason=str(e))
+    result['seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def _refresh_in_worker(ticker, full):
+    # Each worker process builds its own registry from the environment
+    return refresh_ticker(ticker, None, full)
+
+
+def refresh_models(tickers=None, full=False, registry=None, workers=1, threads=None):
+    """
+    Refresh the given tickers, or every tracked and requested Live Analysis model.
+
+    Args:
+        tickers: Tickers to refresh; defaults to all tracked plus requested ones
+        full: Retrain from scratch instead of fine-tuning
+        registry: ModelRegistry (only used in-process, i.e. with workers=1)
+        workers: Number of training processes
+        threads: TensorFlow threads per worker (default: CPU count / workers)
+
+    Returns:
+        List[dict]: One result per ticker, see refresh_ticker()
+    """
+    registry = registry or ModelRegistry()
+    if not tickers:
+        tickers = [meta['ticker'] for meta in registry.tracked(LIVE_ARCHITECTURE)]
+        tickers += registry.take_requests()
+    tickers = list(dict.fromkeys(clean_ticker(t) for t in tickers))
+    threads = threads or max(1, (os.cpu_count() or 1) // max(workers, 1))
+
+    results = []
+    if workers <= 1:
+        init_worker(threads)
+        for ticker in tickers:
+            results.append(_report(refresh_ticker(ticker, registry, full)))
+    else:
+        # spawn keeps TensorFlow state out of forked children
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=init_worker, initargs=(threads,)) as pool:
+            futures = [pool.submit(_refresh_in_worker, ticker, full) for ticker in tickers]
+            for ticker, future in zip(tickers, futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'ticker': ticker, 'status': 'error', 'reason': str(e), 'seconds': 0.0}
+                results.append(_report(result))
+
+    registry.record_run(results)
+    return results
+
+
+def _report(result):
+    print(f"{result['ticker']:<14} {result['status']:<8} {result['seconds']:>8.2f}s  {result['reason']}")
+    return result
+
+
+def seconds_until(clock):
+    """Seconds from now until the next local HH:MM"""
+    hour, minute = (int(part) for part in clock.split(':'))
+    now = datetime.datetime.now()
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += datetime.timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", nargs="+", help="Tickers to refresh (default: all tracked)")
+    parser.add_argument("--full", action="store_true", help="Retrain from scratch instead of fine-tuning")
+    parser.add_argument("--workers", type=int, default=1, help="Number of training processes")
+    parser.add_argument("--threads", type=int, help="TensorFlow threads per worker (default: CPUs / workers)")
+    parser.add_argument("--at", metavar="HH:MM", help="Run every day at this local time instead of once")
+    args = parser.parse_args()
+
+    if not args.at:
+        refresh_models(args.tickers, args.full, workers=args.workers, threads=args.threads)
+        return
+    while True:
+        time.sleep(seconds_until(args.at))
+        refresh_models(args.tickers, args.full, workers=args.workers, threads=args.threads)
+
+
+if __name__ == "__main__":
+    main()
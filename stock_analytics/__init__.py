@@ -0,0 +1,14 @@
+"""
+Stock analytics: indicators, pattern detection, trading signals, forecasting
+models and market data, importable without Streamlit.
+
+The Streamlit app (app.py) is a thin layer over these modules; batch jobs
+such as refresh_models.py and the scripts in benchmarks/ import them
+directly. Submodules are not imported here, so `import stock_analytics`
+stays cheap and TensorFlow / scikit-learn are only loaded by the functions
+that need them.
+"""
+import os
+
+# Local data (price history, fixtures, universes, saved models) lives under the repository root
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.data')
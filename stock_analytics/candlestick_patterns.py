@@ -0,0 +1,318 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+# Pattern names and their types, in the priority order used by the original
+# per-row if/elif chain. Code 0 means "no pattern".
+PATTERNS: Tuple[Tuple[str, str], ...] = (
+    ("Bullish Marubozu", "Strong Bullish"),
+    ("Bullish Hammer", "Reversal Bullish"),
+    ("Morning Star", "Reversal Bullish"),
+    ("Bullish Engulfing", "Reversal Bullish"),
+    ("Piercing Line", "Reversal Bullish"),
+    ("Three White Soldiers", "Continuation Bullish"),
+    ("Bearish Marubozu", "Strong Bearish"),
+    ("Bearish Hanging Man", "Reversal Bearish"),
+    ("Evening Star", "Reversal Bearish"),
+    ("Bearish Engulfing", "Reversal Bearish"),
+    ("Dark Cloud Cover", "Reversal Bearish"),
+    ("Three Black Crows", "Continuation Bearish"),
+)
+
+PATTERN_NAMES = np.array([None] + [name for name, _ in PATTERNS], dtype=object)
+PATTERN_TYPES = np.array([None] + [kind for _, kind in PATTERNS], dtype=object)
+
+# Number of leading rows that never get a pattern (matches the original loop)
+MIN_HISTORY = 3
+
+OHLC_COLUMNS = ['Open', 'High', 'Low', 'Close']
+PATTERN_COLUMNS = ['Pattern', 'Pattern_Type']
+
+# Tickers kept by IncrementalPatternDetector before the least recently updated is dropped
+DEFAULT_MAX_TICKERS = 64
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    """Shift a float array forward by `periods`, padding the start with NaN."""
+    shifted = np.empty_like(values)
+    shifted[:periods] = np.nan
+    shifted[periods:] = values[:-periods]
+    return shifted
+
+
+def candle_features(open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                    close: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute the body, shadow and previous-candle arrays used by pattern detection.
+
+    Args:
+        open_, high, low, close: 1-D float arrays of equal length
+
+    Returns:
+        Dict[str, np.ndarray]: Named feature arrays, each aligned to the input rows
+    """
+    prev_open = _shift(open_, 1)
+    prev_high = _shift(high, 1)
+    prev_low = _shift(low, 1)
+    prev_close = _shift(close, 1)
+    prev2_open = _shift(open_, 2)
+    prev2_close = _shift(close, 2)
+
+    body = np.abs(close - open_)
+    prev_body = np.abs(prev_close - prev_open)
+    prev2_body = np.abs(prev2_close - prev2_open)
+
+    return {
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'prev_open': prev_open,
+        'prev_high': prev_high,
+        'prev_low': prev_low,
+        'prev_close': prev_close,
+        'prev2_close': prev2_close,
+        'body': body,
+        'prev_body': prev_body,
+        'upper_shadow': high - np.maximum(open_, close),
+        'lower_shadow': np.minimum(open_, close) - low,
+        'is_bullish': close > open_,
+        'is_prev_bullish': prev_close > prev_open,
+        'is_prev2_bullish': prev2_close > prev2_open,
+        'avg_body': (body + prev_body + prev2_body) / 3,
+    }
+
+
+def classify_candles(open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                     close: np.ndarray) -> np.ndarray:
+    """
+    Classify every candle into a pattern code using boolean masks.
+
+    Codes index into PATTERN_NAMES / PATTERN_TYPES; 0 means no pattern.
+    Where several patterns match, the first one in PATTERNS wins, which is
+    the same precedence as the original if/elif chain.
+
+    Args:
+        open_, high, low, close: 1-D float arrays of equal length
+
+    Returns:
+        np.ndarray: int8 array of pattern codes
+    """
+    n = len(close)
+    if n <= MIN_HISTORY:
+        return np.zeros(n, dtype=np.int8)
+
+    f = candle_features(open_, high, low, close)
+    o, h, l, c = f['open'], f['high'], f['low'], f['close']
+    po, ph, pl, pc, p2c = f['prev_open'], f['prev_high'], f['prev_low'], f['prev_close'], f['prev2_close']
+    body, prev_body, avg_body = f['body'], f['prev_body'], f['avg_body']
+    upper, lower = f['upper_shadow'], f['lower_shadow']
+    bull, prev_bull, prev2_bull = f['is_bullish'], f['is_prev_bullish'], f['is_prev2_bullish']
+    bear = ~bull
+
+    small_middle = (prev_body < avg_body * 0.5) & (body > prev_body * 1.5)
+
+    conditions = [
+        # Bullish branch
+        bull & ((h - c) < body * 0.1) & ((o - l) < body * 0.1),
+        bull & (lower > body * 2) & (upper < body * 0.5),
+        bull & ~prev_bull & prev2_bull & small_middle,
+        bull & ~prev_bull & (o < pc) & (c > po),
+        bull & ~prev_bull & (o < pl) & (c > (po + pc) / 2),
+        bull & prev_bull & prev2_bull & (c > pc) & (pc > p2c),
+        # Bearish branch
+        bear & ((h - o) < body * 0.1) & ((c - l) < body * 0.1),
+        bear & (upper > body * 2) & (lower < body * 0.5),
+        bear & prev_bull & ~prev2_bull & small_middle,
+        bear & prev_bull & (o > pc) & (c < po),
+        bear & prev_bull & (o > ph) & (c < (po + pc) / 2),
+        bear & ~prev_bull & ~prev2_bull & (c < pc) & (pc < p2c),
+    ]
+    codes = np.select(conditions, np.arange(1, len(PATTERNS) + 1, dtype=np.int8), default=0).astype(np.int8)
+    codes[:MIN_HISTORY] = 0
+    return codes
+
+
+def _ohlc_arrays(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Extract Open/High/Low/Close as contiguous float64 arrays."""
+    return tuple(
+        pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)
+        for col in OHLC_COLUMNS
+    )
+
+
+def detect_patterns(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+    """
+    Vectorized candlestick pattern detection.
+
+    Returns a copy of `df` with `Pattern` and `Pattern_Type` object columns
+    (None where no pattern was found), identical to the per-row detector.
+
+    Args:
+        df: DataFrame with Open, High, Low and Close columns
+        copy: False adds the columns to `df` itself
+
+    Returns:
+        pd.DataFrame: Copy of the input (or the input) with pattern columns added
+    """
+    if df is None or df.empty:
+        return df
+
+    df_patterns = df.copy() if copy else df
+    codes = classify_candles(*_ohlc_arrays(df_patterns))
+    df_patterns['Pattern'] = PATTERN_NAMES[codes]
+    df_patterns['Pattern_Type'] = PATTERN_TYPES[codes]
+    return df_patterns
+
+
+def _ohlc_matrix(df: pd.DataFrame) -> np.ndarray:
+    """Open/High/Low/Close as an (n, 4) float64 array that does not share memory with `df`."""
+    try:
+        return np.column_stack([df[col].to_numpy(dtype=np.float64) for col in OHLC_COLUMNS])
+    except (TypeError, ValueError):
+        return np.column_stack(_ohlc_arrays(df))
+
+
+def _copy(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of `df`; a lazy one under pandas copy-on-write."""
+    return df.copy(deep=not pd.get_option('mode.copy_on_write'))
+
+
+class _CachedPatterns:
+    """What IncrementalPatternDetector keeps for one ticker."""
+
+    def __init__(self, frame: pd.DataFrame, ohlc: np.ndarray, codes: np.ndarray):
+        # Last pattern frame handed out, the OHLC values it was classified from
+        # (an (n, 4) float64 copy) and its pattern codes
+        self.frame = frame
+        self.ohlc = ohlc
+        self.codes = codes
+
+
+class IncrementalPatternDetector:
+    """
+    Per-ticker pattern cache that only classifies newly arrived bars.
+
+    Patterns depend on nothing but the OHLC values, so each ticker keeps the
+    OHLC values and pattern codes of its last history. Bars still present in
+    a new history are checked against those values (a vectorized compare of
+    four float columns) and keep their codes; the trailing MIN_HISTORY candles
+    are the only context needed to classify what comes next. The most recent
+    cached bar is always re-classified, since an intraday candle keeps
+    changing until the session closes. Anything that does not line up with
+    the cache (missing or revised bars, e.g. after a split adjustment) falls
+    back to a full classification. Other columns are taken from the new
+    history as they are.
+
+    Safe to share between sessions; updates are serialised with a lock. Only
+    the `max_tickers` most recently updated tickers are kept. Returned frames
+    are copies: lazy ones when pandas copy-on-write is enabled (as in the
+    app), full copies otherwise.
+    """
+
+    def __init__(self, max_tickers: int = DEFAULT_MAX_TICKERS):
+        self.max_tickers = max_tickers
+        self._cache: 'OrderedDict[str, _CachedPatterns]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, ticker: str) -> Optional[pd.DataFrame]:
+        """Return a copy of the cached pattern frame for `ticker`, if any."""
+        with self._lock:
+            cached = self._cache.get(ticker)
+            return None if cached is None else _copy(cached.frame)
+
+    def clear(self, ticker: Optional[str] = None) -> None:
+        """Drop the cache for one ticker, or for all tickers."""
+        with self._lock:
+            if ticker is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(ticker, None)
+
+    def update(self, ticker: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Return the pattern frame for the full history in `df`.
+
+        Only bars from the last cached timestamp onwards are classified when
+        `df` overlaps the cached history; the window start may also move
+        forward (e.g. a rolling 90-day load) without a full recompute.
+
+        Args:
+            ticker: Cache key, normally the cleaned ticker symbol
+            df: Full OHLC history, sorted by index
+
+        Returns:
+            pd.DataFrame: `df` with Pattern and Pattern_Type columns
+        """
+        if df is None or df.empty:
+            return df
+
+        ohlc = _ohlc_matrix(df)
+        with self._lock:
+            cached = self._cache.pop(ticker, None)
+            codes = self._extend(cached, df.index, ohlc) if cached is not None else None
+            if codes is None:
+                codes = classify_candles(*ohlc.T)
+            return self._store(ticker, df, ohlc, codes)
+
+    def append(self, ticker: str, bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Append only the new `bars` for `ticker` to its cached pattern frame.
+
+        A bar whose timestamp equals the last cached one replaces it.
+
+        Args:
+            ticker: Cache key, normally the cleaned ticker symbol
+            bars: New OHLC rows, sorted by index
+
+        Returns:
+            pd.DataFrame: The merged pattern frame
+        """
+        with self._lock:
+            cached = self._cache.get(ticker)
+            if cached is not None and (bars is None or bars.empty):
+                return _copy(cached.frame)
+        if cached is not None:
+            kept = cached.frame.iloc[:cached.frame.index.searchsorted(bars.index[0])]
+            bars = pd.concat([kept.drop(columns=PATTERN_COLUMNS), bars])
+        return self.update(ticker, bars)
+
+    @staticmethod
+    def _extend(cached: _CachedPatterns, index: pd.Index, ohlc: np.ndarray) -> Optional[np.ndarray]:
+        """Pattern codes for `ohlc` reusing the cached ones, or None if a full pass is needed."""
+        cached_index = cached.frame.index
+
+        # Locate where the new window starts within the cache
+        offset = cached_index.searchsorted(index[0])
+        if offset >= len(cached_index) or cached_index[offset] != index[0]:
+            return None
+
+        # The last cached bar must still be present; classification restarts there
+        start = len(cached_index) - 1 - offset
+        if start >= len(index) or not index[:start + 1].equals(cached_index[offset:]):
+            return None
+
+        # Cached codes are only reused if `df` still has exactly the same prices for them;
+        # comparing the bits also matches NaN gaps, without an isnan pass
+        if not np.array_equal(ohlc[:start].view(np.int64), cached.ohlc[offset:-1].view(np.int64)):
+            return None
+
+        context = max(start - MIN_HISTORY, 0)
+        fresh = classify_candles(*ohlc[context:].T)[start - context:]
+        codes = np.concatenate([cached.codes[offset:-1], fresh])
+        # A moved window start makes new leading rows, which never carry a pattern
+        codes[:MIN_HISTORY] = 0
+        return codes
+
+    def _store(self, ticker: str, df: pd.DataFrame, ohlc: np.ndarray, codes: np.ndarray) -> pd.DataFrame:
+        """Cache the pattern frame for `df`, evicting the least recently updated tickers."""
+        frame = _copy(df)
+        # Wrapping the columns in Series skips the dtype inference done for raw object arrays
+        frame['Pattern'] = pd.Series(PATTERN_NAMES[codes], index=df.index, copy=False)
+        frame['Pattern_Type'] = pd.Series(PATTERN_TYPES[codes], index=df.index, copy=False)
+        self._cache[ticker] = _CachedPatterns(frame, ohlc, codes)
+        while len(self._cache) > self.max_tickers:
+            self._cache.popitem(last=False)
+        return _copy(frame)
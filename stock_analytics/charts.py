@@ -0,0 +1,1434 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from typing import Callable, Optional
+
+from .indicator_graph import indicator_graph
+
+# notify(level, message) shows a chart problem to the user; level is 'warning' or 'error'
+Notifier = Callable[[str, str], None]
+
+
+def _print_notice(level: str, message: str) -> None:
+    print(message)
+
+
+def plot_all_data(df, ticker, lookback_days=90, model_results=None, patterns=None,
+                  sma_values=None, ema_values=None, buy_sell_ratio=None, currency_symbol="$"):
+    """Plot all data including price, volume, patterns, RSI, and predictions using enhanced visualization"""
+    # Limit the data to the lookback period
+    df = df.tail(lookback_days).copy()
+
+    # Extract data
+    dates = df.index.tolist()
+    opens = df['Open'].values.tolist()
+    highs = df['High'].values.tolist()
+    lows = df['Low'].values.tolist()
+    closes = df['Close'].values.tolist()
+    volumes = df['Volume'].values.tolist()
+
+    # Calculate if volume bars should be green or red based on price change
+    volume_colors = ['#00c853' if closes[i] >= opens[i] else '#ff3d00' for i in range(len(closes))]
+
+    # Create simplified figure with more optimal spacing and enhanced size
+    fig = make_subplots(
+        rows=3,
+        cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.05,
+        row_heights=[0.6, 0.2, 0.2],
+        specs=[
+            {"secondary_y": True},  # Row 1: Price chart with volume on secondary y
+            {"secondary_y": False},  # Row 2: RSI + MACD
+            {"secondary_y": False},  # Row 3: Stochastic + Bollinger
+        ],
+        subplot_titles=(
+            f"{str(ticker)} Price & Technical Analysis",
+            "Momentum Indicators",
+            "Volatility & Trend Indicators"
+        )
+    )
+
+    # Add basic candlestick chart
+    fig.add_trace(
+        go.Candlestick(
+            x=dates,
+            open=opens,
+            high=highs,
+            low=lows,
+            close=closes,
+            increasing=dict(line=dict(color='#26a69a', width=1), fillcolor='#26a69a'),
+            decreasing=dict(line=dict(color='#ef5350', width=1), fillcolor='#ef5350'),
+            name="Price"
+        ),
+        row=1, col=1
+    )
+
+    # Add volume bars with modified colors
+    fig.add_trace(
+        go.Bar(
+            x=dates,
+            y=volumes,
+            marker_color=volume_colors,
+            opacity=0.7,
+            name="Volume"
+        ),
+        row=1, col=1,
+        secondary_y=True
+    )
+
+    # Add SMA if available
+    if sma_values is not None:
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=sma_values,
+                name="SMA (9)",
+                line=dict(color='rgba(255, 165, 0, 0.7)', width=1)
+            )
+        )
+    
+    # Add EMA values
+    if 'EMA_20' in df.columns:
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=df['EMA_20'].values,
+                name="EMA (20)",
+                line=dict(color='rgba(46, 139, 87, 0.7)', width=1)
+            )
+        )
+
+    if 'EMA_50' in df.columns:
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=df['EMA_50'].values,
+                name="EMA (50)",
+                line=dict(color='rgba(70, 130, 180, 0.7)', width=1)
+            )
+        )
+
+    # Add Bollinger Bands
+    if all(col in df.columns for col in ['BB_Upper', 'BB_Middle', 'BB_Lower']):
+        # Upper band
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=df['BB_Upper'].values,
+                name="BB Upper",
+                line=dict(color='rgba(255, 0, 0, 0.3)', width=1)
+            )
+        )
+        
+        # Middle band
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=df['BB_Middle'].values,
+                name="BB Middle",
+                line=dict(color='rgba(0, 0, 255, 0.3)', width=1)
+            )
+        )
+        
+        # Lower band
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=df['BB_Lower'].values,
+                name="BB Lower",
+                line=dict(color='rgba(255, 0, 0, 0.3)', width=1)
+            )
+        )
+        
+        # Also plot the closing price in the Bollinger chart for reference
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=closes,
+                name="Close Price",
+                line=dict(color='rgba(0, 0, 0, 0.5)', width=1)
+            )
+        )
+
+    # Add RSI if available
+    if 'RSI' in df.columns and not df.empty:
+        rsi_values = df['RSI'].values.tolist()
+
+        # Add RSI line
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=rsi_values,
+                mode='lines',
+                line=dict(color='#3f51b5', width=1.5),
+                name="RSI (14)"
+            ),
+            row=2, col=1
+        )
+
+        # Add oversold and overbought lines for RSI
+        fig.add_trace(
+            go.Scatter(
+                x=[dates[0], dates[-1]],
+                y=[30, 30],
+                mode='lines',
+                line=dict(color='green', width=1, dash='dash'),
+                name="Oversold (30)",
+                showlegend=False
+            ),
+            row=2, col=1
+        )
+
+        fig.add_trace(
+            go.Scatter(
+                x=[dates[0], dates[-1]],
+                y=[70, 70],
+                mode='lines',
+                line=dict(color='red', width=1, dash='dash'),
+                name="Overbought (70)",
+                showlegend=False
+            ),
+            row=2, col=1
+        )
+
+        # Add middle line
+        fig.add_trace(
+            go.Scatter(
+                x=[dates[0], dates[-1]],
+                y=[50, 50],
+                mode='lines',
+                line=dict(color='rgba(0, 0, 0, 0.3)', width=1, dash='dot'),
+                showlegend=False
+            ),
+            row=2, col=1
+        )
+
+    # Add MACD if available
+    if all(col in df.columns for col in ['MACD', 'MACD_Signal']):
+        # MACD Line
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=df['MACD'].values,
+                mode='lines',
+                line=dict(color='#2196f3', width=1.5),
+                name="MACD"
+            ),
+            row=2, col=1
+        )
+
+        # MACD Signal
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=df['MACD_Signal'].values,
+                mode='lines',
+                line=dict(color='#ff9800', width=1.5),
+                name="Signal Line"
+            ),
+            row=2, col=1
+        )
+
+        # MACD Histogram
+        if 'MACD_Hist' in df.columns:
+            # Create custom colors for histogram based on value
+            hist_colors = ['#4caf50' if val >= 0 else '#f44336' for val in df['MACD_Hist'].values]
+
+            fig.add_trace(
+                go.Bar(
+                    x=dates,
+                    y=df['MACD_Hist'].values,
+                    marker_color=hist_colors,
+                    name="MACD Histogram",
+                    opacity=0.7,
+                    showlegend=True
+                ),
+                row=2, col=1
+            )
+
+    # Add Stochastic Oscillator if available
+    if all(col in df.columns for col in ['Stoch_K', 'Stoch_D']):
+        # Add K line
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=df['Stoch_K'].values,
+                mode='lines',
+                line=dict(color='#9c27b0', width=1.5),
+                name="%K Line"
+            ),
+            row=3, col=1
+        )
+
+        # Add D line
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=df['Stoch_D'].values,
+                mode='lines',
+                line=dict(color='#ff5722', width=1.5),
+                name="%D Line"
+            ),
+            row=3, col=1
+        )
+
+        # Add overbought/oversold lines for Stochastic
+        fig.add_trace(
+            go.Scatter(
+                x=[dates[0], dates[-1]],
+                y=[80, 80],
+                mode='lines',
+                line=dict(color='rgba(255, 0, 0, 0.5)', width=1, dash='dash'),
+                showlegend=False
+            ),
+            row=3, col=1
+        )
+
+        fig.add_trace(
+            go.Scatter(
+                x=[dates[0], dates[-1]],
+                y=[20, 20],
+                mode='lines',
+                line=dict(color='rgba(0, 128, 0, 0.5)', width=1, dash='dash'),
+                showlegend=False
+            ),
+            row=3, col=1
+        )
+
+    # Add predictions from model results if available
+    if not model_results.empty and 'y_pred_future' in model_results:
+        future_dates = model_results.get('future_dates', [])
+        y_pred_future = model_results.get('y_pred_future', [])
+
+        if len(future_dates) > 0 and len(y_pred_future) > 0:
+            # Add confidence interval if available
+            if 'y_pred_lower' in model_results and 'y_pred_upper' in model_results:
+                y_pred_lower = model_results.get('y_pred_lower', [])
+                y_pred_upper = model_results.get('y_pred_upper', [])
+
+                # Add confidence interval
+                fig.add_trace(
+                    go.Scatter(
+                        x=future_dates + future_dates[::-1],
+                        y=y_pred_upper + y_pred_lower[::-1],
+                        fill='toself',
+                        fillcolor='rgba(128, 0, 128, 0.1)',
+                        line=dict(color='rgba(0, 0, 0, 0)'),
+                        name="Prediction Range",
+                        showlegend=True
+                    ),
+                    row=1, col=1
+                )
+
+            # Add future prediction line
+            fig.add_trace(
+                go.Scatter(
+                    x=future_dates,
+                    y=y_pred_future,
+                    mode='lines+markers',
+                    line=dict(color='rgba(128, 0, 128, 0.9)', width=2),
+                    marker=dict(size=6, symbol='circle'),
+                    name="AI Prediction"
+                ),
+                row=1, col=1
+            )
+
+            # Add vertical line to show where prediction starts
+            if len(dates) > 0:
+                fig.add_shape(
+                    type="line",
+                    x0=dates[-1],
+                    y0=0,
+                    x1=dates[-1],
+                    y1=1,
+                    yref="paper",
+                    line=dict(
+                        color="rgba(0, 0, 0, 0.5)",
+                        width=1.5,
+                        dash="dash"
+                    )
+                )
+
+                # Add annotation for prediction start
+                fig.add_annotation(
+                    x=dates[-1],
+                    y=1.05,
+                    yref="paper",
+                    text="Prediction Start",
+                    showarrow=False,
+                    font=dict(size=10, color="rgba(0, 0, 0, 0.6)"),
+                    bgcolor="rgba(255, 255, 255, 0.8)",
+                    bordercolor="rgba(0, 0, 0, 0.2)",
+                    borderpad=2,
+                    borderwidth=1
+                )
+
+    # Set axis ranges
+    # RSI Chart (0-100)
+    fig.update_yaxes(range=[0, 100], row=2, col=1)
+
+    # Update layout with more detailed styling
+    fig.update_layout(
+        height=900,
+        template="plotly_white",
+        margin=dict(l=20, r=20, t=40, b=20),
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="center",
+            x=0.5,
+            bgcolor="rgba(255, 255, 255, 0.8)",
+            bordercolor="rgba(0, 0, 0, 0.2)",
+            borderwidth=1
+        ),
+        xaxis_rangeslider_visible=False,
+        hovermode="x unified",
+        hoverlabel=dict(
+            bgcolor="white",
+            font_size=12,
+            font_family="Arial"
+        ),
+        title=dict(
+            text=f"{str(ticker)} Technical Analysis & Price Prediction",
+            y=0.98,
+            x=0.5,
+            xanchor='center',
+            yanchor='top',
+            font=dict(
+                family="Arial",
+                size=20,
+                color="#1e3c72"
+            )
+        )
+    )
+
+    # Update styles for each subplot
+    fig.update_xaxes(
+        showgrid=True,
+        gridcolor='rgba(220, 220, 220, 0.8)',
+        zeroline=False,
+        showline=True,
+        linecolor='rgba(0, 0, 0, 0.3)'
+    )
+
+    fig.update_yaxes(
+        showgrid=True,
+        gridcolor='rgba(220, 220, 220, 0.8)',
+        zeroline=False,
+        showline=True,
+        linecolor='rgba(0, 0, 0, 0.3)'
+    )
+
+    # Add watermark for prediction disclaimer
+    fig.add_annotation(
+        x=0.5,
+        y=0.02,
+        xref="paper",
+        yref="paper",
+        text="Technical analysis and AI predictions are for informational purposes only. Not financial advice.",
+        showarrow=False,
+        font=dict(family="Arial", size=10, color="rgba(0,0,0,0.3)"),
+        align="center"
+    )
+
+    return fig
+
+
+def plot_prediction_analysis(df, model_results, ticker, currency_symbol="$", notify: Optional[Notifier] = None):
+    """
+    Generate a dedicated prediction analysis chart with enhanced visualization similar to TradingView
+
+    Problems that leave parts of the chart out are passed to `notify`
+    (printed by default), e.g. the app shows them with st.warning/st.error.
+    """
+    notify = notify or _print_notice
+
+    # Create a Plotly figure
+    fig = go.Figure()
+
+    if df is None or df.empty:
+        # Create empty figure if data is not available
+        fig.update_layout(
+            title="No prediction data available",
+            height=500
+        )
+        return fig
+
+    # Fix the ticker issue - ensure it's a proper string
+    if isinstance(ticker, (list, tuple)):
+        ticker = ''.join(ticker)
+
+    # RSI and Stochastic come from the frame's shared indicator graph, so columns
+    # the frame already has (e.g. from add_indicators) are reused, not recomputed
+    graph = indicator_graph(df)
+    rsi = graph.get('RSI')
+    stoch_k = graph.get('Stoch_K').clip(0, 100).fillna(50)
+    stoch_d = graph.get('Stoch_D').clip(0, 100).fillna(50)
+
+    # Ensure we have enough data to display
+    if len(df) < 5:
+        fig.add_annotation(
+            x=0.5, y=0.5,
+            text="Insufficient data for prediction visualization",
+            showarrow=False,
+            font=dict(size=16)
+        )
+        return fig
+
+    # Extract data for plotting
+    dates = df.index.tolist()
+    closes = df['Close'].values.tolist()
+    opens = df['Open'].values.tolist()
+    highs = df['High'].values.tolist()
+    lows = df['Low'].values.tolist()
+
+    # Create figure with subplots for price, indicators, and volume
+    fig = make_subplots(
+        rows=4,
+        cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.08,  # Increased spacing to prevent overlap
+        row_heights=[0.45, 0.2, 0.2, 0.15],  # Optimized heights for better distribution
+        subplot_titles=("", "", "", ""),  # Empty subplot titles to avoid overlap
+        figure=fig  # Use the existing figure object
+    )
+    
+    # Update layout for better spacing and readability
+    fig.update_layout(
+        height=900,  # Increased height for better visualization
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            bgcolor="rgba(255, 255, 255, 0.9)",
+            bordercolor="rgba(0, 0, 0, 0.2)",
+            borderwidth=1
+        ),
+        margin=dict(t=100, b=50, l=50, r=50)  # Adjusted margins for better spacing
+    )
+
+    # Add custom subplot titles with better positioning
+    fig.add_annotation(
+        xref="paper", yref="paper",
+        x=0.5, y=0.97,  # Position for the first subplot title
+        text="Price & Predictions",
+        showarrow=False,
+        font=dict(family="Arial", size=14, color="#1e3c72"),
+        bgcolor="rgba(248, 249, 250, 0.95)",
+        bordercolor="rgba(150, 150, 150, 0.5)",
+        borderwidth=1,
+        borderpad=4,
+        align="center"
+    )
+
+    fig.add_annotation(
+        xref="paper", yref="paper",
+        x=0.5, y=0.40,  # Position for the second subplot title
+        text="MACD",
+        showarrow=False,
+        font=dict(family="Arial", size=14, color="#1e3c72"),
+        bgcolor="rgba(248, 249, 250, 0.95)",
+        bordercolor="rgba(150, 150, 150, 0.5)",
+        borderwidth=1,
+        borderpad=4,
+        align="center"
+    )
+
+    fig.add_annotation(
+        xref="paper", yref="paper",
+        x=0.5, y=0.20,  # Position for the third subplot title
+        text="RSI & Stochastic",
+        showarrow=False,
+        font=dict(family="Arial", size=14, color="#1e3c72"),
+        bgcolor="rgba(248, 249, 250, 0.95)",
+        bordercolor="rgba(150, 150, 150, 0.5)",
+        borderwidth=1,
+        borderpad=4,
+        align="center"
+    )
+
+    # Add RSI indicator
+    fig.add_trace(
+        go.Scatter(
+            x=dates,
+            y=rsi,
+            mode='lines',
+            line=dict(color='#7B1FA2', width=1.5),
+            name='RSI'
+        ),
+        row=3, col=1
+    )
+
+    # Add Stochastic Oscillator
+    fig.add_trace(
+        go.Scatter(
+            x=dates,
+            y=stoch_k,
+            mode='lines',
+            line=dict(color='#1E88E5', width=1.5),
+            name='%K'
+        ),
+        row=3, col=1
+    )
+
+    fig.add_trace(
+        go.Scatter(
+            x=dates,
+            y=stoch_d,
+            mode='lines',
+            line=dict(color='#FFA726', width=1.5),
+            name='%D'
+        ),
+        row=3, col=1
+    )
+
+    # Add Volume
+    fig.add_trace(
+        go.Bar(
+            x=dates,
+            y=df['Volume'],
+            marker_color='rgba(128, 128, 128, 0.5)',
+            name='Volume'
+        ),
+        row=4, col=1
+    )
+
+    # Add candlestick chart for historical data with prediction overlay
+    fig.add_trace(
+        go.Candlestick(
+            x=dates,
+            open=opens,
+            high=highs,
+            low=lows,
+            close=closes,
+            increasing=dict(line=dict(color='#26A69A', width=1), fillcolor='#26A69A'),
+            decreasing=dict(line=dict(color='#EF5350', width=1), fillcolor='#EF5350'),
+            name="Price",
+            showlegend=True
+        ),
+        row=1, col=1
+    )
+
+    # Add prediction line if model results are available
+    if model_results is not None and len(model_results) > 0:
+        future_dates = pd.date_range(start=dates[-1], periods=len(model_results)+1, freq='D')[1:]
+        fig.add_trace(
+            go.Scatter(
+                x=future_dates,
+                y=np.array(model_results['y_pred_future']).flatten(),
+                mode='lines',
+                line=dict(color='#FFD700', width=2, dash='dash'),
+                name='Prediction',
+                showlegend=True
+            ),
+            row=1, col=1
+        )
+
+    # --- Safely add moving averages ---
+    try:
+        if 'SMA' in df.columns and not pd.api.types.is_bool_dtype(df['SMA'].isna().all()):
+            # Convert to Python boolean safely
+            sma_has_values = not all(df['SMA'].isna())
+            if sma_has_values:
+                fig.add_trace(
+                    go.Scatter(
+                        x=dates,
+                        y=df['SMA'].values,
+                        mode='lines',
+                        line=dict(color='#1976D2', width=1.5),
+                        name="9-day SMA"
+                    ),
+                    row=1, col=1
+                )
+    except Exception as e:
+        print(f"Error adding SMA: {str(e)}")
+
+    try:
+        if 'EMA_20' in df.columns and not all(df['EMA_20'].isna()):
+            fig.add_trace(
+                go.Scatter(
+                    x=dates,
+                    y=df['EMA_20'].values,
+                    mode='lines',
+                    line=dict(color='#FF9800', width=1.5),
+                    name="20-day EMA"
+                ),
+                row=1, col=1
+            )
+    except Exception as e:
+        print(f"Error adding EMA_20: {str(e)}")
+
+    try:
+        if 'EMA_50' in df.columns and not all(df['EMA_50'].isna()):
+            fig.add_trace(
+                go.Scatter(
+                    x=dates,
+                    y=df['EMA_50'].values,
+                    mode='lines',
+                    line=dict(color='#9C27B0', width=1.5),
+                    name="50-day EMA"
+                ),
+                row=1, col=1
+            )
+    except Exception as e:
+        print(f"Error adding EMA_50: {str(e)}")
+
+    # --- Safely add Bollinger Bands ---
+    try:
+        bb_columns = ['BB_Upper', 'BB_Middle', 'BB_Lower']
+        if all(col in df.columns for col in bb_columns):
+            # Check if at least one value is not NA in each column
+            bb_upper_has_values = not all(df['BB_Upper'].isna())
+            bb_middle_has_values = not all(df['BB_Middle'].isna())
+            bb_lower_has_values = not all(df['BB_Lower'].isna())
+
+            if bb_upper_has_values and bb_middle_has_values and bb_lower_has_values:
+                # Add Bollinger Bands
+                # Upper band
+                fig.add_trace(
+                    go.Scatter(
+                        x=dates,
+                        y=df['BB_Upper'].values,
+                        mode='lines',
+                        line=dict(color='rgba(68, 138, 255, 0.7)', width=1, dash='dot'),
+                        name="Bollinger Upper",
+                        hoverinfo='none'
+                    ),
+                    row=1, col=1
+                )
+                
+                # Middle band
+                fig.add_trace(
+                    go.Scatter(
+                        x=dates,
+                        y=df['BB_Middle'].values,
+                        mode='lines',
+                        line=dict(color='rgba(68, 138, 255, 0.9)', width=1),
+                        name="Bollinger Middle"
+                    ),
+                    row=1, col=1
+                )
+                
+                # Lower band
+                fig.add_trace(
+                    go.Scatter(
+                        x=dates,
+                        y=df['BB_Lower'].values,
+                        mode='lines',
+                        line=dict(color='rgba(68, 138, 255, 0.7)', width=1, dash='dot'),
+                        name="Bollinger Lower",
+                        hoverinfo='none',
+                        fill='tonexty',
+                        fillcolor='rgba(68, 138, 255, 0.05)'
+                    ),
+                    row=1, col=1
+                )
+    except Exception as e:
+        notify('warning', f"Error adding Bollinger Bands: {str(e)}")
+
+    # Add shaded region for prediction confidence interval
+    if model_results is not None and len(model_results) > 0:
+                    try:
+                        if len(model_results['y_pred_future']) > 0:
+                            std_dev = np.std(df['Close'][-30:])  # Use last 30 days for volatility estimate
+                            future_dates = pd.date_range(start=dates[-1], periods=len(model_results['y_pred_future']), freq='D')[1:]
+                            pred_array = np.array(model_results['y_pred_future']).flatten()
+                            
+                            # Ensure all arrays have the same length
+                            if len(future_dates) == len(pred_array):
+                                upper_bound = pred_array + (2 * std_dev)
+                                lower_bound = pred_array - (2 * std_dev)
+                                
+                                # Add confidence interval as a single filled area
+                                fig.add_trace(
+                                    go.Scatter(
+                                        x=list(future_dates) + list(future_dates)[::-1],
+                                        y=list(upper_bound) + list(lower_bound)[::-1],
+                                        fill='toself',
+                                        fillcolor='rgba(255, 215, 0, 0.2)',
+                                        line=dict(width=0),
+                                        name='Prediction Range',
+                                        showlegend=True
+                                    ),
+                                    row=1, col=1
+                                )
+                    except Exception as e:
+                        notify('warning', f"Error adding confidence interval visualization: {e}")
+
+    # Middle band (usually 20-day SMA)
+    fig.add_trace(
+        go.Scatter(
+        x=dates,
+        y=df['BB_Middle'].values,
+        mode='lines',
+        line=dict(color='rgba(68, 138, 255, 0.9)', width=1),
+        name="Bollinger Middle"
+        ),
+            row=1, col=1
+        )
+
+    # Lower band
+    try:
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=df['BB_Lower'].values,
+                mode='lines',
+                line=dict(color='rgba(68, 138, 255, 0.7)', width=1, dash='dot'),
+                name="Bollinger Lower",
+                hoverinfo='none',
+                fill='tonexty',
+                fillcolor='rgba(68, 138, 255, 0.05)'
+            ),
+            row=1, col=1
+        )
+    except Exception as e:
+        notify('error', f"Error adding Bollinger Lower Band: {str(e)}")
+        notify('error', "Please ensure the data contains valid Bollinger Bands calculations")
+
+    # Update layout with improved configurations
+    try:
+        fig.update_layout(
+            height=900,  # Increased height for better visibility
+            showlegend=True,
+            legend=dict(
+                yanchor="top",
+                y=0.99,
+                xanchor="left",
+                x=0.01,
+                bgcolor='rgba(255, 255, 255, 0.8)'
+            ),
+            margin=dict(t=30, l=50, r=50, b=30)
+        )
+
+        # Update Y-axes labels and ranges
+        fig.update_yaxes(
+            title_text="Price",
+            row=1, col=1,
+            tickprefix=currency_symbol,
+            tickformat='.2f'
+        )
+        fig.update_yaxes(
+            title_text="MACD",
+            row=2, col=1,
+            tickformat='.2f'
+        )
+        fig.update_yaxes(
+            title_text="RSI",
+            row=3, col=1,
+            range=[0, 100],
+            tickformat='.0f'
+        )
+        fig.update_yaxes(
+            title_text="Volume",
+            row=4, col=1,
+            tickformat='.0f'
+        )
+
+        # Add RSI reference lines
+        fig.add_hline(y=70, line_dash="dash", line_color="red", opacity=0.5, row=3, col=1)
+        fig.add_hline(y=30, line_dash="dash", line_color="green", opacity=0.5, row=3, col=1)
+
+        # Update X-axis to show dates properly
+        fig.update_xaxes(rangeslider_visible=False)
+    except Exception as e:
+        notify('error', f"Error updating chart layout: {str(e)}")
+        notify('error', "Please check the chart configuration and try again.")
+
+
+    # --- Safely add MACD indicator ---
+    try:
+        macd_columns = ['MACD', 'MACD_Signal', 'MACD_Hist']
+        if all(col in df.columns for col in macd_columns):
+            # Check if at least one value is not NA in each column
+            macd_has_values = not all(df['MACD'].isna())
+            macd_signal_has_values = not all(df['MACD_Signal'].isna())
+            macd_hist_has_values = not all(df['MACD_Hist'].isna())
+
+            # Fix: The problematic line using `.empty` on a boolean value
+            # Original: if not macd_has_values.empty and macd_signal_has_values and macd_hist_has_values:
+            # Changed to properly check boolean values
+            if macd_has_values and macd_signal_has_values and macd_hist_has_values:
+                # MACD Line
+                fig.add_trace(
+                    go.Scatter(
+                        x=dates,
+                        y=df['MACD'].values,
+                        mode='lines',
+                        line=dict(color='#2962FF', width=1.5),
+                        name="MACD Line"
+                    ),
+                    row=2, col=1
+                )
+
+                # MACD Signal Line
+                fig.add_trace(
+                    go.Scatter(
+                        x=dates,
+                        y=df['MACD_Signal'].values,
+                        mode='lines',
+                        line=dict(color='#FF6D00', width=1.5),
+                        name="MACD Signal"
+                    ),
+                    row=2, col=1
+                )
+
+                # MACD Histogram
+                colors = []
+                for val in df['MACD_Hist'].values:
+                    if pd.notnull(val) and val >= 0:
+                        colors.append('#26A69A')  # Green for positive
+                    else:
+                        colors.append('#EF5350')  # Red for negative
+
+                fig.add_trace(
+                    go.Bar(
+                        x=dates,
+                        y=df['MACD_Hist'].values,
+                        marker=dict(color=colors),
+                        name="MACD Histogram"
+                    ),
+                    row=2, col=1
+                )
+
+                # Add zero line for MACD
+                fig.add_shape(
+                    type="line",
+                    x0=dates[0],
+                    x1=dates[-1],
+                    y0=0,
+                    y1=0,
+                    line=dict(color="rgba(0,0,0,0.3)", width=1, dash="dot"),
+                    row=2, col=1
+                )
+    except Exception as e:
+        print(f"Error adding MACD: {str(e)}")
+
+    # --- Safely add Volume indicator ---
+    try:
+        if 'Volume' in df.columns and not all(df['Volume'].isna()):
+            colors = []
+            for i in range(len(df)):
+                if i > 0 and df['Close'].values[i] > df['Close'].values[i-1]:
+                    colors.append('#26A69A')  # Green for up days
+                else:
+                    colors.append('#EF5350')  # Red for down days
+
+            fig.add_trace(
+                go.Bar(
+                    x=dates,
+                    y=df['Volume'].values,
+                    marker=dict(color=colors, line=dict(width=0)),
+                    name="Volume"
+                ),
+                row=3, col=1
+            )
+
+            # Add 20-day average volume line
+            vol_ma = df['Volume'].rolling(window=20).mean()
+            fig.add_trace(
+                go.Scatter(
+                    x=dates,
+                    y=vol_ma.values,
+                    mode='lines',
+                    line=dict(color='rgba(0,0,0,0.5)', width=1.5),
+                    name="20-day Avg Volume"
+                ),
+                row=3, col=1
+            )
+    except Exception as e:
+        print(f"Error adding Volume: {str(e)}")
+
+    # --- Safely add prediction data ---
+    try:
+        if model_results is not None and isinstance(
+                model_results, dict) and 'y_pred_future' in model_results:
+            future_dates = model_results.get('future_dates', [])
+            y_pred_future = model_results.get('y_pred_future', [])
+
+            if len(future_dates) > 0 and len(y_pred_future) > 0:
+                # Add confidence intervals if available
+                if 'y_pred_lower' in model_results and 'y_pred_upper' in model_results:
+                    y_pred_lower = model_results.get('y_pred_lower', [])
+                    y_pred_upper = model_results.get('y_pred_upper', [])
+
+                    if len(y_pred_lower) > 0 and len(y_pred_upper) > 0:
+                        # Create the filled area for prediction range
+                        fig.add_trace(
+                            go.Scatter(
+                                x=future_dates + future_dates[::-1],
+                                y=y_pred_upper + y_pred_lower[::-1],
+                                fill='toself',
+                                fillcolor='rgba(0, 150, 136, 0.2)',
+                                line=dict(color='rgba(0, 150, 136, 0)'),
+                                name="Prediction Range",
+                                showlegend=True
+                            ),
+                            row=1, col=1
+                        )
+
+                # Add the prediction line with dots
+                fig.add_trace(
+                    go.Scatter(
+                        x=future_dates,
+                        y=y_pred_future,
+                        mode='lines+markers',
+                        line=dict(color='#00897B', width=2.5),
+                        marker=dict(size=8, symbol='circle', color='#00897B',
+                                    line=dict(color='white', width=1)),
+                        name="Price Prediction",
+                        hovertemplate="%{x|%b %d, %Y}: " +
+                        currency_symbol + "%{y:.2f}<extra></extra>"
+                    ),
+                    row=1, col=1
+                )
+
+                # Add visual separator between historical and prediction data
+                if len(dates) > 0:
+                    fig.add_shape(
+                        type="line",
+                        x0=dates[-1],
+                        x1=dates[-1],
+                        y0=0,
+                        y1=1,
+                        yref="paper",
+                        line=dict(color="rgba(0,0,0,0.5)", width=2, dash="dash")
+                    )
+
+                    # Add "Prediction Start" annotation
+                    fig.add_annotation(
+                        x=dates[-1],
+                        y=1.05,
+                        yref="paper",
+                        text="Prediction Start",
+                        showarrow=True,
+                        arrowhead=2,
+                        arrowsize=1,
+                        arrowwidth=1.5,
+                        arrowcolor="rgba(0,0,0,0.5)",
+                        font=dict(size=12, color="rgba(0,0,0,0.8)"),
+                        align="center",
+                        bgcolor="rgba(255,255,255,0.9)",
+                        bordercolor="rgba(0,0,0,0.2)",
+                        borderwidth=1,
+                        borderpad=4,
+                        ax=0,
+                        ay=-30
+                    )
+    except Exception as e:
+        print(f"Error adding prediction data: {str(e)}")
+
+    # Update layout with TradingView-like styling
+    fig.update_layout(
+        height=900,  # Increased height for subplots
+        template="plotly_white",
+        font=dict(family="Arial", size=12),
+        margin=dict(l=30, r=30, t=100, b=30),  # Increased top margin for title
+        title=dict(
+            text=f"{str(ticker)} Price Prediction Analysis",
+            font=dict(family="Arial", size=18, color="#1e3c72"),
+            x=0.5,
+            y=0.98  # Position title higher
+        ),
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="center",
+            x=0.5,
+            bgcolor="rgba(255, 255, 255, 0.9)",
+            bordercolor="rgba(150, 150, 150, 0.5)",
+            borderwidth=1
+        ),
+        xaxis=dict(
+            showgrid=True,
+            gridcolor="rgba(233, 233, 233, 1)",
+            zeroline=False,
+            showline=True,
+            linecolor="rgba(0, 0, 0, 0.3)",
+            title="Date",
+            rangeslider=dict(visible=False)
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor="rgba(233, 233, 233, 1)",
+            zeroline=False,
+            showline=True,
+            linecolor="rgba(0, 0, 0, 0.3)",
+            title="Price",
+            side="right"
+        ),
+        yaxis2=dict(
+            showgrid=True,
+            gridcolor="rgba(233, 233, 233, 1)",
+            zeroline=True,
+            zerolinecolor="rgba(0, 0, 0, 0.3)",
+            showline=True,
+            linecolor="rgba(0, 0, 0, 0.3)",
+            title="MACD",
+            side="right"
+        ),
+        yaxis3=dict(
+            showgrid=True,
+            gridcolor="rgba(233, 233, 233, 1)",
+            zeroline=False,
+            showline=True,
+            linecolor="rgba(0, 0, 0, 0.3)",
+            title="Volume",
+            side="right"
+        ),
+        xaxis_rangeslider_visible=False,
+        hovermode="x unified",
+        hoverlabel=dict(
+            bgcolor="white",
+            font_size=12,
+            font_family="Arial"
+        ),
+        dragmode="zoom",
+        selectdirection="h",
+        plot_bgcolor='rgba(248, 249, 250, 0.95)',
+        paper_bgcolor='rgba(248, 249, 250, 0.95)'
+    )
+
+    # Remove the subplot titles to avoid overlapping with the main title
+    fig.update_annotations(
+        font=dict(size=14),
+        y=0.94  # Move subplot titles down
+    )
+
+    # Add legend description
+    fig.add_annotation(
+        x=0.5,
+        y=-0.15,
+        xref="paper",
+        yref="paper",
+        text="Technical indicators: Moving Averages, Bollinger Bands, MACD, and Volume Analysis. Green/Red bars indicate rising/falling price.",
+        showarrow=False,
+        font=dict(family="Roboto, Arial", size=11, color="rgba(0, 0, 0, 0.6)"),
+        align="center"
+    )
+
+    return fig
+
+
+def plot_buyer_seller_analysis(df, ticker):
+    """Generate a dedicated buyer-seller analysis chart with enhanced visualization"""
+
+    if df is None or df.empty:
+        # Create empty figure if data is not available
+        fig = go.Figure()
+        fig.update_layout(
+            title="No buyer-seller data available",
+            height=500
+        )
+        return fig
+
+    # Copy only the columns the chart reads and ensure we have buyer/seller data
+    df_analysis = df[[col for col in ('Open', 'Close', 'Volume', 'Daily_Change', 'Buy_Volume', 'Sell_Volume')
+                      if col in df.columns]].copy()
+
+    if 'Daily_Change' not in df_analysis.columns:
+        df_analysis['Daily_Change'] = df_analysis['Close'] - df_analysis['Open']
+
+    # Calculate buying and selling activity by day
+    if 'Buy_Volume' not in df_analysis.columns:
+        df_analysis['Buy_Volume'] = 0
+        df_analysis.loc[df_analysis['Daily_Change'] >= 0,
+                        'Buy_Volume'] = df_analysis.loc[df_analysis['Daily_Change'] >= 0, 'Volume']
+
+    if 'Sell_Volume' not in df_analysis.columns:
+        df_analysis['Sell_Volume'] = 0
+        df_analysis.loc[df_analysis['Daily_Change'] < 0,
+                        'Sell_Volume'] = df_analysis.loc[df_analysis['Daily_Change'] < 0, 'Volume']
+
+    # Calculate momentum indicators
+    df_analysis['Buy_Momentum'] = df_analysis['Buy_Volume'].rolling(
+        window=5).mean() / df_analysis['Buy_Volume'].rolling(window=20).mean()
+    df_analysis['Sell_Momentum'] = df_analysis['Sell_Volume'].rolling(
+        window=5).mean() / df_analysis['Sell_Volume'].rolling(window=20).mean()
+
+    # Calculate additional buyer-seller metrics for enhanced analysis
+    df_analysis['Buy_Sell_Ratio'] = df_analysis['Buy_Volume'] / \
+        df_analysis['Sell_Volume'].replace(0, 0.00001)
+    df_analysis['Net_Volume'] = df_analysis['Buy_Volume'] - df_analysis['Sell_Volume']
+    df_analysis['Volume_Power'] = (df_analysis['Buy_Volume'] - df_analysis['Sell_Volume']) / (
+        df_analysis['Buy_Volume'] + df_analysis['Sell_Volume'].replace(0, 0.00001))
+
+    # Calculate a 10-day trend in volume power
+    df_analysis['Volume_Power_10d'] = df_analysis['Volume_Power'].rolling(window=10).mean()
+
+    # Fill NaN values in the numeric columns (label columns may be categorical)
+    numeric = df_analysis.select_dtypes(include='number').columns
+    df_analysis[numeric] = df_analysis[numeric].fillna(0)
+
+    # Create enhanced figure with three subplots for more detailed analysis
+    fig = make_subplots(
+        rows=3,
+        cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.10,  # Further increased spacing between subplots
+        row_heights=[0.5, 0.25, 0.25],
+        subplot_titles=("", "", "")  # Remove default subplot titles to avoid overlap
+    )
+
+    # Calculate the average Buy/Sell Ratio for annotation
+    avg_ratio = df_analysis['Buy_Sell_Ratio'].mean()
+
+    # Add custom positioned titles for each subplot
+    fig.add_annotation(
+        x=0.5, y=0.97,
+        xref="paper", yref="paper",
+        text=f"{str(ticker)} Buying & Selling Activity",
+        showarrow=False,
+        font=dict(family="Arial", size=14, color="#1e3c72"),
+        bgcolor="rgba(248, 249, 250, 0.95)",
+        bordercolor="rgba(150, 150, 150, 0.5)",
+        borderwidth=1,
+        borderpad=4,
+        align="center"
+    )
+
+    fig.add_annotation(
+        x=0.5, y=0.47,
+        xref="paper", yref="paper",
+        text="Volume Power (Buyer vs Seller Dominance)",
+        showarrow=False,
+        font=dict(family="Arial", size=14, color="#1e3c72"),
+        bgcolor="rgba(248, 249, 250, 0.95)",
+        bordercolor="rgba(150, 150, 150, 0.5)",
+        borderwidth=1,
+        borderpad=4,
+        align="center"
+    )
+
+    fig.add_annotation(
+        x=0.5, y=0.23,
+        xref="paper", yref="paper",
+        text="Momentum Ratio (5-day/20-day)",
+        showarrow=False,
+        font=dict(family="Arial", size=14, color="#1e3c72"),
+        bgcolor="rgba(248, 249, 250, 0.95)",
+        bordercolor="rgba(150, 150, 150, 0.5)",
+        borderwidth=1,
+        borderpad=4,
+        align="center"
+    )
+
+    # Add annotation for the average buy/sell ratio as important metric
+    fig.add_annotation(
+        x=0.02,
+        y=0.98,
+        xref="paper",
+        yref="paper",
+        text=f"Average Buy/Sell Ratio: {avg_ratio:.2f}",
+        showarrow=False,
+        font=dict(
+            size=12,
+            color="black"
+        ),
+        align="left",
+        bgcolor="rgba(255,255,255,0.8)",
+        bordercolor="rgba(0,0,0,0.2)",
+        borderwidth=1,
+        borderpad=4
+    )
+
+    # Add more visually appealing and informative volume data to first subplot
+    # Add buy volume as a bar
+    fig.add_trace(
+        go.Bar(
+            x=df_analysis.index,
+            y=df_analysis['Buy_Volume'],
+            name="Buy Volume",
+            marker_color='rgba(0, 200, 83, 0.7)',
+            opacity=0.9,
+            hovertemplate="Buy: %{y:,.0f}<extra></extra>"
+        ),
+        row=1, col=1
+    )
+
+    # Add sell volume as a bar
+    fig.add_trace(
+        go.Bar(
+            x=df_analysis.index,
+            y=df_analysis['Sell_Volume'],
+            name="Sell Volume",
+            marker_color='rgba(255, 61, 0, 0.7)',
+            opacity=0.9,
+            hovertemplate="Sell: %{y:,.0f}<extra></extra>"
+        ),
+        row=1, col=1
+    )
+
+    # Add net volume as a line for trend visibility
+    fig.add_trace(
+        go.Scatter(
+            x=df_analysis.index,
+            y=df_analysis['Net_Volume'],
+            mode='lines',
+            line=dict(color='rgba(100, 100, 255, 0.8)', width=2),
+            name="Net Volume (Buy-Sell)"
+        ),
+        row=1, col=1
+    )
+
+    # Add Volume Power to second subplot (shows buyer/seller dominance)
+    fig.add_trace(
+        go.Scatter(
+            x=df_analysis.index,
+            y=df_analysis['Volume_Power'],
+            mode='lines',
+            line=dict(color='rgba(128, 128, 128, 0.7)', width=1.5),
+            name="Volume Power",
+            hovertemplate="%{y:.2f}<extra></extra>"
+        ),
+        row=2, col=1
+    )
+
+    # Add 10-day average of Volume Power for trend visibility
+    fig.add_trace(
+        go.Scatter(
+            x=df_analysis.index,
+            y=df_analysis['Volume_Power_10d'],
+            mode='lines',
+            line=dict(color='rgba(0, 0, 200, 0.8)', width=2.5),
+            name="10-day Volume Power Trend",
+            hovertemplate="%{y:.2f}<extra></extra>"
+        ),
+        row=2, col=1
+    )
+
+    # Add zero line for reference
+    fig.add_shape(
+        type="line",
+        x0=df_analysis.index[0],
+        y0=0,
+        x1=df_analysis.index[-1],
+        y1=0,
+        line=dict(
+            color="rgba(0, 0, 0, 0.3)",
+            width=1,
+            dash="dot"
+        ),
+        row=2,
+        col=1
+    )
+
+    # Add momentum to third subplot with enhanced visualization
+    fig.add_trace(
+        go.Scatter(
+            x=df_analysis.index,
+            y=df_analysis['Buy_Momentum'],
+            mode='lines',
+            line=dict(color='#00C853', width=2),
+            fill='tozeroy',
+            fillcolor='rgba(0, 200, 83, 0.1)',
+            name="Buy Momentum"
+        ),
+        row=3, col=1
+    )
+
+    fig.add_trace(
+        go.Scatter(
+            x=df_analysis.index,
+            y=df_analysis['Sell_Momentum'],
+            mode='lines',
+            line=dict(color='#FF3D00', width=2),
+            fill='tozeroy',
+            fillcolor='rgba(255, 61, 0, 0.1)',
+            name="Sell Momentum"
+        ),
+        row=3, col=1
+    )
+
+    # Add reference line for neutral momentum with improved styling
+    fig.add_trace(
+        go.Scatter(
+            x=[df_analysis.index[0], df_analysis.index[-1]],
+            y=[1, 1],
+            mode='lines',
+            line=dict(color='rgba(0, 0, 0, 0.5)', width=1.5, dash='dash'),
+            name="Neutral Momentum",
+            showlegend=False
+        ),
+        row=3, col=1
+    )
+
+    # Update layout with enhanced styling
+    fig.update_layout(
+        height=800,
+        template="plotly_white",
+        barmode='group',
+        bargap=0.2,
+        plot_bgcolor='rgba(248, 249, 250, 0.95)',
+        paper_bgcolor='rgba(248, 249, 250, 0.95)',
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="center",
+            x=0.5,
+            bgcolor="rgba(255, 255, 255, 0.9)",
+            bordercolor="rgba(150, 150, 150, 0.5)",
+            borderwidth=1
+        ),
+        margin=dict(l=20, r=20, t=100, b=20),  # Increased top margin for title
+        hovermode="x unified",
+        title=dict(
+            text=f"{str(ticker)} Buyer-Seller Analysis",
+            font=dict(family="Arial", size=18, color="#1e3c72"),
+            x=0.5,
+            y=0.98  # Position title higher
+        ),
+        yaxis=dict(
+            title="Volume",
+            showgrid=True,
+            gridcolor='rgba(220, 220, 220, 0.8)',
+            zeroline=False,
+            tickfont=dict(family="Arial", size=10, color="#666")
+        ),
+        yaxis2=dict(
+            title="Volume Power",
+            showgrid=True,
+            gridcolor='rgba(220, 220, 220, 0.8)',
+            zeroline=True,
+            zerolinecolor='rgba(0,0,0,0.2)',
+            tickfont=dict(family="Arial", size=10, color="#666"),
+            range=[-1, 1]
+        ),
+        yaxis3=dict(
+            title="Momentum Ratio",
+            showgrid=True,
+            gridcolor='rgba(220, 220, 220, 0.8)',
+            zeroline=False,
+            tickfont=dict(family="Arial", size=10, color="#666")
+        ),
+        hoverlabel=dict(
+            bgcolor="white",
+            font_size=12,
+            font_family="Arial"
+        )
+    )
+
+    # Add useful annotation explaining the metrics
+    fig.add_annotation(
+        x=0.5,
+        y=-0.15,
+        xref="paper",
+        yref="paper",
+        text="Volume Power: +1 means all buying, -1 means all selling. Momentum Ratio > 1 shows increasing trend.",
+        showarrow=False,
+        font=dict(size=10, color="rgba(0,0,0,0.6)"),
+        align="center"
+    )
+
+    return fig
@@ -0,0 +1,116 @@
+import os
+from typing import Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .candlestick_patterns import PATTERN_NAMES, PATTERN_TYPES
+from .trading_signals import SIGNAL_LABELS
+
+# Set to 1 (or true/yes/on) to keep the app's pipeline frames compact, see compact_enabled()
+COMPACT_ENV = 'COMPACT_FRAMES'
+
+# Float dtype of prices and indicators in compact frames
+COMPACT_FLOAT = np.float32
+
+# Fixed categories for label columns, so a code means the same label in every frame
+LABEL_CATEGORIES = {
+    'Pattern': [name for name in PATTERN_NAMES if name is not None],
+    'Pattern_Type': list(dict.fromkeys(kind for kind in PATTERN_TYPES if kind is not None)),
+    'Signal': list(SIGNAL_LABELS),
+}
+
+
+def compact_enabled() -> bool:
+    """Whether compact frames were switched on through the COMPACT_FRAMES environment variable."""
+    return os.environ.get(COMPACT_ENV, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _integer_values(values: np.ndarray) -> Optional[np.ndarray]:
+    """
+    `values` as int32, or int64 if they do not fit, or None if they are not all whole numbers.
+
+    Signed and at least 32 bits, so differences and sums of volumes (e.g.
+    Buy_Volume - Sell_Volume) cannot wrap around.
+    """
+    if values.dtype.kind not in 'iu':
+        if not np.isfinite(values).all() or not np.array_equal(values, np.trunc(values)):
+            return None
+    limits = np.iinfo(np.int32)
+    fits = len(values) == 0 or (values.min() >= limits.min and values.max() <= limits.max)
+    return values.astype(np.int32 if fits else np.int64)
+
+
+def _compact_column(name, series: pd.Series, float_dtype) -> pd.Series:
+    if name in LABEL_CATEGORIES and series.dtype == object:
+        categories = LABEL_CATEGORIES[name]
+        if not set(series.dropna().unique()) <= set(categories):
+            categories = None
+        return series.astype(pd.CategoricalDtype(categories))
+    if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return series
+    if isinstance(name, str) and name.endswith('Volume'):
+        values = _integer_values(series.to_numpy())
+        if values is not None:
+            return pd.Series(values, index=series.index, name=series.name)
+    if pd.api.types.is_float_dtype(series):
+        return series.astype(float_dtype)
+    return series
+
+
+def compact_frame(df: pd.DataFrame, float_dtype=COMPACT_FLOAT) -> pd.DataFrame:
+    """
+    A smaller copy of a price, indicator, pattern or signal frame.
+
+    Float columns become `float_dtype`. Volume columns (names ending in
+    'Volume') holding whole numbers become int32 (int64 if needed);
+    otherwise they are treated like other floats. Pattern,
+    Pattern_Type and Signal become categoricals with fixed categories.
+    Everything else is kept as it is.
+
+    Args:
+        df: Frame from any stage of the analysis pipeline
+        float_dtype: np.float32 (default) or np.float64 to only shrink volumes and labels
+
+    Returns:
+        pd.DataFrame: New frame with the same index and columns
+    """
+    if df is None or df.empty:
+        return df
+    return pd.DataFrame({name: _compact_column(name, df[name], float_dtype) for name in df.columns},
+                        index=df.index)
+
+
+def frame_bytes(frames: Union[pd.DataFrame, Sequence[pd.DataFrame]]) -> int:
+    """Deep memory footprint of one frame or several, object columns included."""
+    if isinstance(frames, pd.DataFrame):
+        frames = [frames]
+    return int(sum(df.memory_usage(deep=True).sum() for df in frames if df is not None))
+
+
+def memory_report(frames: Mapping[str, Union[pd.DataFrame, Sequence[pd.DataFrame]]],
+                  float_dtype=COMPACT_FLOAT) -> pd.DataFrame:
+    """
+    Per-ticker memory footprint before and after compact_frame().
+
+    Args:
+        frames: {ticker: frame or list of frames held for that ticker}
+        float_dtype: See compact_frame()
+
+    Returns:
+        pd.DataFrame: rows, before_bytes, after_bytes and ratio per ticker,
+        plus a 'Total' row
+    """
+    rows = {}
+    for ticker, held in frames.items():
+        held = [held] if isinstance(held, pd.DataFrame) else list(held)
+        compacted = [compact_frame(df, float_dtype) for df in held]
+        rows[ticker] = {
+            'rows': max((len(df) for df in held if df is not None), default=0),
+            'before_bytes': frame_bytes(held),
+            'after_bytes': frame_bytes(compacted),
+        }
+    report = pd.DataFrame.from_dict(rows, orient='index', columns=['rows', 'before_bytes', 'after_bytes'])
+    report.loc['Total'] = report.sum()
+    report['ratio'] = report['before_bytes'] / report['after_bytes'].where(report['after_bytes'] > 0)
+    return report
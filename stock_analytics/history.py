@@ -0,0 +1,146 @@
+import datetime
+import os
+import re
+import pandas as pd
+
+from .market_data import get_provider, YFinanceProvider
+from .ohlcv_store import OHLCVStore, DEFAULT_STORE_DIR
+
+# Shared on-disk history per provider, created on first use
+_stores = {}
+
+
+def clean_ticker(ticker):
+    """Clean ticker symbol to handle various input formats"""
+    if isinstance(ticker, (list, tuple)):
+        ticker = ''.join([str(x) for x in ticker])
+    elif isinstance(ticker, str) and '(' in ticker and ')' in ticker:
+        matches = re.findall(r"['\"](w)['\"]+|\w+", ticker)
+        if matches:
+            ticker = ''.join(matches)
+    
+    ticker = re.sub(r'[^a-zA-Z0-9\.]', '', str(ticker))
+    return ticker.upper()
+
+
+def resolve_date_range(start_date=None, end_date=None):
+    """
+    Normalise a requested date range for downloading.
+
+    Defaults to the last 3 years, caps the end at today, and stops at
+    yesterday while the US market is open so partial bars are not stored.
+    Returns (start_date, download_end_date) as datetime.date values.
+    """
+    # Handle dates
+    current_date = datetime.datetime.now(datetime.timezone.utc).date()
+    if start_date is None:
+        start_date = (pd.Timestamp.now() - pd.DateOffset(years=3)).date()
+    else:
+        try:
+            start_date = pd.to_datetime(start_date).date()
+        except Exception:
+            start_date = (pd.Timestamp.now() - pd.DateOffset(years=3)).date()
+    
+    if end_date is None:
+        end_date = current_date
+    else:
+        try:
+            end_date = pd.to_datetime(end_date).date()
+            if end_date > current_date:
+                end_date = current_date
+        except Exception:
+            end_date = current_date
+
+    # Check market hours
+    current_time_et = datetime.datetime.now(datetime.timezone.utc).astimezone(datetime.timezone(datetime.timedelta(hours=-5)))
+    is_market_open = (
+        current_time_et.weekday() < 5 and
+        current_time_et.replace(hour=9, minute=30) <= current_time_et <= current_time_et.replace(hour=16)
+    )
+
+    # Adjust end date if market is open
+    download_end_date = (current_date - datetime.timedelta(days=1)) if is_market_open else end_date
+    return start_date, download_end_date
+
+
+def get_store(provider=None):
+    """
+    Return the process-wide OHLCV store for a data provider.
+
+    yfinance history lives directly under the store directory; any other
+    provider gets its own sub-directory so fixture data never mixes with
+    real downloads.
+    """
+    provider = provider or get_provider()
+    if provider.name not in _stores:
+        root = os.environ.get('OHLCV_STORE_DIR', DEFAULT_STORE_DIR)
+        if provider.name != YFinanceProvider.name:
+            root = os.path.join(root, provider.name)
+        _stores[provider.name] = OHLCVStore(root)
+    return _stores[provider.name]
+
+
+def load_stock_data_batch(tickers, start_date=None, end_date=None, provider=None):
+    """
+    Load daily history for many tickers with grouped requests.
+
+    Tickers that are missing the same date range (all of them on a cold
+    start, or everything after the same last stored date) are downloaded
+    together in one request, split into per-ticker frames and written to
+    the local store in one pass.
+
+    Args:
+        tickers: Iterable of ticker symbols
+        start_date, end_date: Requested date range (see resolve_date_range)
+        provider: MarketDataProvider to download from; defaults to get_provider()
+
+    Returns:
+        dict: {cleaned ticker: DataFrame} for every ticker with data
+    """
+    provider = provider or get_provider()
+    start_date, download_end_date = resolve_date_range(start_date, end_date)
+    store = get_store(provider)
+    symbols = list(dict.fromkeys(clean_ticker(t) for t in tickers if t))
+
+    # Group tickers by the date ranges the store is missing for them
+    groups = {}
+    for symbol in symbols:
+        for missing in store.missing_ranges(symbol, start_date, download_end_date):
+            groups.setdefault(missing, []).append(symbol)
+
+    fetched, failed = {}, set()
+    for (range_start, range_end), group in groups.items():
+        try:
+            frames = provider.history_batch(group, range_start, range_end)
+        except Exception as e:
+            # Leave the group's ranges unfetched, so the store does not mark them as covered
+            print(f"Error downloading batch of {len(group)} tickers: {str(e)}")
+            failed.update((symbol, range_start, range_end) for symbol in group)
+            continue
+        for symbol in group:
+            fetched[(symbol, range_start, range_end)] = frames.get(symbol, pd.DataFrame())
+
+    def from_batch(symbol, range_start, range_end):
+        key = (symbol, range_start, range_end)
+        if key in fetched:
+            return fetched[key]
+        # None for ranges whose batch request failed, see ohlcv_store.Fetcher
+        if key in failed:
+            return None
+        # A range outside the batches, e.g. the full reload of a revised history
+        try:
+            return provider.history(symbol, range_start, range_end)
+        except Exception as e:
+            print(f"Error downloading {symbol}: {str(e)}")
+            return None
+
+    results = {}
+    for symbol in symbols:
+        try:
+            data = store.update(symbol, start_date, download_end_date, from_batch)
+        except (OSError, ImportError, ValueError) as e:
+            print(f"Local data store unavailable for {symbol}: {str(e)}")
+            data = from_batch(symbol, start_date, download_end_date)
+        if data is not None and not data.empty:
+            results[symbol] = data
+    return results
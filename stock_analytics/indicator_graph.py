@@ -0,0 +1,214 @@
+import threading
+import weakref
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from .indicators import (INDICATOR_COLUMNS, calculate_ema, calculate_rsi, calculate_sma)
+
+# A node key is (kind, *args); string args name a frame column, tuple args name another node
+NodeKey = Tuple[Hashable, ...]
+
+# Named indicator columns, as produced by add_indicators(), and the node behind each
+NAMED_NODES: Dict[str, NodeKey] = {
+    'RSI': ('rsi', 'Close', 14),
+    'SMA': ('sma', 'Close', 9),
+    'EMA_20': ('ema', 'Close', 20),
+    'EMA_50': ('ema', 'Close', 50),
+    'MACD': ('macd', 'Close', 12, 26),
+    'MACD_Signal': ('macd_signal', 'Close', 12, 26, 9),
+    'MACD_Hist': ('macd_hist', 'Close', 12, 26, 9),
+    'BB_Upper': ('bb_upper', 'Close', 20, 2),
+    'BB_Middle': ('bb_middle', 'Close', 20),
+    'BB_Lower': ('bb_lower', 'Close', 20, 2),
+    'Stoch_K': ('stoch_k', 'High', 'Low', 'Close', 14),
+    'Stoch_D': ('stoch_d', 'High', 'Low', 'Close', 14, 3),
+}
+
+
+def _rolling_std(graph, source, window):
+    return graph.series(source).rolling(window=window).std()
+
+
+def _rolling_min(graph, source, window):
+    return graph.series(source).rolling(window=window).min()
+
+
+def _rolling_max(graph, source, window):
+    return graph.series(source).rolling(window=window).max()
+
+
+def _macd(graph, source, fast, slow):
+    return graph.node(('ema', source, fast)) - graph.node(('ema', source, slow))
+
+
+def _macd_signal(graph, source, fast, slow, signal):
+    return graph.node(('ema', ('macd', source, fast, slow), signal))
+
+
+def _macd_hist(graph, source, fast, slow, signal):
+    return graph.node(('macd', source, fast, slow)) - graph.node(('macd_signal', source, fast, slow, signal))
+
+
+def _bb_band(graph, source, window, num_std, sign):
+    sma = graph.node(('sma', source, window))
+    std = graph.node(('rolling_std', source, window))
+    band = sma + (std * num_std) if sign > 0 else sma - (std * num_std)
+    return band.ffill().bfill()
+
+
+def _stoch_k(graph, high, low, close, window):
+    low_min = graph.node(('rolling_min', low, window))
+    high_max = graph.node(('rolling_max', high, window))
+    return 100 * ((graph.series(close) - low_min) / (high_max - low_min))
+
+
+# How to compute each node kind; each function receives the graph and the key's arguments
+NODE_FUNCTIONS: Dict[str, Callable[..., pd.Series]] = {
+    'rsi': lambda graph, source, window: calculate_rsi(graph.series(source), window=window),
+    'sma': lambda graph, source, window: calculate_sma(graph.series(source), window=window),
+    'ema': lambda graph, source, window: calculate_ema(graph.series(source), window=window),
+    'rolling_std': _rolling_std,
+    'rolling_min': _rolling_min,
+    'rolling_max': _rolling_max,
+    'macd': _macd,
+    'macd_signal': _macd_signal,
+    'macd_hist': _macd_hist,
+    'bb_upper': lambda graph, source, window, num_std: _bb_band(graph, source, window, num_std, 1),
+    'bb_middle': lambda graph, source, window: graph.node(('sma', source, window)).ffill().bfill(),
+    'bb_lower': lambda graph, source, window, num_std: _bb_band(graph, source, window, num_std, -1),
+    'stoch_k': _stoch_k,
+    'stoch_d': lambda graph, high, low, close, k_window, d_window: calculate_sma(
+        graph.node(('stoch_k', high, low, close, k_window)), window=d_window),
+}
+
+
+class IndicatorGraph:
+    """
+    Lazily computed, memoized indicator nodes over one price frame.
+
+    Every (indicator, source, params) node is computed at most once and
+    shared by whatever depends on it: EMA_20/EMA_50 and the MACD EMAs, the
+    20-day SMA behind the Bollinger middle band and any other 20-day SMA
+    consumer, the Stochastic rolling min/max, and so on. Nothing is computed
+    until a column is asked for.
+
+    With reuse_columns=True (the default), a named indicator that already
+    exists as a column of the frame (e.g. one that went through
+    add_indicators()) is taken as-is instead of being recomputed.
+
+    The graph belongs to one version of the frame: treat the frame as
+    read-only while the graph is in use (see indicator_graph()).
+
+    With weak=True the graph only keeps a weak reference to the frame, so
+    caching the graph does not keep the frame alive.
+    """
+
+    def __init__(self, df: pd.DataFrame, reuse_columns: bool = True, weak: bool = False):
+        self._df = weakref.ref(df) if weak else (lambda: df)
+        self.reuse_columns = reuse_columns
+        self._nodes: Dict[NodeKey, pd.Series] = {}
+        self._lock = threading.RLock()
+        self.computed = 0
+
+    @property
+    def df(self) -> pd.DataFrame:
+        df = self._df()
+        if df is None:
+            raise ReferenceError("The frame of this IndicatorGraph has been garbage collected")
+        return df
+
+    def series(self, source) -> pd.Series:
+        """A frame column (string) or another node (tuple key)."""
+        return self.node(source) if isinstance(source, tuple) else self.df[source]
+
+    def node(self, key: NodeKey) -> pd.Series:
+        """Compute (once) and return the node for `key`."""
+        with self._lock:
+            result = self._nodes.get(key)
+            if result is None:
+                result = NODE_FUNCTIONS[key[0]](self, *key[1:])
+                self._nodes[key] = result
+                self.computed += 1
+            return result
+
+    def get(self, name: str) -> pd.Series:
+        """Return a named indicator column, see NAMED_NODES."""
+        if self.reuse_columns and name in self.df.columns:
+            return self.df[name]
+        return self.node(NAMED_NODES[name])
+
+    def columns(self, names: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Raw (unfilled) values for the requested named indicators.
+
+        Args:
+            names: Indicator names, defaults to all of INDICATOR_COLUMNS
+
+        Returns:
+            pd.DataFrame: One column per name, indexed like the frame
+        """
+        names = list(INDICATOR_COLUMNS if names is None else names)
+        return pd.DataFrame({name: self.get(name) for name in names}, index=self.df.index)
+
+
+# Graphs shared by consumers of the same frame, keyed by frame identity
+_graphs: Dict[int, Tuple[weakref.ref, tuple, IndicatorGraph]] = {}
+_graphs_lock = threading.Lock()
+
+
+def _frame_version(df: pd.DataFrame) -> tuple:
+    """
+    Cheap token that changes when rows or columns are added or removed.
+
+    Values edited in place (e.g. df.loc[...] = ...) do not change it.
+    """
+    bounds = (df.index[0], df.index[-1]) if len(df) else ()
+    return (df.shape, tuple(df.columns), bounds)
+
+
+def indicator_graph(df: pd.DataFrame) -> IndicatorGraph:
+    """
+    The shared IndicatorGraph for this frame object and version.
+
+    Consumers that are handed the same frame (charts, signal and model
+    code) get the same graph, so each node is computed once between them.
+    A frame whose shape, columns or index bounds change gets a new graph;
+    graphs only hold a weak reference to their frame and are dropped when
+    it is garbage collected.
+
+    Frames must not be modified in place once a graph exists for them:
+    edited values are not detected, and the graph would keep returning
+    nodes computed from the old values. Build a new frame (or call
+    IndicatorGraph directly) instead.
+    """
+    key = id(df)
+    version = _frame_version(df)
+    with _graphs_lock:
+        entry = _graphs.get(key)
+        if entry is not None and entry[0]() is df and entry[1] == version:
+            return entry[2]
+        graph = IndicatorGraph(df, weak=True)
+        _graphs[key] = (weakref.ref(df, lambda _, key=key: _graphs.pop(key, None)), version, graph)
+        return graph
+
+
+def indicator_frame(df: pd.DataFrame, names: Optional[Iterable[str]] = None,
+                    graph: Optional[IndicatorGraph] = None) -> pd.DataFrame:
+    """
+    `df` plus only the requested indicator columns, filled like add_indicators().
+
+    Args:
+        df: OHLCV frame
+        names: Indicator names, defaults to all of INDICATOR_COLUMNS
+        graph: Graph to compute from, defaults to indicator_graph(df)
+
+    Returns:
+        pd.DataFrame: A new frame; the requested columns match add_indicators(df)
+    """
+    graph = graph or indicator_graph(df)
+    result = df.copy()
+    raw = graph.columns(names)
+    for name in raw.columns:
+        result[name] = raw[name]
+    return result.ffill().bfill()
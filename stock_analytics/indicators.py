@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+
+from .rolling import rolling_mean
+
+# Custom technical indicators to replace pandas_ta
+
+# Columns added by add_indicators(), in order
+INDICATOR_COLUMNS = ['RSI', 'SMA', 'EMA_20', 'EMA_50', 'MACD', 'MACD_Signal', 'MACD_Hist',
+                     'BB_Upper', 'BB_Middle', 'BB_Lower', 'Stoch_K', 'Stoch_D']
+
+
+# Smoothing methods accepted by rsi_kernel()
+RSI_METHODS = ('sma', 'wilder')
+
+
+def rsi_kernel(close, window=14, method='sma'):
+    """
+    RSI of one price series or of many at once.
+
+    Gains and losses are written side by side into a single buffer, so one
+    rolling (or Wilder) smoothing pass covers both, and RS and RSI are then
+    computed in place. Where the average loss is 0, RS is taken as 0, as
+    calculate_rsi() always has.
+
+    Args:
+        close: Prices, 1-D (n_days,) or 2-D (n_days, n_series) with one
+               column per series
+        window: Smoothing window
+        method: 'sma' averages the last `window` moves (with fewer at the
+                start), matching calculate_rsi() exactly; 'wilder' seeds with
+                that average at row `window` and then applies Wilder's
+                smoothing (EMA with alpha = 1 / window), leaving the first
+                `window` rows NaN
+
+    Returns:
+        np.ndarray: float64 RSI values, same shape as `close`
+    """
+    if method not in RSI_METHODS:
+        raise ValueError(f"Unknown RSI method {method!r}, expected one of {RSI_METHODS}")
+    close = np.asarray(close, dtype=np.float64)
+    values = close[:, np.newaxis] if close.ndim == 1 else close
+    n_days, n_series = values.shape
+
+    # Columns [:n_series] hold gains, [n_series:] losses; NaN moves count as 0
+    moves = np.zeros((n_days, 2 * n_series))
+    if n_days > 1:
+        delta = np.subtract(values[1:], values[:-1])
+        np.fmax(delta, 0, out=moves[1:, :n_series])
+        np.negative(delta, out=delta)
+        np.fmax(delta, 0, out=moves[1:, n_series:])
+
+    if method == 'sma':
+        averages = rolling_mean(moves, window, min_periods=1)
+    else:
+        if n_days > window:
+            moves[window] = moves[1:window + 1].mean(axis=0)
+        moves[:min(window, n_days)] = np.nan
+        averages = pd.DataFrame(moves).ewm(alpha=1.0 / window, adjust=False).mean().to_numpy()
+
+    avg_gain, avg_loss = averages[:, :n_series], averages[:, n_series:]
+    rsi = np.divide(avg_gain, avg_loss, out=np.zeros((n_days, n_series)), where=avg_loss != 0)
+    rsi += 1
+    np.divide(100, rsi, out=rsi)
+    np.subtract(100, rsi, out=rsi)
+    return rsi.reshape(close.shape)
+
+
+def calculate_rsi(data, window=14, method='sma'):
+    """Calculate RSI safely handling Series objects with improved error handling"""
+    try:
+        # Convert input to pandas Series if it isn't already
+        if not isinstance(data, pd.Series):
+            data = pd.Series(data)
+
+        rsi = pd.Series(rsi_kernel(data.to_numpy(dtype=np.float64), window, method), index=data.index)
+        # Only Wilder's warm-up rows can be NaN; they get the neutral value
+        return rsi if method == 'sma' else rsi.fillna(50)
+    except Exception as e:
+        print(f"Error calculating RSI: {str(e)}")
+        return pd.Series(50, index=data.index)  # Return neutral RSI on error
+
+
+def calculate_rsi_batch(closes, window=14, method='sma'):
+    """
+    RSI for many tickers at once, see rsi_kernel().
+
+    Args:
+        closes: Close prices, one column per ticker
+
+    Returns:
+        pd.DataFrame: RSI values with the same index and columns
+    """
+    return pd.DataFrame(rsi_kernel(closes.to_numpy(dtype=np.float64), window, method),
+                        index=closes.index, columns=closes.columns)
+
+
+def calculate_sma(data, window=9):
+    """Calculate Simple Moving Average"""
+    return data.rolling(window=window).mean()
+
+
+def calculate_ema(data, window=20):
+    """Calculate Exponential Moving Average"""
+    return data.ewm(span=window, adjust=False).mean()
+
+
+def calculate_macd(data, fast=12, slow=26, signal=9):
+    """Calculate MACD"""
+    fast_ema = calculate_ema(data, window=fast)
+    slow_ema = calculate_ema(data, window=slow)
+    macd_line = fast_ema - slow_ema
+    signal_line = calculate_ema(macd_line, window=signal)
+    histogram = macd_line - signal_line
+    return macd_line, signal_line, histogram
+
+
+def calculate_bollinger_bands(data, window=20, num_std=2):
+    """Calculate Bollinger Bands with improved error handling"""
+    try:
+        if data is None or len(data) == 0:
+            raise ValueError("Input data is empty or None")
+            
+        sma = calculate_sma(data, window=window)
+        std = data.rolling(window=window).std()
+        upper_band = sma + (std * num_std)
+        lower_band = sma - (std * num_std)
+        
+        # Fill NaN values with forward fill then backward fill
+        upper_band = upper_band.ffill().bfill()
+        sma = sma.ffill().bfill()
+        lower_band = lower_band.ffill().bfill()
+        
+        return upper_band, sma, lower_band
+    except Exception as e:
+        print(f"Error calculating Bollinger Bands: {str(e)}")
+        # Return neutral values on error
+        neutral_series = pd.Series(data.mean() if len(data) > 0 else 0, index=data.index)
+        return neutral_series, neutral_series, neutral_series
+
+
+def calculate_stochastic(df, k_window=14, d_window=3):
+    """Calculate Stochastic Oscillator"""
+    low_min = df['Low'].rolling(window=k_window).min()
+    high_max = df['High'].rolling(window=k_window).max()
+
+    k = 100 * ((df['Close'] - low_min) / (high_max - low_min))
+    d = k.rolling(window=d_window).mean()
+    return k, d
+
+
+def add_indicators(df, copy=True):
+    """Add technical indicators to dataframe
+
+    With copy=False the columns are added to `df` itself (and its gaps filled)
+    instead of a copy, for pipelines that own the frame.
+    Use indicator_graph.indicator_frame() to compute only some of the columns.
+    """
+    from .indicator_graph import IndicatorGraph
+
+    try:
+        # Fix: Check if df is None or empty using proper method
+        if df is None or (isinstance(df, pd.DataFrame) and df.empty):
+            raise ValueError("Input dataframe is empty or None")
+
+        # Make a deep copy of the dataframe to avoid modifying the original
+        df_copy = df.copy() if copy else df
+
+        # Make sure we have the basic required columns
+        required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
+        for col in required_cols:
+            if col not in df_copy.columns:
+                print(f"Missing required column: {str(col)}")
+                # Add placeholder data if missing
+                if col in ['Open', 'High', 'Low', 'Close']:
+                    df_copy[col] = df_copy['Close'] if 'Close' in df_copy.columns else 0
+                elif col == "Volume":  # Fix: Use string equality instead of str()
+                    df_copy[col] = 0
+
+        # Every column comes from one indicator graph, so shared inputs (the MACD and
+        # EMA averages, rolling windows) are computed once
+        graph = IndicatorGraph(df_copy, reuse_columns=False)
+        for col in INDICATOR_COLUMNS:
+            df_copy[col] = graph.get(col)
+    
+        # Forward fill and backward fill NaN values, column by column so only
+        # the columns with gaps are rewritten (same values as df.ffill().bfill())
+        gaps = df_copy.columns[df_copy.isna().any().to_numpy()]
+        for col in gaps:
+            df_copy[col] = df_copy[col].ffill().bfill()
+        return df_copy
+    except Exception as e:
+        print(f"Error calculating indicators: {str(e)}")
+        if "[" in str(e) and "not in index" in str(e):
+            print("This appears to be a ticker format issue. Attempting to fix...")
+
+        # Create a copy to avoid modifying the original
+        # Fix: Check if df is None or empty using proper method before copying
+        df_copy = df.copy() if (df is not None and not (isinstance(df, pd.DataFrame) and df.empty)) else pd.DataFrame({'Close': [0]})
+
+        # Ensure the required columns exist even if calculation fails
+        for col in INDICATOR_COLUMNS:
+            if col not in df_copy.columns:
+                df_copy[col] = 50  # Default neutral value
+
+        return df_copy
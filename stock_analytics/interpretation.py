@@ -0,0 +1,34 @@
+def get_rsi_interpretation(rsi_value):
+    """Get interpretation text for RSI value"""
+    if rsi_value > 70:
+        return "Overbought"
+    elif rsi_value < 30:
+        return "Oversold"
+    else:
+        return "Neutral"
+
+def get_macd_interpretation(macd_diff):
+    """Get interpretation text for MACD difference"""
+    if macd_diff > 0.5:
+        return "Strong Bullish"
+    elif macd_diff > 0:
+        return "Bullish"
+    elif macd_diff < -0.5:
+        return "Strong Bearish"
+    else:
+        return "Bearish"
+
+def get_bb_interpretation(price, upper, lower):
+    """Get interpretation text for Bollinger Bands"""
+    if price > upper:
+        return "Overbought"
+    elif price < lower:
+        return "Oversold"
+    else:
+        percent = (price - lower) / (upper - lower) * 100
+        if percent > 80:
+            return "Near Upper Band"
+        elif percent < 20:
+            return "Near Lower Band"
+        else:
+            return "Middle Range"
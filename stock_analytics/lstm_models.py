@@ -0,0 +1,168 @@
+import datetime
+import numpy as np
+import pandas as pd
+from typing import Callable, List, Optional, Tuple
+
+from .indicator_graph import indicator_frame
+from .sequences import make_sequences
+
+# Registry architecture names
+LIVE_ARCHITECTURE = 'live_lstm_v1'
+
+# Training window and look-back of the Live Analysis model
+LIVE_HISTORY_DAYS = 90
+LIVE_TIME_STEPS = 10
+
+# Fine-tuning defaults: a few passes over the most recent windows at a low learning rate
+FINE_TUNE_WINDOWS = 30
+FINE_TUNE_EPOCHS = 2
+FINE_TUNE_LEARNING_RATE = 1e-4
+# Fall back to a full retrain when recent prices leave the scaler's range by more than this fraction
+FINE_TUNE_RANGE_SLACK = 0.1
+
+
+def live_window_start(now: datetime.datetime) -> datetime.datetime:
+    """Start of the Live Analysis window: at least LIVE_HISTORY_DAYS back, at the start of that month.
+
+    The start only moves once a month, so between those moves every refresh
+    extends the same history and the indicator cache stays incremental.
+    """
+    start = now - datetime.timedelta(days=LIVE_HISTORY_DAYS)
+    return start.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def create_model(time_steps, n_features, lstm_units_1=50, lstm_units_2=30,
+                 dense_units=20, dropout_rate=0.2, simple_model=False):
+    """Create a deep learning model for stock prediction"""
+    import tensorflow as tf
+
+    # Reduce TensorFlow memory usage
+    tf.config.experimental.set_memory_growth(
+        tf.config.list_physical_devices('GPU')[0],
+        True) if tf.config.list_physical_devices('GPU') else None
+
+    if simple_model:
+        # Create a simple, lightweight model for faster training
+        model = tf.keras.Sequential([
+            tf.keras.layers.LSTM(lstm_units_1, return_sequences=False,
+                                input_shape=(time_steps, n_features)),
+            tf.keras.layers.Dropout(dropout_rate),
+            tf.keras.layers.Dense(1)
+        ])
+    else:
+        # Create a more complex model with multiple LSTM layers
+        model = tf.keras.Sequential([
+            tf.keras.layers.LSTM(lstm_units_1, return_sequences=True,
+                                input_shape=(time_steps, n_features)),
+            tf.keras.layers.Dropout(dropout_rate),
+            tf.keras.layers.LSTM(lstm_units_2, return_sequences=False),
+            tf.keras.layers.Dropout(dropout_rate),
+            tf.keras.layers.Dense(dense_units, activation='relu'),
+            tf.keras.layers.Dense(1)
+        ])
+
+    # Compile model with Adam optimizer
+    optimizer = tf.keras.optimizers.Adam(learning_rate=0.001)
+    model.compile(optimizer=optimizer, loss='mse', metrics=['mse'])
+
+    return model
+
+
+def build_live_model(time_steps: int, n_features: int):
+    """Two-layer LSTM used by the Live Analysis prediction tab."""
+    import tensorflow as tf
+
+    model = tf.keras.Sequential([
+        tf.keras.layers.LSTM(50, return_sequences=True, input_shape=(time_steps, n_features)),
+        tf.keras.layers.Dropout(0.2),
+        tf.keras.layers.LSTM(50, return_sequences=False),
+        tf.keras.layers.Dropout(0.2),
+        tf.keras.layers.Dense(1)
+    ])
+    model.compile(optimizer='adam', loss='mean_squared_error')
+    return model
+
+
+def live_feature_frame(data: pd.DataFrame, data_with_indicators: Optional[pd.DataFrame] = None) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Build the Live Analysis feature frame from daily bars.
+
+    Returns:
+        Tuple[pd.DataFrame, List[str]]: Frame with the feature columns, Close
+        first, and the list of those columns
+    """
+    if data_with_indicators is None:
+        data_with_indicators = indicator_frame(data, ['RSI', 'MACD'])
+
+    prediction_data = data.copy()
+    features = ['Close', 'Volume']
+    for col in ('RSI', 'MACD'):
+        if col in data_with_indicators.columns:
+            prediction_data[col] = data_with_indicators[col]
+            features.append(col)
+    return prediction_data[features], features
+
+
+def train_model(frame: pd.DataFrame, time_steps: int, build: Callable = build_live_model,
+                epochs: int = 5, batch_size: int = 32) -> Tuple[object, object]:
+    """
+    Fit a fresh model on a feature frame (Close first).
+
+    Returns:
+        Tuple: (trained model, MinMaxScaler fitted on `frame`)
+    """
+    from sklearn.preprocessing import MinMaxScaler
+
+    scaler = MinMaxScaler(feature_range=(0, 1))
+    scaled_data = scaler.fit_transform(frame).astype(np.float32)
+    X, y = make_sequences(scaled_data, time_steps)
+
+    model = build(time_steps, X.shape[2])
+    model.fit(X, y, epochs=epochs, batch_size=batch_size, verbose=0)
+    return model, scaler
+
+
+def train_live_model(frame: pd.DataFrame, time_steps: int, epochs: int = 5, batch_size: int = 32) -> Tuple[object, object]:
+    """Fit a fresh Live Analysis model, see train_model()."""
+    return train_model(frame, time_steps, build_live_model, epochs, batch_size)
+
+
+def fine_tune_model(entry, frame: pd.DataFrame, recent_windows: int = FINE_TUNE_WINDOWS,
+                    epochs: int = FINE_TUNE_EPOCHS, learning_rate: float = FINE_TUNE_LEARNING_RATE,
+                    batch_size: int = 32) -> Optional[Tuple[object, object]]:
+    """
+    Warm-start a registered model on the most recent windows of `frame`.
+
+    The saved weights are copied into a fresh model of the same architecture
+    (the registry's in-memory model is left untouched for other readers) and
+    trained for a few epochs on the last `recent_windows` windows only. The
+    saved scaler is kept so the model's inputs mean the same thing.
+
+    Args:
+        entry: RegisteredModel from the model registry
+        frame: Current feature frame, same columns as at training time
+
+    Returns:
+        Tuple or None: (model, scaler), or None when prices have moved too far
+        outside the scaler's range and a full retrain is needed
+    """
+    import tensorflow as tf
+
+    time_steps = entry.meta['time_steps']
+    scaler = entry.scaler
+    recent = frame.iloc[-(recent_windows + time_steps):]
+    scaled_data = scaler.transform(recent).astype(np.float32)
+
+    close = scaled_data[:, 0]
+    if close.min() < -FINE_TUNE_RANGE_SLACK or close.max() > 1 + FINE_TUNE_RANGE_SLACK:
+        return None
+
+    X, y = make_sequences(scaled_data, time_steps)
+    if len(y) == 0:
+        return None
+
+    model = tf.keras.models.clone_model(entry.model)
+    model.set_weights(entry.model.get_weights())
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate), loss='mean_squared_error')
+    model.fit(X, y, epochs=epochs, batch_size=batch_size, verbose=0)
+    return model, scaler
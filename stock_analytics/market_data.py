@@ -0,0 +1,285 @@
+import abc
+import datetime
+import json
+import os
+import re
+import time
+import pandas as pd
+from typing import Dict, Iterable, List, Optional
+
+from . import DATA_DIR
+
+# Backend used when MARKET_DATA_PROVIDER is not set
+DEFAULT_PROVIDER = 'yfinance'
+
+# Default fixture directory for the local provider (override with MARKET_DATA_DIR)
+DEFAULT_FIXTURE_DIR = os.path.join(DATA_DIR, 'fixtures')
+
+# Returned by options() when a ticker has no listed options
+EMPTY_OPTIONS = {"calls": pd.DataFrame(), "puts": pd.DataFrame(), "expirations": []}
+
+# Process-wide provider, created on first use
+_provider = None
+
+
+class MarketDataProvider(abc.ABC):
+    """
+    Interface for everything the app reads from a market-data vendor.
+
+    Dates are inclusive `datetime.date` values and history frames are indexed
+    by tz-naive timestamps with Open, High, Low, Close, Adj Close and Volume
+    columns. Quote dicts use the yfinance `info` keys the app relies on
+    (currentPrice, previousClose, shortName, volume, marketCap).
+    Subclasses implement history, quote, news and options; history_batch
+    falls back to one history() call per ticker.
+    """
+
+    name = 'base'
+
+    @abc.abstractmethod
+    def history(self, ticker: str, start_date: datetime.date, end_date: datetime.date) -> pd.DataFrame:
+        """Daily bars for one ticker; an empty frame when there is no data."""
+
+    def history_batch(self, tickers: Iterable[str], start_date: datetime.date,
+                      end_date: datetime.date) -> Dict[str, pd.DataFrame]:
+        """Daily bars for several tickers, keyed by ticker; tickers without data are omitted."""
+        frames = {}
+        for ticker in tickers:
+            data = self.history(ticker, start_date, end_date)
+            if data is not None and not data.empty:
+                frames[ticker] = data
+        return frames
+
+    @abc.abstractmethod
+    def quote(self, ticker: str) -> dict:
+        """Latest quote and company details for a ticker."""
+
+    @abc.abstractmethod
+    def news(self, ticker: str) -> List[dict]:
+        """Recent news items for a ticker, newest first where the source allows."""
+
+    @abc.abstractmethod
+    def options(self, ticker: str) -> dict:
+        """Options chain for the nearest expiration: {'calls', 'puts', 'expirations'}."""
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Market data from Yahoo Finance via yfinance."""
+
+    name = 'yfinance'
+
+    def __init__(self):
+        import yfinance
+        self._yf = yfinance
+
+    def history(self, ticker, start_date, end_date):
+        data = self._yf.download(
+            ticker,
+            start=start_date.strftime('%Y-%m-%d'),
+            end=(end_date + datetime.timedelta(days=1)).strftime('%Y-%m-%d'),
+            progress=False,
+            auto_adjust=False  # Explicitly set auto_adjust to False for consistent data
+        )
+        if data.empty:
+            return data
+        # Ensure consistent timezone handling
+        data.index = data.index.tz_localize(None)
+        return data[data.index.normalize() <= pd.Timestamp(end_date).normalize()]
+
+    def history_batch(self, tickers, start_date, end_date):
+        tickers = list(tickers)
+        data = self._yf.download(
+            tickers,
+            start=start_date.strftime('%Y-%m-%d'),
+            end=(end_date + datetime.timedelta(days=1)).strftime('%Y-%m-%d'),
+            progress=False,
+            auto_adjust=False,
+            group_by='ticker',
+            threads=True
+        )
+        return split_batch_frame(data, tickers, end_date)
+
+    def quote(self, ticker):
+        return self._yf.Ticker(ticker).info or {}
+
+    def news(self, ticker):
+        news = self._yf.Ticker(ticker).news
+        return news if isinstance(news, list) else []
+
+    def options(self, ticker):
+        stock = self._yf.Ticker(ticker)
+        expirations = stock.options
+        if not expirations:
+            return dict(EMPTY_OPTIONS)
+        chain = stock.option_chain(expirations[0])
+        return {"calls": chain.calls, "puts": chain.puts, "expirations": expirations}
+
+
+class LocalFileProvider(MarketDataProvider):
+    """
+    Deterministic market data served from fixture files.
+
+    Layout under `root` (every file is optional):
+
+        history/<TICKER>.parquet or history/<TICKER>.csv   daily bars, first column is the date
+        info/<TICKER>.json                                  quote fields, merged over derived ones
+        news/<TICKER>.json                                  list of news items
+        options/<TICKER>/calls.csv, puts.csv                chains with an `expiration` column
+
+    Quotes are derived from the last two stored bars when no info file
+    exists. Every call sleeps for `latency` seconds first, so load tests can
+    model a slow vendor without touching the network.
+    """
+
+    name = 'local'
+
+    def __init__(self, root: Optional[str] = None, latency: Optional[float] = None):
+        self.root = root or os.environ.get('MARKET_DATA_DIR', DEFAULT_FIXTURE_DIR)
+        if latency is None:
+            latency = float(os.environ.get('MARKET_DATA_LATENCY', '0'))
+        self.latency = latency
+
+    def _wait(self):
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def _path(self, folder: str, ticker: str, suffix: str = '') -> str:
+        safe = re.sub(r'[^A-Za-z0-9._^-]', '_', str(ticker).upper())
+        return os.path.join(self.root, folder, safe + suffix)
+
+    def _read_history(self, ticker: str) -> pd.DataFrame:
+        parquet_path = self._path('history', ticker, '.parquet')
+        csv_path = self._path('history', ticker, '.csv')
+        if os.path.exists(parquet_path):
+            data = pd.read_parquet(parquet_path)
+        elif os.path.exists(csv_path):
+            data = pd.read_csv(csv_path, index_col=0, parse_dates=True)
+        else:
+            return pd.DataFrame()
+        data.index = pd.DatetimeIndex(data.index).tz_localize(None)
+        return data.sort_index()
+
+    def _read_json(self, folder: str, ticker: str):
+        path = self._path(folder, ticker, '.json')
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def _history_range(self, ticker, start_date, end_date):
+        data = self._read_history(ticker)
+        if data.empty:
+            return data
+        dates = data.index.normalize()
+        return data[(dates >= pd.Timestamp(start_date)) & (dates <= pd.Timestamp(end_date))]
+
+    def history(self, ticker, start_date, end_date):
+        self._wait()
+        return self._history_range(ticker, start_date, end_date)
+
+    def history_batch(self, tickers, start_date, end_date):
+        # One simulated round trip for the whole group, like a grouped vendor request
+        self._wait()
+        frames = {}
+        for ticker in tickers:
+            data = self._history_range(ticker, start_date, end_date)
+            if not data.empty:
+                frames[ticker] = data
+        return frames
+
+    def quote(self, ticker):
+        self._wait()
+        info = {}
+        data = self._read_history(ticker)
+        if not data.empty:
+            last = data.iloc[-1]
+            info = {
+                'shortName': ticker,
+                'currentPrice': float(last['Close']),
+                'previousClose': float(data['Close'].iloc[-2]) if len(data) > 1 else float(last['Open']),
+                'volume': int(last['Volume']) if 'Volume' in data else 0,
+                'marketCap': 0,
+            }
+        info.update(self._read_json('info', ticker) or {})
+        return info
+
+    def news(self, ticker):
+        self._wait()
+        return self._read_json('news', ticker) or []
+
+    def options(self, ticker):
+        self._wait()
+        folder = self._path('options', ticker)
+        chains = {}
+        for side in ('calls', 'puts'):
+            path = os.path.join(folder, side + '.csv')
+            chains[side] = pd.read_csv(path) if os.path.exists(path) else pd.DataFrame()
+
+        expirations = sorted(set().union(*(
+            chain['expiration'].astype(str) for chain in chains.values() if 'expiration' in chain
+        )))
+        if not expirations:
+            return dict(EMPTY_OPTIONS)
+        # Serve the nearest expiration, as the yfinance backend does
+        nearest = expirations[0]
+        for side, chain in chains.items():
+            if 'expiration' in chain:
+                chains[side] = chain[chain['expiration'].astype(str) == nearest].drop(columns='expiration')
+        return {"calls": chains['calls'], "puts": chains['puts'], "expirations": tuple(expirations)}
+
+
+PROVIDERS = {
+    YFinanceProvider.name: YFinanceProvider,
+    LocalFileProvider.name: LocalFileProvider,
+}
+
+
+def get_provider() -> MarketDataProvider:
+    """Return the process-wide provider selected by MARKET_DATA_PROVIDER."""
+    global _provider
+    if _provider is None:
+        name = os.environ.get('MARKET_DATA_PROVIDER', DEFAULT_PROVIDER).lower()
+        if name not in PROVIDERS:
+            raise ValueError(f"Unknown market data provider: {name}")
+        _provider = PROVIDERS[name]()
+    return _provider
+
+
+def set_provider(provider: Optional[MarketDataProvider]) -> None:
+    """Replace the process-wide provider (None re-reads the environment on next use)."""
+    global _provider
+    _provider = provider
+
+
+def split_batch_frame(data: pd.DataFrame, tickers: List[str], end_date=None) -> Dict[str, pd.DataFrame]:
+    """Split a grouped (ticker, field) download into per-ticker frames"""
+    if data is None or data.empty:
+        return {}
+
+    data.index = data.index.tz_localize(None)
+    if end_date is not None:
+        data = data[data.index.normalize() <= pd.Timestamp(end_date).normalize()]
+
+    frames = {}
+    for ticker in tickers:
+        if isinstance(data.columns, pd.MultiIndex):
+            if ticker not in data.columns.get_level_values(0):
+                continue
+            frame = data[ticker]
+        elif len(tickers) == 1:
+            frame = data
+        else:
+            continue
+        frame = frame.dropna(how='all')
+        if not frame.empty:
+            frames[ticker] = frame.copy()
+    return frames
+
+
+def write_fixture_history(root: str, ticker: str, data: pd.DataFrame) -> str:
+    """Save bars as a LocalFileProvider history fixture and return the file path."""
+    folder = os.path.join(root, 'history')
+    os.makedirs(folder, exist_ok=True)
+    path = LocalFileProvider(root, latency=0.0)._path('history', ticker, '.parquet')
+    data.to_parquet(path)
+    return path
@@ -0,0 +1,348 @@
+import datetime
+import hashlib
+import json
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import threading
+import time
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import DATA_DIR
+from .sequences import make_sequences
+
+# Where trained models are kept unless MODEL_REGISTRY_DIR says otherwise
+DEFAULT_REGISTRY_DIR = os.path.join(DATA_DIR, 'models')
+
+# Retrain once this many bars have arrived since the model was trained ...
+DEFAULT_MIN_NEW_BARS = 5
+# ... or when the error on the latest windows exceeds the training-time error by this factor
+DEFAULT_DRIFT_TOLERANCE = 1.5
+# Number of most recent windows used to measure that error
+DEFAULT_DRIFT_WINDOW = 20
+# Older versions beyond this many are deleted when a new one is saved
+DEFAULT_KEEP_VERSIONS = 3
+# Consecutive warm-start fine-tunes allowed before a full retrain
+DEFAULT_MAX_FINE_TUNES = 10
+
+MODEL_FILE = 'model.keras'
+SCALER_FILE = 'scaler.pkl'
+META_FILE = 'meta.json'
+REQUESTS_FILE = 'requested.txt'
+LAST_RUN_FILE = 'last_run.json'
+
+# train(frame) -> (fitted model, fitted scaler); frame holds the feature columns in order
+Trainer = Callable[[pd.DataFrame], Tuple[object, object]]
+
+# fine_tune(entry, frame) -> (model, scaler), or None to ask for a full retrain
+FineTuner = Callable[['RegisteredModel', pd.DataFrame], Optional[Tuple[object, object]]]
+
+
+def data_hash(frame: pd.DataFrame) -> str:
+    """Version hash of a training frame (index and values)."""
+    hashed = pd.util.hash_pandas_object(frame, index=True).to_numpy()
+    return hashlib.sha1(hashed.tobytes()).hexdigest()
+
+
+def recent_mse(model, scaler, frame: pd.DataFrame, time_steps: int, n_windows: int = DEFAULT_DRIFT_WINDOW) -> float:
+    """Mean squared error of the model on the last `n_windows` windows of `frame`, in scaled units."""
+    tail = frame.iloc[-(n_windows + time_steps):]
+    scaled = scaler.transform(tail).astype(np.float32)
+    X, y = make_sequences(scaled, time_steps)
+    if len(y) == 0:
+        return float('nan')
+    predicted = np.asarray(model.predict(X, verbose=0)).reshape(-1)
+    return float(np.mean(np.square(y - predicted)))
+
+
+class RegisteredModel:
+    """A trained model with its scaler and the metadata it was saved with."""
+
+    def __init__(self, model, scaler, meta: dict, path: str):
+        self.model = model
+        self.scaler = scaler
+        self.meta = meta
+        self.path = path
+
+    @property
+    def version(self) -> str:
+        return self.meta['version']
+
+
+class ModelRegistry:
+    """
+    On-disk store of trained models keyed by ticker, feature set,
+    time_steps and architecture.
+
+    Each key directory holds one sub-directory per saved model (named after
+    the training data hash plus a unique suffix, so a retrain on unchanged
+    data never replaces a directory in use) with the Keras model, the
+    pickled scaler and a meta.json; `latest.json` points at the current
+    directory and is replaced atomically once it is complete, so readers
+    never see a half-written or missing model. Loaded models are also kept
+    in memory, so repeat lookups in the same process are free.
+
+    get_or_train() reuses the latest model unless the data changed enough:
+    at least `min_new_bars` new bars, or an error on the latest windows that
+    has drifted past `drift_tolerance` times the training-time error.
+    """
+
+    def __init__(self, root: Optional[str] = None, min_new_bars: int = DEFAULT_MIN_NEW_BARS,
+                 drift_tolerance: float = DEFAULT_DRIFT_TOLERANCE, drift_window: int = DEFAULT_DRIFT_WINDOW,
+                 keep_versions: int = DEFAULT_KEEP_VERSIONS, max_fine_tunes: int = DEFAULT_MAX_FINE_TUNES):
+        self.root = root or os.environ.get('MODEL_REGISTRY_DIR', DEFAULT_REGISTRY_DIR)
+        self.min_new_bars = min_new_bars
+        self.drift_tolerance = drift_tolerance
+        self.drift_window = drift_window
+        self.keep_versions = keep_versions
+        self.max_fine_tunes = max_fine_tunes
+        self._loaded: Dict[str, RegisteredModel] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    @staticmethod
+    def key(ticker: str, features: Sequence[str], time_steps: int, architecture: str) -> str:
+        """Directory name for a model configuration, readable and collision-safe."""
+        config = json.dumps([str(ticker).upper(), list(features), int(time_steps), architecture])
+        digest = hashlib.sha1(config.encode('utf-8')).hexdigest()[:10]
+        safe_ticker = re.sub(r'[^A-Za-z0-9._-]', '_', str(ticker).upper())
+        return f"{safe_ticker}-{architecture}-t{int(time_steps)}-{digest}"
+
+    def _key_dir(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def _read_pointer(self, key: str) -> Optional[str]:
+        """Directory name `latest.json` points at, or None when nothing was saved yet."""
+        pointer = os.path.join(self._key_dir(key), 'latest.json')
+        if not os.path.exists(pointer):
+            return None
+        with open(pointer, 'r') as f:
+            latest = json.load(f)
+        # Pointers written before directories got unique suffixes only have the version
+        return latest.get('directory', latest['version'])
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def load(self, ticker: str, features: Sequence[str], time_steps: int,
+             architecture: str) -> Optional[RegisteredModel]:
+        """Return the latest saved model for a configuration, or None."""
+        key = self.key(ticker, features, time_steps, architecture)
+        directory = self._read_pointer(key)
+        if directory is None:
+            return None
+        path = os.path.join(self._key_dir(key), directory)
+
+        cached = self._loaded.get(key)
+        if cached is not None and cached.path == path:
+            return cached
+
+        import tensorflow as tf
+        with open(os.path.join(path, META_FILE), 'r') as f:
+            meta = json.load(f)
+        with open(os.path.join(path, SCALER_FILE), 'rb') as f:
+            scaler = pickle.load(f)
+        model = tf.keras.models.load_model(os.path.join(path, MODEL_FILE))
+        entry = RegisteredModel(model, scaler, meta, path)
+        self._loaded[key] = entry
+        return entry
+
+    def save(self, ticker: str, features: Sequence[str], time_steps: int, architecture: str,
+             model, scaler, frame: pd.DataFrame, extra: Optional[dict] = None) -> RegisteredModel:
+        """
+        Save a trained model and scaler as the latest version for its configuration.
+
+        Args:
+            ticker, features, time_steps, architecture: Registry key parts
+            model: Trained Keras model
+            scaler: Scaler fitted on `frame`
+            frame: Feature frame the model was trained on
+            extra: Additional metadata (e.g. timings) stored in meta.json
+
+        Returns:
+            RegisteredModel: The saved entry
+        """
+        key = self.key(ticker, features, time_steps, architecture)
+        version = data_hash(frame)[:16]
+        meta = {
+            'ticker': str(ticker).upper(),
+            'features': list(features),
+            'time_steps': int(time_steps),
+            'architecture': architecture,
+            'version': version,
+            'rows': int(len(frame)),
+            'last_bar': str(frame.index[-1]),
+            'recent_mse': recent_mse(model, scaler, frame, time_steps, self.drift_window),
+            'trained_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        }
+        meta.update(extra or {})
+
+        key_dir = self._key_dir(key)
+        os.makedirs(key_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=key_dir, prefix='.tmp-')
+        try:
+            model.save(os.path.join(staging, MODEL_FILE))
+            with open(os.path.join(staging, SCALER_FILE), 'wb') as f:
+                pickle.dump(scaler, f)
+            with open(os.path.join(staging, META_FILE), 'w') as f:
+                json.dump(meta, f, indent=2)
+
+            # The staging name is unique within key_dir, so the final name is too
+            directory = f"{version}-{os.path.basename(staging)[len('.tmp-'):]}"
+            path = os.path.join(key_dir, directory)
+            os.replace(staging, path)
+        finally:
+            if os.path.exists(staging):
+                shutil.rmtree(staging)
+
+        fd, pointer_tmp = tempfile.mkstemp(dir=key_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'version': version, 'directory': directory}, f)
+        os.replace(pointer_tmp, os.path.join(key_dir, 'latest.json'))
+        self._prune(key_dir, directory)
+
+        entry = RegisteredModel(model, scaler, meta, path)
+        self._loaded[key] = entry
+        return entry
+
+    def _prune(self, key_dir: str, current: str) -> None:
+        """Delete all but the newest `keep_versions` versions, never the current one."""
+        versions = [name for name in os.listdir(key_dir)
+                    if not name.startswith('.') and os.path.isdir(os.path.join(key_dir, name))]
+        versions.sort(key=lambda name: os.path.getmtime(os.path.join(key_dir, name)), reverse=True)
+        for name in versions[self.keep_versions:]:
+            if name != current:
+                shutil.rmtree(os.path.join(key_dir, name), ignore_errors=True)
+
+    def needs_retrain(self, entry: Optional[RegisteredModel], frame: pd.DataFrame) -> Tuple[bool, str]:
+        """
+        Decide whether `frame` warrants a new model.
+
+        Returns:
+            Tuple[bool, str]: (retrain?, human-readable reason)
+        """
+        if entry is None:
+            return True, "no saved model"
+        if entry.meta['version'] == data_hash(frame)[:16]:
+            return False, "training data unchanged"
+
+        new_bars = int((frame.index > pd.Timestamp(entry.meta['last_bar'])).sum())
+        if new_bars >= self.min_new_bars:
+            return True, f"{new_bars} new bars"
+
+        baseline = entry.meta.get('recent_mse')
+        current = recent_mse(entry.model, entry.scaler, frame, entry.meta['time_steps'], self.drift_window)
+        if baseline and np.isfinite(baseline) and current > baseline * self.drift_tolerance:
+            return True, f"error drifted from {baseline:.5f} to {current:.5f}"
+        return False, f"{new_bars} new bars, error within tolerance"
+
+    def get_or_train(self, ticker: str, features: Sequence[str], time_steps: int, frame: pd.DataFrame,
+                     train: Trainer, architecture: str, fine_tune: Optional[FineTuner] = None,
+                     force: bool = False, extra: Optional[dict] = None) -> Tuple[RegisteredModel, bool, str]:
+        """
+        Return a model for `frame`, training and saving one only when needed.
+
+        When a saved model exists and `fine_tune` is given, retraining warm
+        starts from the saved weights instead of training from scratch; after
+        `max_fine_tunes` consecutive fine-tunes (or when `fine_tune` declines
+        by returning None) a full retrain resets the chain. Concurrent callers
+        for the same configuration wait for a single training run instead of
+        each starting their own. That lock only covers threads of this
+        process: a separate trainer process (refresh_models.py) may train the
+        same configuration concurrently; both saves succeed and the last one
+        becomes the latest.
+
+        Args:
+            ticker, features, time_steps, architecture: Registry key parts
+            frame: Current feature frame
+            train: Full training function
+            fine_tune: Optional warm-start function
+            force: Retrain even if the saved model is still current
+            extra: Additional metadata stored with a newly trained model
+
+        Returns:
+            Tuple[RegisteredModel, bool, str]: The entry, whether it was just
+            trained, and the reason
+        """
+        key = self.key(ticker, features, time_steps, architecture)
+        with self._key_lock(key):
+            entry = self.load(ticker, features, time_steps, architecture)
+            retrain, reason = self.needs_retrain(entry, frame)
+            if force and not retrain:
+                retrain, reason = True, "forced"
+            if not retrain:
+                return entry, False, reason
+
+            started = time.perf_counter()
+            fitted = None
+            fine_tunes = entry.meta.get('fine_tunes', 0) if entry is not None else 0
+            if entry is not None and fine_tune is not None and fine_tunes < self.max_fine_tunes:
+                fitted = fine_tune(entry, frame)
+            if fitted is not None:
+                mode, fine_tunes = 'incremental', fine_tunes + 1
+            else:
+                fitted = train(frame)
+                mode, fine_tunes = 'full', 0
+
+            model, scaler = fitted
+            meta = dict(extra or {})
+            meta.update(mode=mode, fine_tunes=fine_tunes, reason=reason,
+                        train_seconds=round(time.perf_counter() - started, 3))
+            entry = self.save(ticker, features, time_steps, architecture, model, scaler, frame, meta)
+            return entry, True, f"{reason}, {mode} training"
+
+    def tracked(self, architecture: Optional[str] = None) -> List[dict]:
+        """Metadata of the latest version of every saved configuration."""
+        if not os.path.isdir(self.root):
+            return []
+        entries = []
+        for key in sorted(os.listdir(self.root)):
+            try:
+                directory = self._read_pointer(key)
+                if directory is None:
+                    continue
+                with open(os.path.join(self._key_dir(key), directory, META_FILE), 'r') as f:
+                    meta = json.load(f)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Skipping unreadable model {key}: {str(e)}")
+                continue
+            if architecture is None or meta.get('architecture') == architecture:
+                entries.append(meta)
+        return entries
+
+    def request(self, ticker: str) -> None:
+        """Ask the offline trainer to build a model for a ticker that has none yet."""
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, REQUESTS_FILE), 'a') as f:
+            f.write(str(ticker).upper() + '\n')
+
+    def take_requests(self) -> List[str]:
+        """Return and clear the tickers queued with request()."""
+        path = os.path.join(self.root, REQUESTS_FILE)
+        if not os.path.exists(path):
+            return []
+        claimed = path + f'.{os.getpid()}'
+        os.replace(path, claimed)
+        with open(claimed, 'r') as f:
+            tickers = [line.strip() for line in f if line.strip()]
+        os.remove(claimed)
+        return list(dict.fromkeys(tickers))
+
+    def record_run(self, results: List[dict]) -> str:
+        """Write a training run summary (per-ticker status and timings) to last_run.json."""
+        os.makedirs(self.root, exist_ok=True)
+        summary = {
+            'finished_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'results': results,
+        }
+        path = os.path.join(self.root, LAST_RUN_FILE)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(summary, f, indent=2)
+        os.replace(tmp_path, path)
+        return path
@@ -0,0 +1,222 @@
+import datetime
+import json
+import os
+import re
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import Callable, List, Optional, Tuple
+
+from . import DATA_DIR
+
+# Where per-ticker Parquet files are kept unless OHLCV_STORE_DIR says otherwise
+DEFAULT_STORE_DIR = os.path.join(DATA_DIR, 'ohlcv')
+
+# fetch(ticker, start_date, end_date) -> DataFrame of daily bars, both dates inclusive;
+# an empty frame means there are no bars in the range, None (or an exception) that the
+# fetch failed, so the range stays uncovered and is requested again next time
+Fetcher = Callable[[str, datetime.date, datetime.date], Optional[pd.DataFrame]]
+
+# Columns compared to detect revised history, and the relative difference tolerated
+# (float noise between downloads); Volume is left out, as late prints revise it routinely
+REVISION_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close']
+REVISION_RTOL = 1e-6
+
+
+def _to_date(value) -> datetime.date:
+    return pd.Timestamp(value).date()
+
+
+class OHLCVStore:
+    """
+    Persistent per-ticker OHLCV history in Parquet files.
+
+    Each ticker has a Parquet file with its bars and a small JSON sidecar
+    recording the date range that has already been requested from the data
+    source, so ranges with no trading days (weekends, holidays, pre-listing)
+    are not fetched again. Writes go through a temporary file and an atomic
+    rename, so concurrent readers never see a partial file.
+
+    Every backfill or append also requests the stored bar at that edge of
+    the history. When the source returns different prices for it, the
+    history was revised (e.g. adjusted for a split or dividend), so the
+    ticker's whole range is downloaded again instead of joining adjusted
+    bars onto unadjusted ones.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.environ.get('OHLCV_STORE_DIR', DEFAULT_STORE_DIR)
+
+    def _base_path(self, ticker: str) -> str:
+        safe = re.sub(r'[^A-Za-z0-9._-]', '_', str(ticker).upper())
+        return os.path.join(self.root, safe)
+
+    def read(self, ticker: str) -> Tuple[Optional[pd.DataFrame], Optional[Tuple[datetime.date, datetime.date]]]:
+        """
+        Read the stored bars and covered date range for a ticker.
+
+        Returns:
+            Tuple: (DataFrame or None, (start_date, end_date) or None)
+        """
+        coverage = self.coverage(ticker)
+        if coverage is None:
+            return None, None
+        return pd.read_parquet(self._base_path(ticker) + '.parquet'), coverage
+
+    def coverage(self, ticker: str) -> Optional[Tuple[datetime.date, datetime.date]]:
+        """Date range already requested for a ticker, without loading its bars."""
+        meta = self._meta(ticker)
+        if meta is None:
+            return None
+        return _to_date(meta['start']), _to_date(meta['end'])
+
+    def _meta(self, ticker: str) -> Optional[dict]:
+        base = self._base_path(ticker)
+        if not (os.path.exists(base + '.parquet') and os.path.exists(base + '.json')):
+            return None
+        with open(base + '.json', 'r') as f:
+            return json.load(f)
+
+    def write(self, ticker: str, data: pd.DataFrame, start: datetime.date, end: datetime.date) -> None:
+        """Replace the stored bars for a ticker and record the covered range."""
+        os.makedirs(self.root, exist_ok=True)
+        base = self._base_path(ticker)
+        self._atomic_write(base + '.parquet', lambda path: data.to_parquet(path))
+        meta = {'start': str(start), 'end': str(end), 'rows': int(len(data)),
+                'first_bar': str(_to_date(data.index[0])), 'last_bar': str(_to_date(data.index[-1]))}
+        self._atomic_write(base + '.json', lambda path: self._write_json(path, meta))
+
+    def delete(self, ticker: str) -> None:
+        """Remove a ticker's stored history."""
+        base = self._base_path(ticker)
+        for suffix in ('.parquet', '.json'):
+            if os.path.exists(base + suffix):
+                os.remove(base + suffix)
+
+    def missing_ranges(self, ticker: str, start_date, end_date) -> List[Tuple[datetime.date, datetime.date]]:
+        """
+        Date ranges update() would fetch for [start_date, end_date].
+
+        Returns:
+            List of inclusive (start, end) date tuples, possibly empty
+        """
+        start, end = _to_date(start_date), _to_date(end_date)
+        meta = self._meta(ticker)
+        if meta is None:
+            return [(start, end)]
+
+        coverage = _to_date(meta['start']), _to_date(meta['end'])
+        # Sidecars written before the edge bars were recorded get ranges without overlap
+        bars = (_to_date(meta['first_bar']), _to_date(meta['last_bar'])) if 'last_bar' in meta else None
+        return [r for r in self._fetch_ranges(coverage, bars, start, end) if r is not None]
+
+    @staticmethod
+    def _fetch_ranges(coverage: Tuple[datetime.date, datetime.date],
+                      bars: Optional[Tuple[datetime.date, datetime.date]],
+                      start: datetime.date, end: datetime.date) -> Tuple[Optional[tuple], Optional[tuple]]:
+        """Head and tail ranges to fetch (or None), each reaching back to the stored bar at its edge."""
+        covered_start, covered_end = coverage
+        head = tail = None
+        if start < covered_start:
+            head = (start, bars[0] if bars else covered_start - datetime.timedelta(days=1))
+        if end > covered_end:
+            tail = (min(bars[1], end) if bars else covered_end + datetime.timedelta(days=1), end)
+        return head, tail
+
+    def update(self, ticker: str, start_date, end_date, fetch: Fetcher) -> pd.DataFrame:
+        """
+        Return bars for [start_date, end_date], fetching only what is missing.
+
+        Bars before the stored range are backfilled and bars after the last
+        covered date are appended; everything already on disk is reused.
+        The covered range only grows by fetches that succeeded, see Fetcher.
+        If a fetch shows that stored prices were revised, the whole range is
+        fetched again and replaces the stored bars.
+
+        Args:
+            ticker: Ticker symbol as understood by `fetch`
+            start_date, end_date: Inclusive date range
+            fetch: Callable returning bars for an inclusive date range
+
+        Returns:
+            pd.DataFrame: Stored bars within the requested range (may be empty)
+        """
+        start, end = _to_date(start_date), _to_date(end_date)
+        stored, coverage = self.read(ticker)
+
+        if stored is None:
+            merged = fetch(ticker, start, end)
+            if merged is None or merged.empty:
+                return pd.DataFrame() if merged is None else merged
+            covered = (start, end)
+        else:
+            pieces = [stored]
+            covered_start, covered_end = coverage
+            head_range, tail_range = self._fetch_ranges(
+                coverage, (_to_date(stored.index[0]), _to_date(stored.index[-1])), start, end)
+            # Both ranges include a stored bar, so a source with any bars there returns some;
+            # an empty answer may just be a data-source hiccup, so only fetched bars are trusted
+            if head_range is not None:
+                head = fetch(ticker, *head_range)
+                if head is not None and not head.empty:
+                    if self._revised(stored, head):
+                        return self._reload(ticker, stored, coverage, start, end, fetch)
+                    pieces.insert(0, head)
+                    covered_start = start
+            if tail_range is not None:
+                tail = fetch(ticker, *tail_range)
+                if tail is not None and not tail.empty:
+                    if self._revised(stored, tail):
+                        return self._reload(ticker, stored, coverage, start, end, fetch)
+                    pieces.append(tail)
+                    covered_end = end
+            if len(pieces) == 1 and (covered_start, covered_end) == coverage:
+                return self._slice(stored, start, end)
+            merged = pd.concat(pieces) if len(pieces) > 1 else stored
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+            covered = (covered_start, covered_end)
+
+        self.write(ticker, merged, *covered)
+        return self._slice(merged, start, end)
+
+    def _reload(self, ticker: str, stored: pd.DataFrame, coverage: Tuple[datetime.date, datetime.date],
+                start: datetime.date, end: datetime.date, fetch: Fetcher) -> pd.DataFrame:
+        """Replace a revised history by a fresh download of its range; keep it if that fails."""
+        reload_start, reload_end = min(start, coverage[0]), max(end, coverage[1])
+        fresh = fetch(ticker, reload_start, reload_end)
+        if fresh is None or fresh.empty:
+            return self._slice(stored, start, end)
+        fresh = fresh[~fresh.index.duplicated(keep='last')].sort_index()
+        self.write(ticker, fresh, reload_start, reload_end)
+        return self._slice(fresh, start, end)
+
+    @staticmethod
+    def _revised(stored: pd.DataFrame, fetched: pd.DataFrame) -> bool:
+        """Whether `fetched` has different prices than `stored` for the bars both contain."""
+        common = fetched.index.intersection(stored.index)
+        columns = [col for col in REVISION_COLUMNS if col in stored.columns and col in fetched.columns]
+        if common.empty or not columns:
+            return False
+        old = stored.loc[common, columns].to_numpy(dtype=np.float64)
+        new = fetched.loc[common, columns].to_numpy(dtype=np.float64)
+        return not np.allclose(old, new, rtol=REVISION_RTOL, atol=0, equal_nan=True)
+
+    @staticmethod
+    def _slice(data: pd.DataFrame, start: datetime.date, end: datetime.date) -> pd.DataFrame:
+        dates = data.index.normalize()
+        return data[(dates >= pd.Timestamp(start)) & (dates <= pd.Timestamp(end))]
+
+    @staticmethod
+    def _write_json(path: str, payload: dict) -> None:
+        with open(path, 'w') as f:
+            json.dump(payload, f)
+
+    def _atomic_write(self, path: str, writer: Callable[[str], None]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        os.close(fd)
+        try:
+            writer(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
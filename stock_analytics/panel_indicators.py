@@ -0,0 +1,214 @@
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .indicators import INDICATOR_COLUMNS, rsi_kernel
+from .rolling import ewm_mean, rolling_max, rolling_mean, rolling_min, rolling_std
+
+# Price fields read by panel_indicators(), see panel_frames()
+PANEL_FIELDS = ('Close', 'High', 'Low')
+
+Panel = Union[np.ndarray, pd.DataFrame]
+
+
+class PackedPanel:
+    """
+    Ragged (dates, tickers) price panels with every ticker's bars moved to the top.
+
+    A bar counts when close, high and low are all present. Each column of
+    the packed arrays holds that ticker's bars in date order followed by
+    NaN padding, so every ticker starts at row 0 and the window kernels run
+    down all columns at once; unpack() puts results back on the original
+    dates, NaN where the ticker has no bar.
+    """
+
+    def __init__(self, close: np.ndarray, high: np.ndarray, low: np.ndarray):
+        n_rows, n_cols = close.shape
+        self.mask = ~(np.isnan(close) | np.isnan(high) | np.isnan(low))
+        rows = np.arange(n_rows)[:, np.newaxis]
+        self.valid = rows < self.mask.sum(axis=0)
+        self._columns = np.arange(n_cols)
+
+        # Flat positions for gathering packed rows from the original layout and back
+        order = np.argsort(~self.mask, axis=0, kind='stable')
+        position = np.empty_like(order)
+        np.put_along_axis(position, order, np.broadcast_to(rows, order.shape), axis=0)
+        self._pack_index = self._flat(order)
+        self._unpack_index = self._flat(position)
+        self.close, self.high, self.low = (self.pack(values) for values in (close, high, low))
+
+    def _flat(self, rows: np.ndarray) -> np.ndarray:
+        return rows * len(self._columns) + self._columns
+
+    def pack(self, values: np.ndarray) -> np.ndarray:
+        packed = values.ravel().take(self._pack_index)
+        np.copyto(packed, np.nan, where=~self.valid)
+        return packed
+
+    def unpack(self, packed: np.ndarray) -> np.ndarray:
+        result = packed.ravel().take(self._unpack_index)
+        np.copyto(result, np.nan, where=~self.mask)
+        return result
+
+    def fill(self, packed: np.ndarray) -> np.ndarray:
+        """Forward then backward fill each ticker's own bars, like add_indicators()."""
+        missing = np.isnan(packed)
+        missing &= self.valid
+        rows_missing = np.flatnonzero(missing.any(axis=1))
+        if not len(rows_missing):
+            return packed
+
+        # Gaps are mostly warm-up rows at the top, so only the rows down to the
+        # last gap (and one more, to backfill from) need rewriting
+        end = min(rows_missing[-1] + 2, len(packed))
+        head = packed[:end]
+        missing = missing[:end] | ~self.valid[:end]
+        rows = np.arange(end)[:, np.newaxis]
+        # Last row at or before each row with a value, or the first such row for leading gaps
+        source = np.where(missing, -1, rows)
+        np.maximum.accumulate(source, axis=0, out=source)
+        leading = source < 0
+        if leading.any():
+            first = np.broadcast_to(np.argmax(~missing, axis=0), source.shape)
+            np.copyto(source, first, where=leading)
+        filled = packed.copy()
+        filled[:end] = head.ravel().take(self._flat(source))
+        return filled
+
+
+class PanelIndicators:
+    """
+    add_indicators() columns for a whole packed panel, each computed once on demand.
+
+    Every method works down axis 0 of the packed arrays for all tickers at
+    once, through the kernels in stock_analytics.rolling.
+    """
+
+    def __init__(self, panel: PackedPanel):
+        self.panel = panel
+        self._nodes: Dict[tuple, np.ndarray] = {}
+
+    def _node(self, key: tuple, compute) -> np.ndarray:
+        if key not in self._nodes:
+            self._nodes[key] = compute()
+        return self._nodes[key]
+
+    def rsi(self, window: int = 14) -> np.ndarray:
+        return self._node(('rsi', window), lambda: rsi_kernel(self.panel.close, window))
+
+    def sma(self, window: int) -> np.ndarray:
+        return self._node(('sma', window), lambda: rolling_mean(self.panel.close, window))
+
+    def ema(self, span: int) -> np.ndarray:
+        return self._node(('ema', span), lambda: ewm_mean(self.panel.close, span))
+
+    def macd(self, fast: int = 12, slow: int = 26) -> np.ndarray:
+        return self._node(('macd', fast, slow), lambda: self.ema(fast) - self.ema(slow))
+
+    def macd_signal(self, fast: int = 12, slow: int = 26, signal: int = 9) -> np.ndarray:
+        return self._node(('macd_signal', fast, slow, signal), lambda: ewm_mean(self.macd(fast, slow), signal))
+
+    def bollinger(self, window: int = 20, num_std: int = 2, sign: int = 0) -> np.ndarray:
+        """Middle band (sign=0), upper (1) or lower (-1), filled like calculate_bollinger_bands()."""
+        def compute():
+            band = self.sma(window)
+            if sign:
+                spread = self._node(('std', window), lambda: rolling_std(self.panel.close, window)) * num_std
+                band = band + spread if sign > 0 else band - spread
+            return self.panel.fill(band)
+        return self._node(('bollinger', window, num_std, sign), compute)
+
+    def stoch_k(self, window: int = 14) -> np.ndarray:
+        def compute():
+            low_min = rolling_min(self.panel.low, window)
+            high_max = rolling_max(self.panel.high, window)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return 100 * ((self.panel.close - low_min) / (high_max - low_min))
+        return self._node(('stoch_k', window), compute)
+
+    def stoch_d(self, k_window: int = 14, d_window: int = 3) -> np.ndarray:
+        def compute():
+            # %K is NaN for the first k_window - 1 bars of every ticker; averaging from
+            # there on gives the same values and keeps NaN out of the kernel's input
+            k = self.stoch_k(k_window)
+            result = np.full_like(k, np.nan)
+            result[k_window - 1:] = rolling_mean(k[k_window - 1:], d_window)
+            return result
+        return self._node(('stoch_d', k_window, d_window), compute)
+
+    def column(self, name: str) -> np.ndarray:
+        """Packed values of one add_indicators() column, before its final fill."""
+        columns = {
+            'RSI': self.rsi,
+            'SMA': lambda: self.sma(9),
+            'EMA_20': lambda: self.ema(20),
+            'EMA_50': lambda: self.ema(50),
+            'MACD': self.macd,
+            'MACD_Signal': self.macd_signal,
+            'MACD_Hist': lambda: self.macd() - self.macd_signal(),
+            'BB_Upper': lambda: self.bollinger(sign=1),
+            'BB_Middle': self.bollinger,
+            'BB_Lower': lambda: self.bollinger(sign=-1),
+            'Stoch_K': self.stoch_k,
+            'Stoch_D': self.stoch_d,
+        }
+        if name not in columns:
+            raise ValueError(f"Unknown indicator {name!r}, expected one of {INDICATOR_COLUMNS}")
+        return columns[name]()
+
+
+def panel_frames(frames: Mapping[str, pd.DataFrame], fields: Sequence[str] = PANEL_FIELDS) -> Dict[str, pd.DataFrame]:
+    """
+    Wide (dates x tickers) frames per price field from per-ticker OHLCV frames.
+
+    Args:
+        frames: {ticker: OHLCV frame}, e.g. from load_stock_data_batch()
+        fields: Price columns to collect
+
+    Returns:
+        dict: {field: DataFrame} on the union of all dates, one column per
+        ticker, NaN where a ticker has no bar
+    """
+    frames = {ticker: df for ticker, df in frames.items() if df is not None and not df.empty}
+    return {field: pd.concat({ticker: df[field] for ticker, df in frames.items()}, axis=1)
+            for field in fields}
+
+
+def panel_indicators(close: Panel, high: Optional[Panel] = None, low: Optional[Panel] = None,
+                     names: Optional[Iterable[str]] = None, fill: bool = True) -> Dict[str, Panel]:
+    """
+    Indicator columns for many tickers in one pass over (dates x tickers) panels.
+
+    Histories may be ragged: tickers can start and end on different dates
+    or miss bars, marked by NaN. Each ticker's values match
+    add_indicators() run on that ticker's own bars alone, so a
+    universe-wide screen costs a few array passes instead of one pandas
+    pipeline per ticker.
+
+    Args:
+        close: Close prices, a DataFrame (one column per ticker) or a 2-D array
+        high: High prices shaped like close, defaults to close
+        low: Low prices shaped like close, defaults to close
+        names: Indicator names, defaults to all of INDICATOR_COLUMNS
+        fill: Forward/backward fill each ticker's warm-up values as
+              add_indicators() does; False leaves them NaN
+
+    Returns:
+        dict: {name: panel} with close's shape (DataFrames with its index and
+        columns when close is a DataFrame), NaN where a ticker has no bar
+    """
+    arrays = [np.asarray(close if values is None else values, dtype=np.float64) for values in (close, high, low)]
+    if arrays[0].ndim != 2 or any(values.shape != arrays[0].shape for values in arrays):
+        raise ValueError("close, high and low must be 2-D panels of the same shape")
+
+    panel = PackedPanel(*arrays)
+    indicators = PanelIndicators(panel)
+    results = {}
+    for name in (INDICATOR_COLUMNS if names is None else names):
+        packed = indicators.column(name)
+        values = panel.unpack(panel.fill(packed) if fill else packed)
+        if isinstance(close, pd.DataFrame):
+            values = pd.DataFrame(values, index=close.index, columns=close.columns)
+        results[name] = values
+    return results
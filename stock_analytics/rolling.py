@@ -0,0 +1,223 @@
+import numpy as np
+import pandas as pd
+
+# From this many columns on, rolling kernels step through the rows instead of going column by column
+STEPPED_MIN_COLUMNS = 512
+
+# Rolling and exponential means over the rows of 2-D (rows, columns) arrays, with
+# results bit-identical to the pandas DataFrame methods named in each docstring.
+#
+# pandas runs its window kernels once per column, which dominates for thousands of
+# columns. For arrays at least STEPPED_MIN_COLUMNS wide the same arithmetic is applied
+# row by row to every column at once, with preallocated buffers. That requires NaN to
+# appear only as trailing padding in each column (see _steppable), and results in that
+# padding are not meaningful; anything else goes through pandas.
+#
+# The arithmetic of each step lives in the *_step functions below, written with plain
+# operators so they take Python floats as well as NumPy rows. The kernels here and the
+# running indicators in streaming_indicators call the same functions, and
+# tests/test_rolling.py pins both to pandas, so a pandas change shows up as a failure.
+
+
+def kahan_step(total, compensation, value):
+    """
+    Add `value` to a Kahan-compensated sum, as pandas' add_sum/remove_sum do.
+
+    Removing a value is adding its negation with a compensation term of its
+    own. Returns (total, compensation).
+    """
+    y = value - compensation
+    t = total + y
+    return t, t - total - y
+
+
+def welford_add_step(mean, ssqdm, compensation, nobs, value):
+    """
+    Add `value` to a running mean and sum of squared deviations, as pandas' add_var does.
+
+    `nobs` already counts `value`. Returns (mean, ssqdm, compensation).
+    """
+    prev_mean = mean - compensation
+    y = value - compensation
+    t = y - mean
+    compensation = t + mean - y
+    mean = mean + t / nobs
+    return mean, ssqdm + (value - prev_mean) * (value - mean), compensation
+
+
+def welford_remove_step(mean, ssqdm, compensation, nobs, value):
+    """
+    Remove `value` from a running mean and sum of squared deviations, as pandas' remove_var does.
+
+    `nobs` no longer counts `value` and must be positive. Returns (mean, ssqdm, compensation).
+    """
+    prev_mean = mean - compensation
+    y = value - compensation
+    t = y - mean
+    compensation = t + mean - y
+    mean = mean - t / nobs
+    return mean, ssqdm - (value - prev_mean) * (value - mean), compensation
+
+
+def ewm_step(weighted, value, old_wt, new_wt):
+    """The next adjust=False exponential average from the previous one, as pandas' ewm kernel does."""
+    return (old_wt * weighted + new_wt * value) / (old_wt + new_wt)
+
+
+def _steppable(values: np.ndarray) -> bool:
+    """Wide enough for the row-stepped kernels, with NaN only at the end of each column."""
+    if values.ndim != 2 or values.shape[1] < STEPPED_MIN_COLUMNS:
+        return False
+    missing = np.isnan(values)
+    return not (missing[:-1] & ~missing[1:]).any()
+
+
+def rolling_mean(values: np.ndarray, window: int, min_periods=None) -> np.ndarray:
+    """
+    DataFrame(values).rolling(window, min_periods).mean().
+
+    Kahan-compensated sums with separate compensation for values leaving
+    and entering the window, old values removed before the new one is
+    added, and pandas' constant-run and sign corrections on the result.
+    """
+    min_periods = window if min_periods is None else min_periods
+    if window < 2 or not _steppable(values):
+        return pd.DataFrame(values).rolling(window=window, min_periods=min_periods).mean().to_numpy()
+
+    n_rows, n_cols = values.shape
+    result = np.empty_like(values)
+    total = np.zeros(n_cols)
+    compensation_add, compensation_remove = np.zeros(n_cols), np.zeros(n_cols)
+    flag = np.empty(n_cols, dtype=bool)
+    run = np.zeros(n_cols, dtype=np.int64)
+    neg_ct = np.zeros(n_cols, dtype=np.int64)
+    prev = values[0].copy() if n_rows else None
+    for i in range(n_rows):
+        if i >= window:
+            old = values[i - window]
+            total, compensation_remove = kahan_step(total, compensation_remove, -old)
+            neg_ct -= np.signbit(old)
+        row = values[i]
+        total, compensation_add = kahan_step(total, compensation_add, row)
+        neg_ct += np.signbit(row)
+
+        # Length of the run of equal values ending at this row
+        np.equal(row, prev, out=flag)
+        run *= flag
+        run += 1
+        prev[:] = row
+
+        nobs = min(i + 1, window)
+        out = result[i]
+        if nobs < min_periods:
+            out.fill(np.nan)
+            continue
+        np.divide(total, nobs, out=out)
+        if neg_ct.any():
+            np.copyto(out, 0.0, where=(neg_ct == 0) & (out < 0))
+            np.copyto(out, 0.0, where=(neg_ct == nobs) & (out > 0))
+        else:
+            np.maximum(out, 0.0, out=out)
+        np.copyto(out, row, where=run >= nobs)
+    return result
+
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """
+    DataFrame(values).rolling(window).std(ddof).
+
+    Welford's update with Kahan compensation, old values removed before
+    the new one is added, and 0 for runs of equal values.
+    """
+    if window < 2 or window <= ddof or not _steppable(values):
+        return pd.DataFrame(values).rolling(window=window).std(ddof=ddof).to_numpy()
+
+    n_rows, n_cols = values.shape
+    result = np.full_like(values, np.nan)
+    mean, ssqdm = np.zeros(n_cols), np.zeros(n_cols)
+    compensation_add, compensation_remove = np.zeros(n_cols), np.zeros(n_cols)
+    flag = np.empty(n_cols, dtype=bool)
+    run = np.zeros(n_cols, dtype=np.int64)
+    prev = values[0].copy() if n_rows else None
+    nobs = 0.0
+    for i in range(n_rows):
+        if i >= window:
+            nobs -= 1
+            mean, ssqdm, compensation_remove = welford_remove_step(
+                mean, ssqdm, compensation_remove, nobs, values[i - window])
+
+        row = values[i]
+        nobs += 1
+        np.equal(row, prev, out=flag)
+        run *= flag
+        run += 1
+        prev[:] = row
+        mean, ssqdm, compensation_add = welford_add_step(mean, ssqdm, compensation_add, nobs, row)
+
+        if nobs >= window:
+            out = result[i]
+            np.divide(ssqdm, nobs - ddof, out=out)
+            np.maximum(out, 0.0, out=out)
+            np.copyto(out, 0.0, where=run >= nobs)
+            np.sqrt(out, out=out)
+    return result
+
+
+def _rolling_extreme(values: np.ndarray, window: int, reduce) -> np.ndarray:
+    """
+    The extreme of each full window by doubling: after k passes every row holds
+    the extreme of its last 2**k rows, and one more pass covers the full window.
+    """
+    result = np.full_like(values, np.nan)
+    n_rows = len(values)
+    if n_rows < window:
+        return result
+    covered, extreme = 1, values
+    while covered * 2 <= window:
+        doubled = extreme.copy()
+        reduce(extreme[covered:], extreme[:-covered], out=doubled[covered:])
+        covered, extreme = covered * 2, doubled
+    shift = window - covered
+    reduce(extreme[window - 1:], extreme[window - 1 - shift:n_rows - shift], out=result[window - 1:])
+    return result
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """DataFrame(values).rolling(window).max()."""
+    if not _steppable(values):
+        return pd.DataFrame(values).rolling(window=window).max().to_numpy()
+    return _rolling_extreme(values, window, np.maximum)
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """DataFrame(values).rolling(window).min()."""
+    if not _steppable(values):
+        return pd.DataFrame(values).rolling(window=window).min().to_numpy()
+    return _rolling_extreme(values, window, np.minimum)
+
+
+def ewm_mean(values: np.ndarray, span: float) -> np.ndarray:
+    """
+    DataFrame(values).ewm(span=span, adjust=False).mean().
+
+    Reproduces pandas' recursion, including the division by the summed
+    weights and skipping the update when the value equals the average.
+    """
+    if not _steppable(values):
+        return pd.DataFrame(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+    com = (span - 1) / 2
+    alpha = 1. / (1. + com)
+    # The old weight is reset to 1 after every observation and decayed once before the next
+    old_wt = 1. - alpha
+    n_rows, n_cols = values.shape
+    result = np.empty_like(values)
+    same = np.empty(n_cols, dtype=bool)
+    if n_rows:
+        result[0] = values[0]
+    for i in range(1, n_rows):
+        prev, row, out = result[i - 1], values[i], result[i]
+        out[:] = ewm_step(prev, row, old_wt, alpha)
+        np.equal(prev, row, out=same)
+        np.copyto(out, prev, where=same)
+    return result
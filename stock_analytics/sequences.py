@@ -0,0 +1,73 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Iterator, Optional, Tuple
+
+
+def make_sequences(data: np.ndarray, time_steps: int, target_col: int = 0,
+                   dtype: Optional[np.dtype] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build supervised LSTM windows from a 2-D feature array without copying.
+
+    Window i holds rows i .. i+time_steps-1 and its target is
+    data[i + time_steps, target_col], the same pairs as the original
+    append-in-a-loop builders. X is a strided, read-only view over `data`
+    (or over its dtype-converted copy), so no per-window arrays are created;
+    Keras and NumPy read it like any other array.
+
+    Args:
+        data: Array of shape (n_rows, n_features), e.g. scaled features
+        time_steps: Window length
+        target_col: Column used as the prediction target
+        dtype: Optional output dtype, e.g. np.float32 to halve memory
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: X of shape (n_rows - time_steps,
+        time_steps, n_features) and y of shape (n_rows - time_steps,)
+    """
+    data = np.asarray(data)
+    if data.ndim == 1:
+        data = data.reshape(-1, 1)
+    if dtype is not None:
+        data = data.astype(dtype, copy=False)
+
+    n_rows, n_features = data.shape
+    if n_rows <= time_steps:
+        return np.empty((0, time_steps, n_features), dtype=data.dtype), np.empty(0, dtype=data.dtype)
+
+    # (n_rows - time_steps + 1, n_features, time_steps) -> drop the last window, it has no target
+    windows = sliding_window_view(data, time_steps, axis=0)[:-1]
+    return windows.transpose(0, 2, 1), data[time_steps:, target_col]
+
+
+def iter_sequence_batches(data: np.ndarray, time_steps: int, batch_size: int = 32, target_col: int = 0,
+                          dtype: Optional[np.dtype] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield contiguous (X, y) batches of the windows from make_sequences().
+
+    Only one batch is materialised at a time, so peak memory stays at
+    batch_size windows however long the history is.
+    """
+    X, y = make_sequences(data, time_steps, target_col, dtype)
+    for start in range(0, len(y), batch_size):
+        yield np.ascontiguousarray(X[start:start + batch_size]), y[start:start + batch_size]
+
+
+def sequence_dataset(data: np.ndarray, time_steps: int, batch_size: int = 32, target_col: int = 0,
+                     dtype=np.float32):
+    """
+    Stream the windows from make_sequences() as a batched tf.data.Dataset.
+
+    Requires TensorFlow; batches are produced lazily by iter_sequence_batches().
+    """
+    import tensorflow as tf
+
+    data = np.asarray(data)
+    n_features = 1 if data.ndim == 1 else data.shape[1]
+    tf_dtype = tf.as_dtype(np.dtype(dtype))
+    return tf.data.Dataset.from_generator(
+        lambda: iter_sequence_batches(data, time_steps, batch_size, target_col, dtype),
+        output_signature=(
+            tf.TensorSpec(shape=(None, time_steps, n_features), dtype=tf_dtype),
+            tf.TensorSpec(shape=(None,), dtype=tf_dtype),
+        ),
+    )
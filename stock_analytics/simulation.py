@@ -0,0 +1,250 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+# Simulation methods accepted by simulate_paths()
+METHODS = ('gbm', 'bootstrap', 'block_bootstrap')
+
+# Defaults used by the Prediction tab
+DEFAULT_PATHS = 5000
+DEFAULT_CONFIDENCE = 0.90
+# Consecutive trading days resampled together by the block bootstrap (about one week)
+DEFAULT_BLOCK_SIZE = 5
+# Upper bound on simulated values held at once by block_bootstrap_bands()
+DEFAULT_CHUNK_ELEMENTS = 8_000_000
+
+
+def log_returns(prices_or_returns: Union[np.ndarray, Sequence[float]], simple: bool = True) -> np.ndarray:
+    """
+    Daily log returns from simple returns (simple=True) or from prices.
+
+    NaN and infinite values (e.g. the first pct_change() row) are dropped.
+    """
+    values = np.asarray(prices_or_returns, dtype=np.float64).ravel()
+    if simple:
+        values = values[values > -1.0]
+        result = np.log1p(values)
+    else:
+        values = values[values > 0]
+        result = np.diff(np.log(values))
+    return result[np.isfinite(result)]
+
+
+def _pack_histories(histories: Sequence[np.ndarray], dtype) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stack return histories of different lengths into one (n_series, width) matrix.
+
+    Each row is its history repeated cyclically up to the common width, so a
+    series shorter than a block simply wraps around when a block is read.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (packed matrix, length of each history)
+    """
+    lengths = np.array([len(history) for history in histories], dtype=np.int64)
+    width = max(int(lengths.max()) if len(lengths) else 0, 1)
+    packed = np.zeros((len(histories), width), dtype=dtype)
+    for i, history in enumerate(histories):
+        if len(history):
+            packed[i] = np.resize(history, width)
+    return packed, lengths
+
+
+def _block_paths(rng: np.random.Generator, packed: np.ndarray, lengths: np.ndarray, n_paths: int,
+                 n_days: int, block_size: int) -> np.ndarray:
+    """
+    Moving-block bootstrap of daily log returns for every row of `packed`.
+
+    Every path is a run of blocks of `block_size` consecutive days whose
+    start is drawn uniformly from each series' own history. Blocks are read
+    through a sliding-window view, so only one start index per block is
+    drawn and the gather copies whole blocks.
+
+    Returns:
+        np.ndarray: Log returns of shape (n_series, n_paths, n_days)
+    """
+    n_series, width = packed.shape
+    block_size = max(1, min(block_size, width))
+    n_blocks = -(-n_days // block_size)
+    windows = sliding_window_view(packed, block_size, axis=1)
+    starts = rng.integers(0, np.maximum(lengths - block_size + 1, 1)[:, None, None],
+                          size=(n_series, n_paths, n_blocks), dtype=np.int64)
+    paths = windows[np.arange(n_series)[:, None, None], starts]
+    paths = paths.reshape(n_series, n_paths, n_blocks * block_size)
+    if n_blocks * block_size != n_days:
+        paths = np.ascontiguousarray(paths[:, :, :n_days])
+    return paths
+
+
+def simulate_paths(last_price: float, returns: Union[np.ndarray, Sequence[float]], n_days: int,
+                   n_paths: int = DEFAULT_PATHS, method: str = 'gbm', seed: Optional[int] = 42,
+                   dtype=np.float64, rng: Optional[np.random.Generator] = None,
+                   block_size: int = DEFAULT_BLOCK_SIZE) -> np.ndarray:
+    """
+    Simulate future price paths from historical daily returns.
+
+    All paths are generated as one (n_paths, n_days) matrix: daily log
+    returns are drawn in a single call, accumulated with cumsum along the
+    day axis and exponentiated in place, so there is no per-day or per-path
+    Python loop.
+
+    Args:
+        last_price: Price the paths start from
+        returns: Historical daily simple returns (e.g. Close.pct_change())
+        n_days: Number of future days
+        n_paths: Number of simulated paths
+        method: 'gbm' draws Gaussian log returns with the historical mean and
+                volatility; 'bootstrap' resamples single historical log returns;
+                'block_bootstrap' resamples runs of block_size consecutive
+                days, keeping volatility clustering within each block
+        seed: Seed for a fresh np.random.Generator (ignored when rng is given)
+        dtype: np.float64, or np.float32 to halve memory
+        rng: Generator to draw from instead of seeding a new one
+        block_size: Days per block for 'block_bootstrap'
+
+    Returns:
+        np.ndarray: Prices of shape (n_paths, n_days)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown simulation method {method!r}, expected one of {METHODS}")
+    dtype = np.dtype(dtype)
+    rng = rng or np.random.default_rng(seed)
+    history = log_returns(returns)
+    if len(history) == 0:
+        return np.full((n_paths, n_days), last_price, dtype=dtype)
+
+    if method == 'gbm':
+        # Discretised GBM: log price increments are i.i.d. N(mean, std) of the history
+        paths = rng.standard_normal((n_paths, n_days), dtype=dtype)
+        paths *= dtype.type(history.std(ddof=1) if len(history) > 1 else 0.0)
+        paths += dtype.type(history.mean())
+    elif method == 'bootstrap':
+        paths = history.astype(dtype)[rng.integers(0, len(history), size=(n_paths, n_days))]
+    else:
+        packed, lengths = _pack_histories([history], dtype)
+        paths = _block_paths(rng, packed, lengths, n_paths, n_days, block_size)[0]
+
+    np.cumsum(paths, axis=1, out=paths)
+    np.exp(paths, out=paths)
+    paths *= dtype.type(last_price)
+    return paths
+
+
+def quantile_bands(paths: np.ndarray, confidence: float = DEFAULT_CONFIDENCE) -> Dict[str, np.ndarray]:
+    """
+    Per-day summary of simulated paths.
+
+    Returns:
+        dict: 'median', 'mean', 'lower' and 'upper' arrays of length n_days,
+        where lower/upper are the empirical (1 - confidence) / 2 and
+        (1 + confidence) / 2 quantiles across paths
+    """
+    tail = (1.0 - confidence) / 2.0
+    lower, median, upper = np.quantile(paths, [tail, 0.5, 1.0 - tail], axis=0).astype(paths.dtype, copy=False)
+    return {
+        'median': median,
+        'mean': paths.mean(axis=0),
+        'lower': lower,
+        'upper': upper,
+    }
+
+
+def monte_carlo_forecast(last_price: float, returns: Union[np.ndarray, Sequence[float]], n_days: int,
+                         n_paths: int = DEFAULT_PATHS, method: str = 'gbm',
+                         confidence: float = DEFAULT_CONFIDENCE, seed: Optional[int] = 42,
+                         dtype=np.float64, block_size: int = DEFAULT_BLOCK_SIZE) -> Dict[str, np.ndarray]:
+    """
+    Simulate paths and reduce them to quantile bands, see simulate_paths() and quantile_bands().
+    """
+    paths = simulate_paths(last_price, returns, n_days, n_paths, method, seed, dtype, block_size=block_size)
+    return quantile_bands(paths, confidence)
+
+
+def block_bootstrap_bands(returns: Union[pd.DataFrame, Sequence[Sequence[float]]], last_prices: Sequence[float],
+                          n_days: int, n_paths: int = DEFAULT_PATHS, block_size: int = DEFAULT_BLOCK_SIZE,
+                          confidence: float = DEFAULT_CONFIDENCE, seed: Optional[int] = 42,
+                          dtype=np.float32, chunk_elements: int = DEFAULT_CHUNK_ELEMENTS) -> Dict[str, np.ndarray]:
+    """
+    Block-bootstrap scenarios for many tickers at once.
+
+    Each ticker's historical log returns are resampled in blocks of
+    consecutive days (see _block_paths), so calm and volatile stretches
+    carry over into the simulated paths. Tickers are processed in chunks
+    of at most `chunk_elements` simulated values; within a chunk sampling,
+    accumulation and the quantiles are single array operations.
+
+    Args:
+        returns: Daily simple returns, one column per ticker (a DataFrame, NaN
+                 where a ticker has no data) or one sequence per ticker
+        last_prices: Price each ticker's paths start from
+        n_days: Number of future days
+        n_paths: Paths per ticker
+        block_size: Consecutive days per resampled block
+        confidence: Width of the lower/upper band
+        seed: Seed for the np.random.Generator
+        dtype: np.float32 (default) or np.float64 for the simulated paths
+        chunk_elements: Simulated values per chunk, bounding peak memory
+
+    Returns:
+        dict: 'median', 'mean', 'lower' and 'upper' arrays of shape
+        (n_tickers, n_days); a ticker without returns stays at its last price
+    """
+    if isinstance(returns, pd.DataFrame):
+        series = [returns[col].to_numpy() for col in returns.columns]
+    else:
+        series = list(returns)
+    histories = [log_returns(values) for values in series]
+    last_prices = np.asarray(last_prices, dtype=np.float64)
+    if len(last_prices) != len(histories):
+        raise ValueError(f"Got {len(histories)} return series but {len(last_prices)} last prices")
+
+    dtype = np.dtype(dtype)
+    rng = np.random.default_rng(seed)
+    tail = (1.0 - confidence) / 2.0
+    n_tickers = len(histories)
+    bands = {key: np.empty((n_tickers, n_days), dtype=dtype) for key in ('median', 'mean', 'lower', 'upper')}
+
+    packed, lengths = _pack_histories(histories, dtype)
+
+    chunk = max(1, chunk_elements // max(n_paths * n_days, 1))
+    for first in range(0, n_tickers, chunk):
+        rows = slice(first, first + chunk)
+        paths = _block_paths(rng, packed[rows], lengths[rows], n_paths, n_days, block_size)
+
+        np.cumsum(paths, axis=2, out=paths)
+        np.exp(paths, out=paths)
+        paths *= last_prices[rows].astype(dtype)[:, np.newaxis, np.newaxis]
+
+        lower, median, upper = np.quantile(paths, [tail, 0.5, 1.0 - tail], axis=1)
+        bands['lower'][rows] = lower
+        bands['median'][rows] = median
+        bands['upper'][rows] = upper
+        bands['mean'][rows] = paths.mean(axis=1)
+    return bands
+
+
+def scenario_forecast(returns: pd.DataFrame, last_prices: Mapping[str, float], n_days: int,
+                      **kwargs) -> Dict[str, Dict[str, List[float]]]:
+    """
+    Block-bootstrap forecasts per ticker in the Prediction tab's model_results format.
+
+    Args:
+        returns: Daily simple returns, one column per ticker
+        last_prices: Last close per ticker
+        n_days: Number of future days
+        **kwargs: Passed to block_bootstrap_bands()
+
+    Returns:
+        dict: {ticker: {'y_pred_future', 'y_pred_lower', 'y_pred_upper'}}, each a
+        list of n_days prices (median path and quantile band)
+    """
+    tickers = list(returns.columns)
+    bands = block_bootstrap_bands(returns, [last_prices[t] for t in tickers], n_days, **kwargs)
+    return {
+        ticker: {
+            'y_pred_future': bands['median'][i].tolist(),
+            'y_pred_lower': bands['lower'][i].tolist(),
+            'y_pred_upper': bands['upper'][i].tolist(),
+        }
+        for i, ticker in enumerate(tickers)
+    }
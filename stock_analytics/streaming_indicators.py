@@ -0,0 +1,468 @@
+import copy
+import math
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .indicators import INDICATOR_COLUMNS, add_indicators
+from .rolling import ewm_step, kahan_step, welford_add_step, welford_remove_step
+
+# Price columns read by IndicatorEngine.update_frame(), in argument order of update()
+PRICE_COLUMNS = ['High', 'Low', 'Close']
+
+NAN = float('nan')
+
+
+def _signbit(value: float) -> bool:
+    return math.copysign(1.0, value) < 0
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    """Float division with NumPy semantics: x / 0 is +-inf and 0 / 0 is NaN instead of raising."""
+    try:
+        return numerator / denominator
+    except ZeroDivisionError:
+        if numerator != numerator or numerator == 0:
+            return NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+
+
+class RollingMean:
+    """
+    Running equivalent of Series.rolling(window, min_periods).mean().
+
+    Follows pandas' fixed-window kernel step for step: Kahan-compensated
+    sums (rolling.kahan_step) with separate compensation for values
+    entering and leaving the window, old values removed before the new one
+    is added, NaN skipped, and the same constant-run and sign corrections
+    on the result. Every update is O(1) and the output is bit-identical to
+    the batch result.
+    """
+
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self._values = deque(maxlen=window)
+        self._sum = 0.0
+        self._compensation_add = 0.0
+        self._compensation_remove = 0.0
+        self._nobs = 0
+        self._neg_ct = 0
+        self._same_count = 0
+        self._prev_value = None
+
+    def update(self, value: float) -> float:
+        """Add the next value and return the mean of the current window."""
+        if self._prev_value is None:
+            self._prev_value = value
+        if len(self._values) == self.window:
+            self._remove(self._values[0])
+        self._values.append(value)
+        self._add(value)
+
+        if self._nobs >= self.min_periods and self._nobs > 0:
+            result = self._sum / self._nobs
+            if self._same_count >= self._nobs:
+                result = self._prev_value
+            elif self._neg_ct == 0 and result < 0:
+                result = 0.0
+            elif self._neg_ct == self._nobs and result > 0:
+                result = 0.0
+            return result
+        return NAN
+
+    def _add(self, value: float) -> None:
+        if value != value:
+            return
+        self._nobs += 1
+        self._sum, self._compensation_add = kahan_step(self._sum, self._compensation_add, value)
+        if _signbit(value):
+            self._neg_ct += 1
+        if value == self._prev_value:
+            self._same_count += 1
+        else:
+            self._same_count = 1
+        self._prev_value = value
+
+    def _remove(self, value: float) -> None:
+        if value != value:
+            return
+        self._nobs -= 1
+        self._sum, self._compensation_remove = kahan_step(self._sum, self._compensation_remove, -value)
+        if _signbit(value):
+            self._neg_ct -= 1
+
+
+class RollingStd:
+    """
+    Running equivalent of Series.rolling(window, min_periods).std(ddof).
+
+    Welford's update with Kahan compensation (rolling.welford_add_step and
+    welford_remove_step), mirroring pandas' rolling variance kernel so
+    results are bit-identical to the batch version.
+    """
+
+    def __init__(self, window: int, ddof: int = 1, min_periods: Optional[int] = None):
+        self.window = window
+        self.ddof = ddof
+        self.min_periods = max(window if min_periods is None else min_periods, 1)
+        self._values = deque(maxlen=window)
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self._nobs = 0.0
+        self._compensation_add = 0.0
+        self._compensation_remove = 0.0
+        self._same_count = 0
+        self._prev_value = None
+
+    def update(self, value: float) -> float:
+        """Add the next value and return the standard deviation of the current window."""
+        if self._prev_value is None:
+            self._prev_value = value
+        if len(self._values) == self.window:
+            self._remove(self._values[0])
+        self._values.append(value)
+        self._add(value)
+
+        if self._nobs >= self.min_periods and self._nobs > self.ddof:
+            if self._same_count >= self._nobs or self._nobs == 1:
+                return 0.0
+            variance = self._ssqdm / (self._nobs - self.ddof)
+            return 0.0 if variance < 0 else math.sqrt(variance)
+        return NAN
+
+    def _add(self, value: float) -> None:
+        if value != value:
+            return
+        self._nobs += 1
+        if value == self._prev_value:
+            self._same_count += 1
+        else:
+            self._same_count = 1
+        self._prev_value = value
+        self._mean, self._ssqdm, self._compensation_add = welford_add_step(
+            self._mean, self._ssqdm, self._compensation_add, self._nobs, value)
+
+    def _remove(self, value: float) -> None:
+        if value != value:
+            return
+        self._nobs -= 1
+        if self._nobs:
+            self._mean, self._ssqdm, self._compensation_remove = welford_remove_step(
+                self._mean, self._ssqdm, self._compensation_remove, self._nobs, value)
+        else:
+            self._mean = 0.0
+            self._ssqdm = 0.0
+
+
+class RollingExtreme:
+    """
+    Running Series.rolling(window, min_periods).max() (or .min() with lowest=True).
+
+    A monotonic deque of (position, value) keeps the window's extreme at
+    the front; every value enters and leaves it once, so updates are
+    amortised O(1). NaN values are skipped but still occupy a window slot.
+    """
+
+    def __init__(self, window: int, lowest: bool = False, min_periods: Optional[int] = None):
+        self.window = window
+        self.lowest = lowest
+        self.min_periods = window if min_periods is None else min_periods
+        self._candidates = deque()
+        self._observed = deque(maxlen=window)
+        self._nobs = 0
+        self._position = 0
+
+    def update(self, value: float) -> float:
+        """Add the next value and return the extreme of the current window."""
+        self._position += 1
+        while self._candidates and self._candidates[0][0] <= self._position - self.window:
+            self._candidates.popleft()
+        if len(self._observed) == self.window and self._observed[0]:
+            self._nobs -= 1
+        is_observation = value == value
+        self._observed.append(is_observation)
+        if is_observation:
+            self._nobs += 1
+            if self.lowest:
+                while self._candidates and self._candidates[-1][1] >= value:
+                    self._candidates.pop()
+            else:
+                while self._candidates and self._candidates[-1][1] <= value:
+                    self._candidates.pop()
+            self._candidates.append((self._position, value))
+
+        if self._nobs >= self.min_periods and self._nobs > 0:
+            return self._candidates[0][1]
+        return NAN
+
+
+class EWMean:
+    """
+    Running equivalent of Series.ewm(span=span, adjust=False).mean().
+
+    Reproduces pandas' recursion exactly, including the division by the
+    summed weights and skipping the update when the value equals the
+    current average.
+    """
+
+    def __init__(self, span: float):
+        com = (span - 1) / 2
+        alpha = 1. / (1. + com)
+        self._old_wt_factor = 1. - alpha
+        self._new_wt = alpha
+        self._old_wt = 1.
+        self._weighted = None
+        self._nobs = 0
+
+    def update(self, value: float) -> float:
+        """Add the next value and return the current average."""
+        is_observation = value == value
+        if self._weighted is None:
+            self._weighted = value
+            self._nobs = int(is_observation)
+        else:
+            self._nobs += is_observation
+            weighted = self._weighted
+            if weighted == weighted:
+                self._old_wt *= self._old_wt_factor
+                if is_observation:
+                    if weighted != value:
+                        weighted = ewm_step(weighted, value, self._old_wt, self._new_wt)
+                    self._old_wt = 1.
+            elif is_observation:
+                weighted = value
+            self._weighted = weighted
+        return self._weighted if self._nobs >= 1 else NAN
+
+
+class RSI:
+    """Running indicators.calculate_rsi(): simple moving averages of gains and losses."""
+
+    def __init__(self, window: int = 14):
+        self._gains = RollingMean(window, min_periods=1)
+        self._losses = RollingMean(window, min_periods=1)
+        self._prev_close = NAN
+
+    def update(self, close: float) -> float:
+        delta = close - self._prev_close
+        self._prev_close = close
+        avg_gain = self._gains.update(delta if delta > 0 else 0.0)
+        avg_loss = self._losses.update(-delta if delta < 0 else 0.0)
+
+        rs = 0.0
+        if avg_loss != 0 and avg_loss == avg_loss and avg_gain == avg_gain:
+            rs = avg_gain / avg_loss
+        rsi = 100 - (100 / (1 + rs))
+        if rsi != rsi:
+            rsi = 50.0
+        return min(max(rsi, 0.0), 100.0)
+
+
+class MACD:
+    """Running indicators.calculate_macd(); update() returns (macd, signal, histogram)."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast = EWMean(fast)
+        self._slow = EWMean(slow)
+        self._signal = EWMean(signal)
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        macd_line = self._fast.update(close) - self._slow.update(close)
+        signal_line = self._signal.update(macd_line)
+        return macd_line, signal_line, macd_line - signal_line
+
+
+class BollingerBands:
+    """
+    Running indicators.calculate_bollinger_bands(); update() returns (upper, middle, lower).
+
+    Values are NaN until the first full window. The batch version back-fills
+    that warm-up, which needs the future, so it is left to whoever assembles
+    the frame (see IndicatorEngine.frame()).
+    """
+
+    def __init__(self, window: int = 20, num_std: int = 2):
+        self.num_std = num_std
+        self._mean = RollingMean(window)
+        self._std = RollingStd(window)
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        sma = self._mean.update(close)
+        std = self._std.update(close)
+        return sma + (std * self.num_std), sma, sma - (std * self.num_std)
+
+
+class Stochastic:
+    """Running indicators.calculate_stochastic(); update() returns (%K, %D)."""
+
+    def __init__(self, k_window: int = 14, d_window: int = 3):
+        self._low = RollingExtreme(k_window, lowest=True)
+        self._high = RollingExtreme(k_window)
+        self._d = RollingMean(d_window)
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float]:
+        low_min = self._low.update(low)
+        high_max = self._high.update(high)
+        k = 100 * _divide(close - low_min, high_max - low_min)
+        return k, self._d.update(k)
+
+
+class IndicatorEngine:
+    """
+    Incremental version of indicators.add_indicators() for one ticker.
+
+    Holds the running state of every indicator column (RSI, SMA, EMA_20,
+    EMA_50, MACD, Bollinger Bands, Stochastic); update() folds in one bar in
+    O(1) and returns that bar's values, bit-identical to the batch
+    functions. As in the batch code before its final fill, values are NaN
+    while an indicator warms up.
+    """
+
+    def __init__(self):
+        self._rsi = RSI(14)
+        self._sma = RollingMean(9)
+        self._ema_20 = EWMean(20)
+        self._ema_50 = EWMean(50)
+        self._macd = MACD(12, 26, 9)
+        self._bollinger = BollingerBands(20, 2)
+        self._stochastic = Stochastic(14, 3)
+        self.bars = 0
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, ...]:
+        """Fold in the next bar; returns its values in INDICATOR_COLUMNS order."""
+        self.bars += 1
+        return (
+            self._rsi.update(close),
+            self._sma.update(close),
+            self._ema_20.update(close),
+            self._ema_50.update(close),
+            *self._macd.update(close),
+            *self._bollinger.update(close),
+            *self._stochastic.update(high, low, close),
+        )
+
+    def update_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fold in every row of an OHLC frame; returns the raw indicator columns for those rows."""
+        columns = [df[col].to_numpy(dtype=np.float64).tolist() for col in PRICE_COLUMNS]
+        rows = [self.update(high, low, close) for high, low, close in zip(*columns)]
+        return pd.DataFrame(rows, index=df.index, columns=INDICATOR_COLUMNS, dtype=np.float64)
+
+    def copy(self) -> 'IndicatorEngine':
+        """Independent copy of the running state."""
+        return copy.deepcopy(self)
+
+    @staticmethod
+    def frame(df: pd.DataFrame, raw: pd.DataFrame) -> pd.DataFrame:
+        """Join prices and raw indicator columns and fill gaps like add_indicators()."""
+        return pd.concat([df, raw], axis=1).ffill().bfill()
+
+
+class _CachedHistory:
+    """What IncrementalIndicators keeps for one ticker."""
+
+    def __init__(self, prices: pd.DataFrame, filled: pd.DataFrame, before_last: IndicatorEngine,
+                 raw: Optional[pd.DataFrame] = None):
+        # History the cache was built from, and its add_indicators() frame
+        self.prices = prices
+        self.filled = filled
+        # Engine state just before the last bar, which may still be revised
+        self.before_last = before_last
+        # Raw indicator columns, only kept while some column has no value before the
+        # last bar yet; until then new bars can change the backward fill of older rows
+        self.raw = raw
+
+
+class IncrementalIndicators:
+    """
+    Per-ticker indicator cache that only folds in newly arrived bars.
+
+    For every ticker it keeps the filled indicator frame and the engine
+    state just before the last cached bar. A refresh that adds bars, or
+    revises the still-open last bar, runs only those bars through the
+    indicators and the forward fill, then appends them to the cached frame,
+    instead of a full add_indicators() pass. A history that does not extend
+    the cached one (different start or columns, revised older bars) is
+    replayed from scratch; keep the start of a rolling window fixed (see
+    lstm_models.live_window_start()) so refreshes stay incremental.
+
+    Safe to share between sessions; updates are serialised with a lock.
+    Returned frames are copies: lazy ones when pandas copy-on-write is
+    enabled (as in the app), which only copy data once either side is
+    modified, and full copies otherwise.
+    """
+
+    def __init__(self):
+        self._cache: Dict[str, _CachedHistory] = {}
+        self._lock = threading.Lock()
+
+    def clear(self, ticker: Optional[str] = None) -> None:
+        """Drop the cache for one ticker, or for all tickers."""
+        with self._lock:
+            if ticker is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(ticker, None)
+
+    def update(self, ticker: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Return add_indicators(df), reusing the cached state for `ticker`.
+
+        Args:
+            ticker: Cache key, normally the cleaned ticker symbol
+            df: Full OHLCV history, sorted by index
+
+        Returns:
+            pd.DataFrame: `df` with the indicator columns, identical to add_indicators(df)
+        """
+        if df is None or df.empty or any(col not in df.columns for col in PRICE_COLUMNS):
+            return add_indicators(df)
+
+        with self._lock:
+            # Taken out of the cache while it is advanced, so a failure leaves no half-updated entry
+            cached = self._cache.pop(ticker, None)
+            entry = self._extend(cached, df) if cached is not None else None
+            if entry is None:
+                engine = IndicatorEngine()
+                raw = engine.update_frame(df.iloc[:-1])
+                before_last = engine.copy()
+                raw = pd.concat([raw, engine.update_frame(df.iloc[-1:])])
+                entry = self._fill(df, raw, before_last)
+            self._cache[ticker] = entry
+            return entry.filled.copy(deep=not pd.get_option('mode.copy_on_write'))
+
+    @staticmethod
+    def _fill(df: pd.DataFrame, raw: pd.DataFrame, before_last: IndicatorEngine) -> _CachedHistory:
+        """Cache entry with the whole frame filled, keeping `raw` until every column has settled."""
+        combined = pd.concat([df, raw], axis=1)
+        settled = len(combined) > 1 and combined.iloc[:-1].notna().any().all()
+        return _CachedHistory(df, combined.ffill().bfill(), before_last, None if settled else raw)
+
+    def _extend(self, cached: _CachedHistory, df: pd.DataFrame) -> Optional[_CachedHistory]:
+        """Fold the bars of `df` after the cached ones into the cache, or None if a replay is needed."""
+        prices = cached.prices
+        n = len(prices)
+        if (list(prices.columns) != list(df.columns) or len(df) < n
+                or not df.index[:n].equals(prices.index)
+                or not df.iloc[:n - 1].equals(prices.iloc[:n - 1])):
+            return None
+
+        # The last cached bar may have changed (open session), so folding restarts there;
+        # the entry is no longer cached, so its engine can be advanced in place
+        engine = cached.before_last
+        fresh = df.iloc[n - 1:]
+        new_raw = engine.update_frame(fresh.iloc[:-1])
+        before_last = engine.copy()
+        new_raw = pd.concat([new_raw, engine.update_frame(fresh.iloc[-1:])])
+
+        if cached.raw is not None:
+            return self._fill(df, pd.concat([cached.raw.iloc[:n - 1], new_raw]), before_last)
+
+        # Every column has a value before the last cached bar, so the backward fill is done
+        # and new rows only need forward filling from the row before them
+        tail = pd.concat([cached.filled.iloc[n - 2:n - 1], pd.concat([fresh, new_raw], axis=1)])
+        filled = pd.concat([cached.filled.iloc[:n - 1], tail.ffill().iloc[1:]])
+        return _CachedHistory(df, filled, before_last)
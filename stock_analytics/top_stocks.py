@@ -0,0 +1,286 @@
+import math
+import os
+import re
+import threading
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+from . import DATA_DIR
+
+# Built-in universes; larger index lists are loaded through UNIVERSE_SOURCES
+US_DEFAULT = ["AAPL", "MSFT", "GOOGL", "AMZN", "META", "TSLA", "NVDA", "JPM", "V", "WMT",
+              "PG", "DIS", "NFLX", "INTC", "AMD", "PYPL", "CSCO", "ADBE", "CRM", "CMCSA"]
+
+INDIA_DEFAULT = ["RELIANCE.NS", "TCS.NS", "HDFCBANK.NS", "INFY.NS", "ICICIBANK.NS", "HINDUNILVR.NS",
+                 "SBIN.NS", "BHARTIARTL.NS", "ITC.NS", "KOTAKBANK.NS", "AXISBANK.NS", "LT.NS",
+                 "BAJFINANCE.NS", "HCLTECH.NS", "WIPRO.NS", "MARUTI.NS", "ASIANPAINT.NS", "SUNPHARMA.NS"]
+
+BUILTIN_UNIVERSES = {
+    "US": US_DEFAULT,
+    "India": INDIA_DEFAULT,
+}
+
+# Published constituent lists: (market, CSV URL, symbol column, ticker suffix)
+UNIVERSE_SOURCES = {
+    "S&P 500": ("US", "https://raw.githubusercontent.com/datasets/s-and-p-500-companies/main/data/constituents.csv",
+                "Symbol", ""),
+    "NIFTY 50": ("India", "https://archives.nseindia.com/content/indices/ind_nifty50list.csv", "Symbol", ".NS"),
+    "NIFTY 500": ("India", "https://archives.nseindia.com/content/indices/ind_nifty500list.csv", "Symbol", ".NS"),
+}
+
+# Downloaded and user-supplied lists (<name>.txt or <name>.csv) live here
+DEFAULT_UNIVERSE_DIR = os.path.join(DATA_DIR, 'universes')
+
+# Concurrency limits for quote sweeps
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_TIMEOUT = 10.0
+
+
+def _universe_dir() -> str:
+    return os.environ.get('STOCK_UNIVERSE_DIR', DEFAULT_UNIVERSE_DIR)
+
+
+def _universe_file(name: str) -> str:
+    return os.path.join(_universe_dir(), re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_').lower())
+
+
+def list_universes(market: str) -> List[str]:
+    """Names of the universes available for a market, the built-in list first."""
+    names = [name for name, source in UNIVERSE_SOURCES.items() if source[0] == market]
+    return [market] + names
+
+
+def _read_symbols(path: str, column: Optional[str] = None) -> List[str]:
+    if path.endswith('.csv'):
+        table = pd.read_csv(path)
+        column = column or next((c for c in table.columns if c.strip().lower() in ('symbol', 'ticker')),
+                                table.columns[0])
+        symbols = table[column]
+    else:
+        with open(path, 'r') as f:
+            symbols = pd.Series(f.read().split())
+    return [s for s in symbols.astype(str).str.strip() if s and not s.startswith('#')]
+
+
+def load_universe(name: str) -> List[str]:
+    """
+    Return the ticker symbols in a universe.
+
+    Built-in names ("US", "India") are served directly. Anything else is read
+    from `<universe dir>/<name>.txt` (one symbol per line) or `<name>.csv`
+    (a Symbol or Ticker column). Names in UNIVERSE_SOURCES are downloaded on
+    first use and cached in that directory.
+
+    Args:
+        name: Universe name, e.g. "US", "S&P 500" or "NIFTY 500"
+
+    Returns:
+        List[str]: Ticker symbols in provider format, duplicates removed
+    """
+    if name in BUILTIN_UNIVERSES:
+        return list(BUILTIN_UNIVERSES[name])
+
+    base = _universe_file(name)
+    for suffix in ('.txt', '.csv'):
+        if os.path.exists(base + suffix):
+            return list(dict.fromkeys(_read_symbols(base + suffix)))
+
+    if name not in UNIVERSE_SOURCES:
+        raise ValueError(f"Unknown stock universe: {name}")
+
+    _, url, column, ticker_suffix = UNIVERSE_SOURCES[name]
+    symbols = _read_symbols_from_url(url, column)
+    # yfinance spells share classes with a dash (BRK-B), index lists with a dot
+    symbols = [s.replace('.', '-') + ticker_suffix for s in symbols]
+    symbols = list(dict.fromkeys(symbols))
+
+    os.makedirs(_universe_dir(), exist_ok=True)
+    with open(base + '.txt', 'w') as f:
+        f.write('\n'.join(symbols) + '\n')
+    return symbols
+
+
+def _read_symbols_from_url(url: str, column: str) -> List[str]:
+    # Some index publishers reject requests without a browser user agent
+    table = pd.read_csv(url, storage_options={'User-Agent': 'Mozilla/5.0'})
+    return table[column].astype(str).str.strip().tolist()
+
+
+def quote_row(ticker: str, info: dict) -> Optional[dict]:
+    """Reduce a provider quote to the Top Stocks table row, or None if it is empty."""
+    if not info:
+        return None
+    latest_price = info.get('currentPrice', 0) or 0
+    prev_close = info.get('previousClose', 0) or 0
+    change = latest_price - prev_close
+    return {
+        'ticker': ticker,
+        'name': info.get('shortName', ticker),
+        'price': latest_price,
+        'change': change,
+        'change_pct': (change / prev_close * 100) if prev_close > 0 else 0,
+        'volume': info.get('volume', 0) or 0,
+        'market_cap': info.get('marketCap', 0) or 0,
+    }
+
+
+def fetch_quotes(tickers: List[str], provider, max_workers: int = DEFAULT_MAX_WORKERS,
+                 timeout: float = DEFAULT_TIMEOUT) -> Dict[str, dict]:
+    """
+    Fetch quotes for many tickers concurrently.
+
+    Requests run on a bounded thread pool. Each request gets roughly
+    `timeout` seconds: the sweep stops after `timeout` times the number of
+    rounds the pool needs, and whatever has not finished by then is dropped.
+    Failed and timed-out tickers are logged and left out, so callers always
+    get the partial result.
+
+    Args:
+        tickers: Symbols to fetch
+        provider: MarketDataProvider supplying quote()
+        max_workers: Maximum concurrent requests
+        timeout: Per-request time budget in seconds
+
+    Returns:
+        Dict[str, dict]: {ticker: quote row} for tickers that returned data
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return {}
+
+    workers = max(1, min(max_workers, len(tickers)))
+    budget = timeout * math.ceil(len(tickers) / workers)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='quotes')
+    started = time.perf_counter()
+    futures = {}
+    try:
+        futures = {pool.submit(provider.quote, ticker): ticker for ticker in tickers}
+        done, pending = wait(futures, timeout=budget)
+    finally:
+        # Do not block on stragglers; queued requests are cancelled
+        for future in futures:
+            future.cancel()
+        pool.shutdown(wait=False)
+
+    rows = {}
+    failed = 0
+    for future, ticker in futures.items():
+        if future not in done:
+            continue
+        try:
+            row = quote_row(ticker, future.result())
+        except Exception as e:
+            print(f"Error fetching data for {ticker}: {str(e)}")
+            failed += 1
+            continue
+        if row is not None:
+            rows[ticker] = row
+
+    if pending or failed:
+        print(f"Fetched {len(rows)}/{len(tickers)} quotes in {time.perf_counter() - started:.1f}s "
+              f"({failed} failed, {len(pending)} timed out)")
+    return rows
+
+
+def top_movers(rows, limit: int = 10) -> List[dict]:
+    """Rows sorted by percent change, best first, in universe order on ties."""
+    return sorted(rows, key=lambda row: row['change_pct'], reverse=True)[:limit]
+
+
+class QuoteSnapshot:
+    """Quote rows for one universe plus when they were refreshed."""
+
+    def __init__(self, universe: str, rows: Dict[str, dict], refreshed_at: Optional[float]):
+        self.universe = universe
+        self.rows = rows
+        self.refreshed_at = refreshed_at
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the last completed refresh, or None before the first one."""
+        return None if self.refreshed_at is None else time.time() - self.refreshed_at
+
+
+class QuoteSnapshotCache:
+    """
+    Process-wide quote snapshots refreshed by a single background thread.
+
+    Every universe that has been read recently is re-fetched every
+    `interval` seconds, so upstream load depends on the number of
+    universes, not on the number of sessions reading them. Each row keeps
+    the time its quote was fetched in `as_of`; when a ticker fails during a
+    refresh its previous row is kept, so staleness is visible per row.
+    Universes nobody has read for `idle_after` seconds stop refreshing.
+    """
+
+    def __init__(self, provider_factory, interval: float = 60.0, idle_after: float = 1800.0,
+                 max_workers: int = DEFAULT_MAX_WORKERS, timeout: float = DEFAULT_TIMEOUT):
+        self._provider_factory = provider_factory
+        self.interval = interval
+        self.idle_after = idle_after
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._snapshots: Dict[str, QuoteSnapshot] = {}
+        self._last_read: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._refresh_locks: Dict[str, threading.Lock] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def snapshot(self, universe: str) -> QuoteSnapshot:
+        """
+        Return the current snapshot for a universe.
+
+        The first read of a universe fetches it synchronously and registers it
+        with the background refresher; later reads never block on the network.
+        """
+        with self._lock:
+            self._last_read[universe] = time.time()
+            snapshot = self._snapshots.get(universe)
+        if snapshot is None:
+            snapshot = self.refresh(universe)
+        self._ensure_thread()
+        return snapshot
+
+    def refresh(self, universe: str) -> QuoteSnapshot:
+        """Fetch a universe now and store the merged snapshot."""
+        with self._lock:
+            refresh_lock = self._refresh_locks.setdefault(universe, threading.Lock())
+        with refresh_lock:
+            fetched_at = time.time()
+            rows = fetch_quotes(load_universe(universe), self._provider_factory(),
+                                self.max_workers, self.timeout)
+            for row in rows.values():
+                row['as_of'] = fetched_at
+            with self._lock:
+                previous = self._snapshots.get(universe)
+                merged = dict(previous.rows) if previous is not None else {}
+                merged.update(rows)
+                snapshot = QuoteSnapshot(universe, merged, fetched_at)
+                self._snapshots[universe] = snapshot
+            return snapshot
+
+    def stop(self) -> None:
+        """Stop the background refresher after its current sweep."""
+        self._stop.set()
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='quote-refresher', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            now = time.time()
+            with self._lock:
+                active = [u for u, read_at in self._last_read.items() if now - read_at <= self.idle_after]
+            for universe in active:
+                try:
+                    self.refresh(universe)
+                except Exception as e:
+                    print(f"Error refreshing quotes for {universe}: {str(e)}")
@@ -0,0 +1,360 @@
+import json
+import operator
+import os
+import re
+import string
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Rows before this index keep the initial Neutral signal (insufficient history)
+WARMUP_ROWS = 5
+
+SIGNAL_LABELS = np.array(['Neutral', 'Buy', 'Sell'], dtype=object)
+
+INITIAL_REASON = 'Initializing technical analysis'
+NO_SIGNALS_REASON = 'Insufficient technical signals'
+
+# Default rule set; reproduces the original hard-coded RSI/MA/MACD branches
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'signal_rules.json')
+
+SIDES = ('bullish', 'bearish', 'neutral')
+
+COMPARATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+ARITHMETIC = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+}
+
+# "NAME" or "NAME[-k]" (the value k rows earlier)
+_OPERAND = re.compile(r'^(?P<name>[^\[\]]+?)(?:\[-(?P<lag>\d+)\])?$')
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    """Return a column as a float64 array, coercing unparseable values to NaN."""
+    return pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _parse_operand(operand: str) -> Tuple[str, int]:
+    match = _OPERAND.match(str(operand))
+    if not match:
+        raise ValueError(f"Invalid indicator reference: {operand}")
+    return match.group('name'), int(match.group('lag') or 0)
+
+
+class _Operands:
+    """Lazily resolved indicator arrays for one frame, each computed once."""
+
+    def __init__(self, df: pd.DataFrame, derived: Dict[str, Dict[str, str]]):
+        self.df = df
+        self.derived = derived
+        self.cache: Dict[str, np.ndarray] = {}
+
+    def __getitem__(self, operand: str) -> np.ndarray:
+        if operand in self.cache:
+            return self.cache[operand]
+
+        name, lag = _parse_operand(operand)
+        if lag:
+            base = self[name]
+            values = np.empty_like(base)
+            values[:lag] = np.nan
+            values[lag:] = base[:-lag]
+        elif name in self.derived:
+            spec = self.derived[name]
+            values = ARITHMETIC[spec['op']](self[spec['left']], self[spec['right']])
+        else:
+            values = _column(self.df, name)
+
+        self.cache[operand] = values
+        return values
+
+
+class _Case:
+    """One compiled branch of a rule: an optional condition plus its outcome."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.indicator = spec.get('indicator')
+        self.signal = spec.get('signal', 'neutral')
+        if self.signal not in SIDES:
+            raise ValueError(f"Unknown signal side: {self.signal}")
+        self.weight = float(spec.get('weight', 1.0))
+        self.total = float(spec.get('total', self.weight))
+        self.reason = spec.get('reason', '')
+        self.fields = [name for _, name, _, _ in string.Formatter().parse(self.reason) if name]
+        self.threshold = spec.get('threshold', 0)
+        self.factor = spec.get('factor')
+
+        comparator = spec.get('comparator', '>')
+        if comparator not in COMPARATORS:
+            raise ValueError(f"Unknown comparator: {comparator}")
+        self.comparator = COMPARATORS[comparator] if self.indicator is not None else None
+
+    def operands(self) -> List[str]:
+        refs = list(self.fields)
+        if self.indicator is not None:
+            refs.append(self.indicator)
+            if isinstance(self.threshold, str):
+                refs.append(self.threshold)
+        return refs
+
+    def mask(self, values: _Operands, n: int) -> np.ndarray:
+        if self.comparator is None:
+            return np.ones(n, dtype=bool)
+        left = values[self.indicator]
+        right = values[self.threshold] if isinstance(self.threshold, str) else float(self.threshold)
+        if self.factor is not None:
+            right = right * float(self.factor)
+        return self.comparator(left, right)
+
+
+class _Rule:
+    """An ordered list of cases; the first matching case wins on each row."""
+
+    def __init__(self, spec: Dict[str, Any], derived: Dict[str, Dict[str, str]]):
+        self.name = spec.get('name', '')
+        self.cases = [_Case(case) for case in spec.get('cases', [])]
+        if not self.cases:
+            raise ValueError(f"Rule '{self.name}' has no cases")
+
+        refs = [ref for case in self.cases for ref in case.operands()]
+        self.lookback = max(_parse_operand(ref)[1] for ref in refs) if refs else 0
+        self.requires = list(spec.get('requires') or self._base_columns(refs, derived))
+
+        # Per-case lookup tables; the trailing 0 is picked by rows with no matching case
+        self.side_weights = {
+            side: np.array([c.weight if c.signal == side else 0.0 for c in self.cases] + [0.0])
+            for side in SIDES
+        }
+        self.totals = np.array([c.total for c in self.cases] + [0.0])
+
+    @staticmethod
+    def _base_columns(refs: List[str], derived: Dict[str, Dict[str, str]]) -> List[str]:
+        columns: List[str] = []
+        pending = [_parse_operand(ref)[0] for ref in refs]
+        while pending:
+            name = pending.pop()
+            if name in derived:
+                pending.extend(_parse_operand(derived[name][side])[0] for side in ('left', 'right'))
+            elif name not in columns:
+                columns.append(name)
+        return columns
+
+    def applies_to(self, df: pd.DataFrame) -> bool:
+        return all(col in df.columns for col in self.requires)
+
+    def evaluate(self, values: _Operands, n: int) -> np.ndarray:
+        """Return the index of the first matching case per row (-1 for none)."""
+        masks = [case.mask(values, n) for case in self.cases]
+        return np.select(masks, np.arange(len(self.cases)), default=-1)
+
+
+class SignalEvaluation:
+    """
+    Scores for every row of a frame, plus what is needed to explain any row.
+
+    Attributes:
+        scores: 'bullish', 'bearish', 'neutral' and 'total' weight arrays
+    """
+
+    def __init__(self, rules: List[_Rule], values: _Operands, cases: Dict[str, np.ndarray],
+                 scores: Dict[str, np.ndarray]):
+        self.rules = rules
+        self.values = values
+        self.cases = cases
+        self.scores = scores
+
+    def explain(self, i: int) -> str:
+        """Build the reasoning text for positional row `i`."""
+        if self.scores['total'][i] <= 0:
+            return NO_SIGNALS_REASON
+
+        reasons = []
+        for rule in self.rules:
+            case_index = self.cases[rule.name][i]
+            if case_index < 0:
+                continue
+            case = rule.cases[case_index]
+            if case.reason:
+                reasons.append(case.reason.format(
+                    **{field: float(self.values[field][i]) for field in case.fields}))
+        return ", ".join(reasons)
+
+
+class SignalRules:
+    """
+    A rule spec compiled into vectorized evaluators.
+
+    Each rule is an ordered list of cases (indicator, comparator, threshold,
+    optional factor, signal side, weight, total weight and reason template);
+    the first case whose condition holds is applied, and a case without an
+    indicator acts as the fallback. Rules only apply when their required
+    columns are present. Derived indicators are binary expressions over
+    other indicators, and any reference can look back with NAME[-k].
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.derived = dict(spec.get('derived', {}))
+        for name, expr in self.derived.items():
+            if expr.get('op') not in ARITHMETIC:
+                raise ValueError(f"Unknown operator for derived indicator {name}: {expr.get('op')}")
+        self.rules = [_Rule(rule, self.derived) for rule in spec.get('rules', [])]
+        self.lookback = max([rule.lookback for rule in self.rules] + [0])
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SignalRules':
+        """Load and compile a JSON rule spec."""
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+    def evaluate(self, df: pd.DataFrame) -> SignalEvaluation:
+        """Score every row of `df` with one vectorized pass per rule."""
+        n = len(df)
+        values = _Operands(df, self.derived)
+        scores = {side: np.zeros(n) for side in SIDES}
+        scores['total'] = np.zeros(n)
+        cases: Dict[str, np.ndarray] = {}
+        applied = []
+
+        for rule in self.rules:
+            if not rule.applies_to(df):
+                continue
+            case_index = rule.evaluate(values, n)
+            for side in SIDES:
+                scores[side] += rule.side_weights[side][case_index]
+            scores['total'] += rule.totals[case_index]
+            cases[rule.name] = case_index
+            applied.append(rule)
+
+        return SignalEvaluation(applied, values, cases, scores)
+
+
+_default_rules: Optional[SignalRules] = None
+
+
+def default_rules() -> SignalRules:
+    """The compiled default rule set, loaded once from DEFAULT_RULES_PATH."""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = SignalRules.from_file(DEFAULT_RULES_PATH)
+    return _default_rules
+
+
+def score_signals(df: pd.DataFrame, rules: Optional[SignalRules] = None) -> Dict[str, np.ndarray]:
+    """
+    Compute bullish, bearish and neutral weights for every row at once.
+
+    Args:
+        df: DataFrame with the indicator columns the rules reference
+        rules: Compiled rule set; the default rules when None
+
+    Returns:
+        Dict[str, np.ndarray]: 'bullish', 'bearish', 'neutral' and 'total' weights
+    """
+    return (rules or default_rules()).evaluate(df).scores
+
+
+def resolve_signals(scores: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Turn signal weights into Buy/Sell/Neutral codes and confidence values.
+
+    Args:
+        scores: Output of score_signals()
+
+    Returns:
+        Dict[str, np.ndarray]: 'code' (index into SIGNAL_LABELS), 'confidence'
+        and 'has_signals' (rows with a non-zero total weight)
+    """
+    total = scores['total']
+    has_signals = total > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bullish_confidence = (scores['bullish'] / total) * 100
+        bearish_confidence = (scores['bearish'] / total) * 100
+        neutral_confidence = (scores['neutral'] / total) * 100
+
+    buy = (bullish_confidence > bearish_confidence) & (bullish_confidence > neutral_confidence)
+    sell = ~buy & (bearish_confidence > bullish_confidence) & (bearish_confidence > neutral_confidence)
+
+    code = np.where(buy, 1, np.where(sell, 2, 0))
+    confidence = np.where(buy, bullish_confidence, np.where(sell, bearish_confidence, neutral_confidence))
+
+    code = np.where(has_signals, code, 0).astype(np.int8)
+    confidence = np.where(has_signals, confidence, 0.0)
+    return {'code': code, 'confidence': confidence, 'has_signals': has_signals}
+
+
+def explain_signal(df: pd.DataFrame, i: int, rules: Optional[SignalRules] = None) -> str:
+    """
+    Build the reasoning text for a single row.
+
+    Only the few rows the rules look back over are evaluated, so explaining
+    a row costs the same regardless of history length.
+
+    Args:
+        df: The frame passed to generate_signals()
+        i: Positional row index (negative values count from the end)
+        rules: Compiled rule set; the default rules when None
+
+    Returns:
+        str: Comma-separated reasons, as stored in the Reasoning column
+    """
+    rules = rules or default_rules()
+    n = len(df)
+    i = i + n if i < 0 else i
+    if i < WARMUP_ROWS:
+        return INITIAL_REASON
+
+    start = max(i - rules.lookback, 0)
+    return rules.evaluate(df.iloc[start:i + 1]).explain(i - start)
+
+
+def generate_signals(df: pd.DataFrame, reason_rows: Optional[Iterable[int]] = (-1,),
+                     rules: Optional[SignalRules] = None) -> pd.DataFrame:
+    """
+    Columnar Buy/Sell/Neutral signal generation.
+
+    Signal and Confidence are computed for every row with array expressions.
+    Reasoning is only filled in for `reason_rows` (the latest row by default)
+    and for the warm-up rows; other rows hold None and can be explained later
+    with explain_signal().
+
+    Args:
+        df: DataFrame with technical indicator columns
+        reason_rows: Positional rows to build reasoning for; None for all rows
+        rules: Compiled rule set; the default rules when None
+
+    Returns:
+        pd.DataFrame: Signal, Confidence and Reasoning indexed like `df`
+    """
+    n = len(df)
+    evaluation = (rules or default_rules()).evaluate(df)
+    resolved = resolve_signals(evaluation.scores)
+    active = np.arange(n) >= WARMUP_ROWS
+
+    code = np.where(active, resolved['code'], 0)
+    confidence = np.where(active, resolved['confidence'], 0.0)
+
+    reasoning = np.full(n, None, dtype=object)
+    reasoning[~active] = INITIAL_REASON
+    rows = range(n) if reason_rows is None else reason_rows
+    for i in rows:
+        if -n <= i < n and active[i]:
+            reasoning[i] = evaluation.explain(i % n)
+
+    signals_df = pd.DataFrame(index=df.index)
+    signals_df['Signal'] = SIGNAL_LABELS[code]
+    # Confidence keeps the integer dtype of its initial 0 unless a score has a fraction
+    integral = np.array_equal(confidence, np.trunc(confidence))
+    signals_df['Confidence'] = confidence.astype(np.int64) if integral else confidence
+    signals_df['Reasoning'] = reasoning
+    return signals_df
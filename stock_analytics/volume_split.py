@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+from typing import Tuple
+
+# Supported ways of attributing a bar's volume to buyers and sellers
+SPLIT_METHODS = ('open_close', 'tick', 'clv')
+
+VOLUME_COLUMNS = ['Buy_Volume', 'Sell_Volume', 'Cum_Buy_Volume', 'Cum_Sell_Volume']
+
+
+def _as_float(series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert a column to float64, flagging values that could not be parsed.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The float values and a mask of rows
+        float() would reject; a float NaN is missing, not invalid, but None
+        or pd.NA is invalid, as in the original loop
+    """
+    try:
+        return series.to_numpy(dtype=np.float64), np.zeros(len(series), dtype=bool)
+    except (ValueError, TypeError):
+        values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64)
+        invalid = np.isnan(values)
+        invalid[invalid] = [not isinstance(value, (float, np.floating)) for value in series.to_numpy()[invalid]]
+        return values, invalid
+
+
+def _cumulative(values: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Running total of `values` and its final sum.
+
+    The total is accumulated left to right like a plain Python loop, so a
+    NaN volume propagates into the total; the running column skips NaNs the
+    way Series.cumsum() does.
+    """
+    running = np.cumsum(values)
+    total = float(running[-1]) if len(running) else 0.0
+    if np.isnan(total):
+        running = pd.Series(values).cumsum().to_numpy()
+    return running, total
+
+
+def split_volume(df: pd.DataFrame, method: str = 'open_close') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Attribute each bar's volume to buyers and sellers.
+
+    Methods:
+        open_close: the whole bar's volume goes to buyers when Close >= Open,
+                    otherwise to sellers (the daily-bar default)
+        tick:       tick rule on consecutive closes; an unchanged close keeps
+                    the previous direction, the first bar uses Close vs Open
+        clv:        close location value; buyers get (Close - Low) / (High - Low)
+                    of the volume, split evenly when High == Low
+
+    Args:
+        df: DataFrame with Open, Close and Volume (plus High/Low for clv)
+        method: One of SPLIT_METHODS
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Buy and sell volume arrays
+    """
+    if method not in SPLIT_METHODS:
+        raise ValueError(f"Unknown volume split method: {method}")
+
+    open_, bad_open = _as_float(df['Open'])
+    close, bad_close = _as_float(df['Close'])
+    volume, bad_volume = _as_float(df['Volume'])
+    invalid = bad_open | bad_close | bad_volume
+
+    if method == 'open_close':
+        # A NaN change counts as a down bar, as in the original loop
+        buyers = (close - open_) >= 0
+        buy = np.where(buyers, volume, 0.0)
+        sell = np.where(buyers, 0.0, volume)
+    elif method == 'tick':
+        direction = np.sign(np.diff(close, prepend=np.nan))
+        if len(direction):
+            direction[0] = 1.0 if close[0] >= open_[0] else -1.0
+        direction[direction == 0] = np.nan
+        direction = pd.Series(direction).ffill().to_numpy()
+        buyers = direction > 0
+        buy = np.where(buyers, volume, 0.0)
+        sell = np.where(buyers, 0.0, volume)
+    else:
+        high, bad_high = _as_float(df['High'])
+        low, bad_low = _as_float(df['Low'])
+        invalid |= bad_high | bad_low
+        bar_range = high - low
+        with np.errstate(divide='ignore', invalid='ignore'):
+            buy_share = np.where(bar_range > 0, (close - low) / bar_range, 0.5)
+        buy_share = np.clip(buy_share, 0.0, 1.0)
+        buy = volume * buy_share
+        sell = volume - buy
+
+    # Rows with unparseable values contribute nothing, like the skipped rows of the old loop
+    buy[invalid] = 0.0
+    sell[invalid] = 0.0
+    return buy, sell
+
+
+def buyer_seller_ratio(df: pd.DataFrame, method: str = 'open_close',
+                       copy: bool = True) -> Tuple[pd.DataFrame, float]:
+    """
+    Vectorized buyer/seller volume analysis.
+
+    Adds Buy_Volume, Sell_Volume, Cum_Buy_Volume and Cum_Sell_Volume to a copy
+    of `df` and returns it together with the overall buy/sell volume ratio
+    (capped at 5.0 when there is no sell volume).
+
+    Args:
+        df: DataFrame with Open, Close and Volume columns
+        method: Volume split method, see split_volume()
+        copy: False adds the columns to `df` itself
+
+    Returns:
+        Tuple[pd.DataFrame, float]: The augmented frame and the ratio
+    """
+    if copy:
+        df = df.copy()
+    buy, sell = split_volume(df, method)
+    cum_buy, buy_total = _cumulative(buy)
+    cum_sell, sell_total = _cumulative(sell)
+
+    df['Buy_Volume'] = buy
+    df['Sell_Volume'] = sell
+    df['Cum_Buy_Volume'] = cum_buy
+    df['Cum_Sell_Volume'] = cum_sell
+
+    ratio = buy_total / sell_total if sell_total > 0 else 5.0
+    return df, ratio
@@ -1,25 +1,14 @@
-import os
-import pandas as pd
-import yfinance as yf
 import streamlit as st
-import re
-import datetime
 import traceback
+from stock_analytics.market_data import get_provider
+# Re-exported for existing callers; the Streamlit-free versions live in stock_analytics.history
+from stock_analytics.history import clean_ticker, resolve_date_range, get_store, load_stock_data_batch
+
+__all__ = ['clean_ticker', 'resolve_date_range', 'get_store', 'load_stock_data_batch', 'load_stock_data']
 
-def clean_ticker(ticker):
-    """Clean ticker symbol to handle various input formats"""
-    if isinstance(ticker, (list, tuple)):
-        ticker = ''.join([str(x) for x in ticker])
-    elif isinstance(ticker, str) and '(' in ticker and ')' in ticker:
-        matches = re.findall(r"['\"](w)['\"]+|\w+", ticker)
-        if matches:
-            ticker = ''.join(matches)
-    
-    ticker = re.sub(r'[^a-zA-Z0-9\.]', '', str(ticker))
-    return ticker.upper()
 
 def load_stock_data(ticker, start_date=None, end_date=None):
-    """Load stock data using yfinance"""
+    """Load stock data from the active market-data provider"""
     if not ticker:
         st.error("No ticker symbol provided")
         return None
@@ -34,69 +23,23 @@ def load_stock_data(ticker, start_date=None, end_date=None):
     
     st.write("Attempting to fetch data for tickers:", tickers_to_try)
 
-    # Handle dates
-    current_date = datetime.datetime.now(datetime.timezone.utc).date()
-    if start_date is None:
-        start_date = (pd.Timestamp.now() - pd.DateOffset(years=3)).date()
-    else:
-        try:
-            start_date = pd.to_datetime(start_date).date()
-        except Exception:
-            start_date = (pd.Timestamp.now() - pd.DateOffset(years=3)).date()
-    
-    if end_date is None:
-        end_date = current_date
-    else:
-        try:
-            end_date = pd.to_datetime(end_date).date()
-            if end_date > current_date:
-                end_date = current_date
-        except Exception:
-            end_date = current_date
-
-    # Check market hours
-    current_time_et = datetime.datetime.now(datetime.timezone.utc).astimezone(datetime.timezone(datetime.timedelta(hours=-5)))
-    is_market_open = (
-        current_time_et.weekday() < 5 and
-        current_time_et.replace(hour=9, minute=30) <= current_time_et <= current_time_et.replace(hour=16)
-    )
+    start_date, download_end_date = resolve_date_range(start_date, end_date)
 
-    # Adjust end date if market is open
-    download_end_date = (current_date - datetime.timedelta(days=1)) if is_market_open else end_date
+    store = get_store()
 
-    # Try yfinance with different ticker variants
+    # Try the provider with different ticker variants
     for ticker_variant in tickers_to_try:
         try:
-            # Format dates explicitly as strings
-            start_date_str = start_date.strftime('%Y-%m-%d')
-            end_date_str = (download_end_date + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
-            
-            st.write(f"Fetching {ticker_variant} data from {start_date_str} to {end_date_str}")
-            
-            data = yf.download(
-                ticker_variant,
-                start=start_date_str,
-                end=end_date_str,
-                progress=False,
-                auto_adjust=False  # Explicitly set auto_adjust to False for consistent data
-            )
-            
-            # Debug information
-            st.write(f"Data shape for {ticker_variant}:", data.shape)
-            if not data.empty:
-                st.write(f"First few rows for {ticker_variant}:")
-                st.write(data.head())
-                
-                # Ensure consistent timezone handling
-                data.index = data.index.tz_localize(None)
-                # Convert download_end_date to pandas Timestamp for comparison
-                end_date_ts = pd.Timestamp(download_end_date).normalize()
-                # Filter data using proper datetime comparison
-                data = data[data.index.normalize() <= end_date_ts]
-                if not data.empty:
-                    return data
-            else:
-                st.write(f"No data returned for {ticker_variant}")
+            # Serve from the local store, downloading only bars it does not have yet
+            try:
+                data = store.update(ticker_variant, start_date, download_end_date, _download_range)
+            except (OSError, ImportError, ValueError) as e:
+                st.write(f"Local data store unavailable ({str(e)}), downloading directly")
+                data = _download_range(ticker_variant, start_date, download_end_date)
+
+            if data is not None and not data.empty:
+                return data
+            st.write(f"No data returned for {ticker_variant}")
         except Exception as e:
             st.error(f"Error fetching {ticker_variant}:")
             st.error(f"Exception: {str(e)}")
@@ -105,4 +48,18 @@ def load_stock_data(ticker, start_date=None, end_date=None):
             continue
 
     st.error(f"Could not fetch data for {cleaned_ticker}")
-    return None
\ No newline at end of file
+    return None
+
+
+def _download_range(ticker_variant, start_date, end_date):
+    """Download daily bars for an inclusive date range from the active provider"""
+    st.write(f"Fetching {ticker_variant} data from {start_date} to {end_date}")
+
+    data = get_provider().history(ticker_variant, start_date, end_date)
+
+    # Debug information
+    st.write(f"Data shape for {ticker_variant}:", data.shape)
+    if not data.empty:
+        st.write(f"First few rows for {ticker_variant}:")
+        st.write(data.head())
+    return data
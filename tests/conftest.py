@@ -0,0 +1,34 @@
+"""Shared fixtures for the test suite; run with `pytest` from the repository root."""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# The benchmark scripts hold the reference copies of the original per-row code;
+# importing their helpers also makes the top-level modules importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from common import make_ohlcv  # noqa: E402
+
+
+@pytest.fixture
+def ohlcv():
+    """Factory for synthetic daily OHLCV frames, see benchmarks/common.py"""
+    return make_ohlcv
+
+
+@pytest.fixture
+def awkward_series():
+    """
+    Factory for float series with the cases the rolling kernels special-case:
+    runs of equal values, negative stretches, zeros and large magnitudes.
+    """
+    def make(n_rows, seed=0):
+        rng = np.random.default_rng(seed)
+        values = np.cumsum(rng.normal(0, 1, n_rows)) * 10.0 ** rng.integers(-3, 6)
+        for start in rng.integers(0, max(n_rows - 30, 1), size=max(n_rows // 100, 1)):
+            values[start:start + rng.integers(2, 30)] = values[start]
+        values[rng.integers(0, n_rows, size=max(n_rows // 50, 1))] = 0.0
+        return values - values.mean()
+    return make
@@ -0,0 +1,91 @@
+"""
+Reference copies of the original app.py code that no benchmark script keeps.
+
+The tests check the current implementations against these, next to the copies
+in benchmarks/bench_patterns.py, bench_signals.py and bench_rsi.py. Streamlit
+caching and the error printing are left out; the arithmetic is unchanged.
+"""
+import numpy as np
+
+from bench_rsi import legacy_rsi
+
+
+def legacy_add_indicators(df):
+    """Reference copy of the original add_indicators()"""
+    df_copy = df.copy()
+    close = df_copy['Close']
+    df_copy['RSI'] = legacy_rsi(close)
+    df_copy['SMA'] = close.rolling(window=9).mean()
+    df_copy['EMA_20'] = close.ewm(span=20, adjust=False).mean()
+    df_copy['EMA_50'] = close.ewm(span=50, adjust=False).mean()
+
+    fast_ema = close.ewm(span=12, adjust=False).mean()
+    slow_ema = close.ewm(span=26, adjust=False).mean()
+    macd_line = fast_ema - slow_ema
+    signal_line = macd_line.ewm(span=9, adjust=False).mean()
+    df_copy['MACD'], df_copy['MACD_Signal'], df_copy['MACD_Hist'] = macd_line, signal_line, macd_line - signal_line
+
+    sma = close.rolling(window=20).mean()
+    std = close.rolling(window=20).std()
+    df_copy['BB_Upper'] = (sma + (std * 2)).ffill().bfill()
+    df_copy['BB_Middle'] = sma.ffill().bfill()
+    df_copy['BB_Lower'] = (sma - (std * 2)).ffill().bfill()
+
+    low_min = df_copy['Low'].rolling(window=14).min()
+    high_max = df_copy['High'].rolling(window=14).max()
+    k = 100 * ((df_copy['Close'] - low_min) / (high_max - low_min))
+    df_copy['Stoch_K'], df_copy['Stoch_D'] = k, k.rolling(window=3).mean()
+    return df_copy.ffill().bfill()
+
+
+def legacy_buyer_seller_ratio(df):
+    """Reference copy of the original calculate_buyer_seller_ratio() row loop"""
+    df = df.copy()
+    buy_volume_sum = 0.0
+    sell_volume_sum = 0.0
+    df['Buy_Volume'] = 0.0
+    df['Sell_Volume'] = 0.0
+    for i in range(len(df)):
+        try:
+            open_val = float(df['Open'].iloc[i])
+            close_val = float(df['Close'].iloc[i])
+            volume = float(df['Volume'].iloc[i])
+            if close_val - open_val >= 0:
+                buy_volume_sum += volume
+                df.iloc[i, df.columns.get_loc('Buy_Volume')] = volume
+            else:
+                sell_volume_sum += volume
+                df.iloc[i, df.columns.get_loc('Sell_Volume')] = volume
+        except (ValueError, TypeError):
+            continue
+    ratio = buy_volume_sum / sell_volume_sum if sell_volume_sum > 0 else 5.0
+    df['Cum_Buy_Volume'] = df['Buy_Volume'].cumsum()
+    df['Cum_Sell_Volume'] = df['Sell_Volume'].cumsum()
+    return df, ratio
+
+
+def legacy_sequences(scaled_data, time_steps):
+    """Reference copy of the window loop in the original prepare_data()"""
+    X, y = [], []
+    for i in range(len(scaled_data) - time_steps):
+        X.append(scaled_data[i:i + time_steps])
+        y.append(scaled_data[i + time_steps, 0])
+    return np.array(X), np.array(y)
+
+
+def legacy_predict_future(model, last_sequence, scaler, n_steps):
+    """Reference copy of the original per-day predict_future() loop"""
+    future_sequence = np.copy(last_sequence)
+    future_predictions = []
+    for _ in range(n_steps):
+        current_sequence = future_sequence.reshape(1, future_sequence.shape[0], future_sequence.shape[1])
+        next_pred = model.predict(current_sequence, verbose=0)[0][0]
+        future_predictions.append(next_pred)
+        new_row = np.zeros(future_sequence.shape[1])
+        new_row[0] = next_pred
+        future_sequence = np.vstack((future_sequence[1:], new_row))
+
+    future_predictions = np.array(future_predictions).reshape(-1, 1)
+    dummy_array = np.zeros((len(future_predictions), scaler.scale_.shape[0]))
+    dummy_array[:, 0] = future_predictions.flatten()
+    return scaler.inverse_transform(dummy_array)[:, 0].reshape(-1, 1)
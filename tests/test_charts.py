@@ -0,0 +1,17 @@
+"""Chart problems reach the caller instead of only the console."""
+from stock_analytics.charts import plot_prediction_analysis
+from stock_analytics.indicators import add_indicators
+
+
+def test_prediction_chart_notifies_missing_bands(ohlcv):
+    df = add_indicators(ohlcv(100)).drop(columns=['BB_Lower'])
+    notices = []
+    plot_prediction_analysis(df, None, 'T', notify=lambda level, message: notices.append((level, message)))
+    assert notices and all(level == 'error' for level, _ in notices)
+    assert "Bollinger Lower Band" in notices[0][1]
+
+
+def test_prediction_chart_prints_by_default(ohlcv, capsys):
+    df = add_indicators(ohlcv(100)).drop(columns=['BB_Lower'])
+    plot_prediction_analysis(df, None, 'T')
+    assert "Bollinger Lower Band" in capsys.readouterr().out
@@ -0,0 +1,72 @@
+"""Batched forecasts against the original per-day loop, and the compiled Keras step."""
+import numpy as np
+import pytest
+from sklearn.preprocessing import MinMaxScaler
+
+from legacy import legacy_predict_future
+from stock_analytics.forecasting import COMPILED_STEP_ENV, forecast_batch, forecast_scaled
+
+TIME_STEPS, N_FEATURES = 10, 4
+
+
+class LinearModel:
+    """Stand-in for a trained model: a fixed weighted sum of each window"""
+
+    def __init__(self, seed=0):
+        self.weights = np.random.default_rng(seed).normal(0, 0.1, (TIME_STEPS, N_FEATURES))
+        self.calls = 0
+
+    def predict(self, windows, verbose=0):
+        self.calls += 1
+        return np.array([[np.sum(window * self.weights) + 0.5] for window in windows])
+
+
+@pytest.fixture
+def windows():
+    return np.random.default_rng(1).random((6, TIME_STEPS, N_FEATURES))
+
+
+@pytest.fixture
+def scalers():
+    rng = np.random.default_rng(2)
+    return [MinMaxScaler().fit(rng.normal(100 * (i + 1), 10, (50, N_FEATURES))) for i in range(6)]
+
+
+def test_single_window_matches_original(windows, scalers):
+    model = LinearModel()
+    expected = legacy_predict_future(model, windows[0], scalers[0], 30)
+    np.testing.assert_array_equal(forecast_batch(model, windows[0], scalers[0], 30), expected.T)
+
+
+def test_batch_matches_original_per_series(windows, scalers):
+    model = LinearModel()
+    result = forecast_batch(model, windows, scalers, 30)
+    for i, (window, scaler) in enumerate(zip(windows, scalers)):
+        np.testing.assert_array_equal(result[i], legacy_predict_future(model, window, scaler, 30).ravel())
+
+
+def test_one_model_call_per_step(windows):
+    model = LinearModel()
+    forecast_scaled(model, windows, 30)
+    assert model.calls == 30
+
+
+def test_windows_are_not_modified(windows):
+    before = windows.copy()
+    forecast_scaled(LinearModel(), windows, 30)
+    np.testing.assert_array_equal(windows, before)
+
+
+def test_compiled_step_matches_predict(monkeypatch, windows):
+    pytest.importorskip('tensorflow')
+    from stock_analytics.lstm_models import build_live_model
+
+    # Step functions are cached per model, so each path gets its own copy of the weights
+    monkeypatch.setenv(COMPILED_STEP_ENV, '0')
+    predict_model = build_live_model(TIME_STEPS, N_FEATURES)
+    expected = forecast_scaled(predict_model, windows.astype(np.float32), 5)
+
+    monkeypatch.delenv(COMPILED_STEP_ENV)
+    compiled_model = build_live_model(TIME_STEPS, N_FEATURES)
+    compiled_model.set_weights(predict_model.get_weights())
+    np.testing.assert_array_equal(forecast_scaled(compiled_model, windows.astype(np.float32), 5), expected)
@@ -0,0 +1,104 @@
+"""add_indicators(), the RSI batch, the indicator graph and the panel against the original code."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench_rsi import legacy_rsi
+from legacy import legacy_add_indicators
+from stock_analytics.indicator_graph import indicator_frame, indicator_graph
+from stock_analytics.indicators import INDICATOR_COLUMNS, add_indicators, calculate_rsi, calculate_rsi_batch
+from stock_analytics.panel_indicators import panel_frames, panel_indicators
+
+# The original RSI assigns floats into integer Series, which pandas warns about
+pytestmark = pytest.mark.filterwarnings('ignore::FutureWarning')
+
+
+def with_gaps(df):
+    """A copy with missing closes and a flat stretch, which the fills and RSI special-case"""
+    df = df.copy()
+    df.iloc[40:43, df.columns.get_loc('Close')] = np.nan
+    df.iloc[100:120, df.columns.get_loc('Close')] = df['Close'].iloc[100]
+    return df
+
+
+@pytest.mark.parametrize('n_rows', [1, 5, 30, 500])
+def test_add_indicators_matches_original(ohlcv, n_rows):
+    df = ohlcv(n_rows)
+    pd.testing.assert_frame_equal(add_indicators(df), legacy_add_indicators(df))
+
+
+def test_add_indicators_with_gaps_matches_original(ohlcv):
+    df = with_gaps(ohlcv(300))
+    pd.testing.assert_frame_equal(add_indicators(df), legacy_add_indicators(df))
+
+
+def test_add_indicators_leaves_input_alone(ohlcv):
+    df = ohlcv(100)
+    before = df.copy()
+    add_indicators(df)
+    pd.testing.assert_frame_equal(df, before)
+
+
+def test_calculate_rsi_matches_original(ohlcv):
+    close = with_gaps(ohlcv(300))['Close']
+    pd.testing.assert_series_equal(calculate_rsi(close), legacy_rsi(close))
+
+
+def test_calculate_rsi_batch_matches_original(ohlcv):
+    closes = pd.DataFrame({f'T{i}': with_gaps(ohlcv(300, seed=i))['Close'].to_numpy() for i in range(5)})
+    result = calculate_rsi_batch(closes)
+    for col in closes.columns:
+        np.testing.assert_array_equal(result[col].to_numpy(), legacy_rsi(closes[col]).to_numpy())
+
+
+def test_indicator_frame_matches_add_indicators(ohlcv):
+    df = with_gaps(ohlcv(300))
+    expected = add_indicators(df)
+    pd.testing.assert_frame_equal(indicator_frame(df), expected)
+
+    subset = indicator_frame(df, ['RSI', 'MACD_Hist'])
+    assert list(subset.columns) == list(df.columns) + ['RSI', 'MACD_Hist']
+    pd.testing.assert_frame_equal(subset[['RSI', 'MACD_Hist']], expected[['RSI', 'MACD_Hist']])
+
+
+def test_indicator_graph_is_shared_per_frame_version(ohlcv):
+    df = ohlcv(100)
+    assert indicator_graph(df) is indicator_graph(df)
+    assert indicator_graph(df) is not indicator_graph(df.copy())
+    longer = ohlcv(101)
+    assert indicator_graph(longer) is not indicator_graph(longer.iloc[:100])
+
+
+@pytest.fixture
+def ragged_frames(ohlcv):
+    """Histories with different listing dates and missing bars in one universe"""
+    rng = np.random.default_rng(0)
+    frames = {}
+    for i in range(8):
+        df = ohlcv(400, seed=i).iloc[rng.integers(0, 200):]
+        frames[f'T{i}'] = df.drop(df.index[rng.integers(0, len(df), size=5)])
+    # NaN marks a missing bar in a panel, so flat stretches are the only awkward prices here
+    frames['T0'] = frames['T0'].assign(Close=frames['T0']['Close'].mask(frames['T0'].index.day < 8, 100.0))
+    return frames
+
+
+def test_panel_indicators_match_add_indicators(ragged_frames):
+    panels = panel_frames(ragged_frames)
+    result = panel_indicators(panels['Close'], panels['High'], panels['Low'])
+    for ticker, df in ragged_frames.items():
+        expected = add_indicators(df)
+        for col in INDICATOR_COLUMNS:
+            np.testing.assert_array_equal(result[col][ticker].loc[df.index].to_numpy(), expected[col].to_numpy(),
+                                          err_msg=f'{ticker} {col}')
+
+
+def test_panel_indicators_leave_missing_bars_empty(ragged_frames):
+    panels = panel_frames(ragged_frames)
+    result = panel_indicators(panels['Close'], panels['High'], panels['Low'], names=['SMA'])
+    assert list(result) == ['SMA']
+    assert result['SMA'].isna().equals(panels['Close'].isna())
+
+
+def test_panel_indicators_reject_mismatched_shapes():
+    with pytest.raises(ValueError):
+        panel_indicators(np.zeros((5, 2)), np.zeros((5, 3)))
@@ -0,0 +1,127 @@
+"""OHLCVStore against a fake data source: coverage, edge overlap and revised history."""
+import datetime
+import json
+
+import pandas as pd
+import pytest
+
+from stock_analytics.ohlcv_store import OHLCVStore
+
+
+class FakeSource:
+    """Serves slices of one history and records the requested ranges"""
+
+    def __init__(self, bars):
+        self.bars = bars
+        self.calls = []
+        self.fail = False
+
+    def __call__(self, ticker, start, end):
+        self.calls.append((start, end))
+        if self.fail:
+            return None
+        dates = self.bars.index.normalize()
+        return self.bars[(dates >= pd.Timestamp(start)) & (dates <= pd.Timestamp(end))]
+
+
+def day(n):
+    """Date of bar n of the fake history"""
+    return datetime.date(2000, 1, 3) + datetime.timedelta(days=n)
+
+
+@pytest.fixture
+def source(ohlcv):
+    return FakeSource(ohlcv(200))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return OHLCVStore(str(tmp_path))
+
+
+def assert_bars(result, source, first, last):
+    pd.testing.assert_frame_equal(result, source.bars.iloc[first:last + 1], check_freq=False)
+
+
+def test_first_load_then_cached(store, source):
+    assert_bars(store.update('T', day(50), day(100), source), source, 50, 100)
+    assert_bars(store.update('T', day(60), day(90), source), source, 60, 90)
+    assert source.calls == [(day(50), day(100))]
+    assert store.missing_ranges('T', day(50), day(100)) == []
+
+
+def test_append_and_backfill_overlap_the_stored_edges(store, source):
+    store.update('T', day(50), day(100), source)
+    assert store.missing_ranges('T', day(40), day(120)) == [(day(40), day(50)), (day(100), day(120))]
+    assert_bars(store.update('T', day(40), day(120), source), source, 40, 120)
+    assert source.calls[1:] == [(day(40), day(50)), (day(100), day(120))]
+    assert store.coverage('T') == (day(40), day(120))
+
+
+def test_revised_history_is_reloaded(store, source):
+    store.update('T', day(50), day(100), source)
+    # A 2:1 split adjusts every earlier price at the source
+    split = source.bars.copy()
+    split.iloc[:150, :5] /= 2
+    source.bars = split
+    assert_bars(store.update('T', day(50), day(120), source), source, 50, 120)
+    assert source.calls[-1] == (day(50), day(120))
+    assert_bars(store.read('T')[0], source, 50, 120)
+
+
+def test_revised_history_found_by_backfill(store, source):
+    store.update('T', day(50), day(100), source)
+    source.bars = source.bars * 1.01
+    assert_bars(store.update('T', day(40), day(100), source), source, 40, 100)
+    assert source.calls[-1] == (day(40), day(100))
+
+
+def test_volume_revision_is_not_a_reload(store, source):
+    store.update('T', day(50), day(100), source)
+    revised = source.bars.copy()
+    revised.iloc[100, revised.columns.get_loc('Volume')] += 1
+    source.bars = revised
+    assert_bars(store.update('T', day(50), day(110), source), source, 50, 110)
+    assert source.calls[1:] == [(day(100), day(110))]
+
+
+def test_failed_reload_keeps_stored_bars(store, source):
+    store.update('T', day(50), day(100), source)
+    stored = source.bars
+    source.bars = stored * 2
+
+    def fetch(ticker, start, end):
+        # The tail comes back revised, then the full download fails
+        source.fail = bool(source.calls)
+        return source(ticker, start, end)
+    source.calls = []
+    pd.testing.assert_frame_equal(store.update('T', day(50), day(110), fetch), stored.iloc[50:101],
+                                  check_freq=False)
+    assert store.coverage('T') == (day(50), day(100))
+
+
+@pytest.mark.parametrize('answer', ['failed', 'empty'])
+def test_unanswered_tail_stays_uncovered(store, source, answer):
+    store.update('T', day(50), day(100), source)
+    if answer == 'failed':
+        source.fail = True
+    else:
+        source.bars = source.bars.iloc[:0]
+    for _ in range(2):
+        assert store.update('T', day(50), day(110), source).index[-1].date() == day(100)
+    # The tail is requested again on the next refresh
+    assert source.calls[1:] == [(day(100), day(110))] * 2
+    assert store.coverage('T') == (day(50), day(100))
+
+
+def test_sidecar_without_edge_bars(store, source):
+    store.update('T', day(50), day(100), source)
+    path = store._base_path('T') + '.json'
+    with open(path) as f:
+        meta = json.load(f)
+    with open(path, 'w') as f:
+        json.dump({key: meta[key] for key in ('start', 'end', 'rows')}, f)
+    assert store.missing_ranges('T', day(40), day(120)) == [(day(40), day(49)), (day(101), day(120))]
+    # update() reads the edges from the stored bars themselves
+    assert_bars(store.update('T', day(40), day(120), source), source, 40, 120)
+    assert source.calls[1:] == [(day(40), day(50)), (day(100), day(120))]
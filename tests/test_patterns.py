@@ -0,0 +1,149 @@
+"""Candlestick patterns against the original per-row detector, and the incremental cache."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench_patterns import legacy_detect_patterns
+from stock_analytics.candlestick_patterns import IncrementalPatternDetector, PATTERN_COLUMNS, detect_patterns
+
+
+@pytest.fixture(params=[False, True], ids=['copy', 'cow'])
+def copy_on_write(request):
+    """Run with pandas copy-on-write off (the default) and on (as in the app)"""
+    with pd.option_context('mode.copy_on_write', request.param):
+        yield request.param
+
+
+@pytest.fixture
+def full_passes(monkeypatch):
+    """Count the refreshes that classified the whole history"""
+    calls = []
+    extend = IncrementalPatternDetector._extend
+
+    def recording(cached, index, ohlc):
+        codes = extend(cached, index, ohlc)
+        calls.append(codes is None)
+        return codes
+    monkeypatch.setattr(IncrementalPatternDetector, '_extend', staticmethod(recording))
+    return calls
+
+
+def assert_patterns_equal(result, expected):
+    pd.testing.assert_frame_equal(result, expected)
+    assert result['Pattern'].notna().any()
+
+
+@pytest.mark.parametrize('n_rows', [1, 3, 4, 2_000])
+def test_detect_patterns_matches_original(ohlcv, n_rows):
+    df = ohlcv(n_rows)
+    result, legacy = detect_patterns(df), legacy_detect_patterns(df)
+    for col in PATTERN_COLUMNS:
+        assert result[col].equals(legacy[col])
+
+
+def test_detect_patterns_with_gaps_matches_original(ohlcv):
+    df = ohlcv(2_000)
+    df.iloc[100:110, df.columns.get_loc('Close')] = np.nan
+    df.iloc[500:520, :4] = 100.0
+    result, legacy = detect_patterns(df), legacy_detect_patterns(df)
+    for col in PATTERN_COLUMNS:
+        assert result[col].equals(legacy[col])
+
+
+def test_appended_bars_match_full_pass(ohlcv, copy_on_write, full_passes):
+    df = ohlcv(600)
+    cache = IncrementalPatternDetector()
+    for end in [2, 3, 4, 5, 100, 101, 350, 600]:
+        pd.testing.assert_frame_equal(cache.update('T', df.iloc[:end]), detect_patterns(df.iloc[:end]))
+    assert not any(full_passes)
+
+
+def test_append_method_matches_full_pass(ohlcv, copy_on_write, full_passes):
+    df = ohlcv(600)
+    cache = IncrementalPatternDetector()
+    cache.update('T', df.iloc[:500])
+    # Bars from the last cached timestamp on replace it, as an intraday refresh does
+    assert_patterns_equal(cache.append('T', df.iloc[499:550]), detect_patterns(df.iloc[:550]))
+    assert_patterns_equal(cache.append('T', df.iloc[550:]), detect_patterns(df))
+    assert_patterns_equal(cache.append('T', df.iloc[:0]), detect_patterns(df))
+    assert not any(full_passes)
+
+
+def test_revised_last_bar_is_reclassified(ohlcv, copy_on_write, full_passes):
+    df = ohlcv(600)
+    cache = IncrementalPatternDetector()
+    cache.update('T', df.iloc[:400])
+    # Turn the open session's candle into a strong bullish bar
+    intraday = df.iloc[:400].copy()
+    low, high = intraday['Low'].iloc[-1], intraday['High'].iloc[-1]
+    intraday.iloc[-1, :4] = [low, high, low, high]
+    assert_patterns_equal(cache.update('T', intraday), detect_patterns(intraday))
+    assert_patterns_equal(cache.update('T', df), detect_patterns(df))
+    assert full_passes == [False, False]
+
+
+def test_revised_older_bar_falls_back_to_full_pass(ohlcv, copy_on_write, full_passes):
+    df = ohlcv(600)
+    cache = IncrementalPatternDetector()
+    cache.update('T', df.iloc[:400])
+    # A split adjustment rescales all earlier prices
+    adjusted = df.copy()
+    adjusted.iloc[:300, :4] /= 2
+    assert_patterns_equal(cache.update('T', adjusted), detect_patterns(adjusted))
+    assert full_passes == [True]
+
+
+def test_moved_window_start(ohlcv, copy_on_write, full_passes):
+    df = ohlcv(600)
+    cache = IncrementalPatternDetector()
+    cache.update('T', df.iloc[:400])
+    # Rolling forward reuses the cache; a start before the cached one does not
+    assert_patterns_equal(cache.update('T', df.iloc[100:450]), detect_patterns(df.iloc[100:450]))
+    assert_patterns_equal(cache.update('T', df.iloc[50:500]), detect_patterns(df.iloc[50:500]))
+    assert full_passes == [False, True]
+
+
+def test_other_columns_come_from_the_new_history(ohlcv, copy_on_write):
+    df = ohlcv(300)
+    cache = IncrementalPatternDetector()
+    cache.update('T', df.iloc[:200])
+    df = df.assign(Note=np.where(np.arange(300) % 2, 'odd', None), Volume=df['Volume'] + 1)
+    pd.testing.assert_frame_equal(cache.update('T', df), detect_patterns(df))
+
+
+def test_string_prices(ohlcv, copy_on_write):
+    df = ohlcv(300)
+    text = df.astype({col: object for col in ['Open', 'High', 'Low', 'Close']})
+    text.iloc[10, text.columns.get_loc('Close')] = 'n/a'
+    numeric = df.copy()
+    numeric.iloc[10, numeric.columns.get_loc('Close')] = np.nan
+    cache = IncrementalPatternDetector()
+    cache.update('T', text.iloc[:200])
+    result = cache.update('T', text)
+    pd.testing.assert_frame_equal(result, detect_patterns(text))
+    for col in PATTERN_COLUMNS:
+        assert result[col].equals(detect_patterns(numeric)[col])
+
+
+def test_returned_frames_are_independent(ohlcv, copy_on_write):
+    df = ohlcv(300)
+    cache = IncrementalPatternDetector()
+    first = cache.update('T', df.iloc[:200])
+    first.iloc[:, :4] = 0.0
+    first['Pattern'] = 'edited'
+    pd.testing.assert_frame_equal(cache.get('T'), detect_patterns(df.iloc[:200]))
+    pd.testing.assert_frame_equal(cache.update('T', df), detect_patterns(df))
+
+
+def test_least_recently_updated_tickers_are_evicted(ohlcv, full_passes):
+    cache = IncrementalPatternDetector(max_tickers=2)
+    frames = {ticker: ohlcv(100, seed=i) for i, ticker in enumerate('ABC')}
+    for ticker in 'ABC':
+        cache.update(ticker, frames[ticker].iloc[:90])
+    assert cache.get('A') is None
+    cache.update('B', frames['B'])
+    cache.update('D', frames['A'])
+    assert cache.get('C') is None and cache.get('B') is not None
+    cache.clear()
+    assert cache.get('B') is None
+    assert full_passes == [False]
@@ -0,0 +1,114 @@
+"""The rolling kernels and the running indicators against pandas, bit for bit."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_analytics import rolling
+from stock_analytics.streaming_indicators import EWMean, RollingExtreme, RollingMean, RollingStd
+
+WINDOWS = [2, 3, 9, 14, 20]
+
+
+@pytest.fixture
+def stepped(monkeypatch):
+    """Run the row-stepped kernels on narrow arrays, so the tests stay fast"""
+    monkeypatch.setattr(rolling, 'STEPPED_MIN_COLUMNS', 4)
+
+
+@pytest.fixture
+def panel(awkward_series):
+    return np.column_stack([awkward_series(400, seed=seed) for seed in range(6)])
+
+
+def test_panel_takes_the_stepped_path(stepped, panel):
+    assert rolling._steppable(panel)
+
+
+@pytest.mark.parametrize('window', WINDOWS)
+def test_rolling_mean(stepped, panel, window):
+    expected = pd.DataFrame(panel).rolling(window).mean().to_numpy()
+    np.testing.assert_array_equal(rolling.rolling_mean(panel, window), expected)
+
+
+@pytest.mark.parametrize('window', WINDOWS)
+def test_rolling_mean_min_periods(stepped, panel, window):
+    expected = pd.DataFrame(panel).rolling(window, min_periods=1).mean().to_numpy()
+    np.testing.assert_array_equal(rolling.rolling_mean(panel, window, min_periods=1), expected)
+
+
+@pytest.mark.parametrize('window', WINDOWS)
+def test_rolling_std(stepped, panel, window):
+    expected = pd.DataFrame(panel).rolling(window).std().to_numpy()
+    np.testing.assert_array_equal(rolling.rolling_std(panel, window), expected)
+
+
+@pytest.mark.parametrize('window', WINDOWS)
+def test_rolling_extremes(stepped, panel, window):
+    frame = pd.DataFrame(panel).rolling(window)
+    np.testing.assert_array_equal(rolling.rolling_max(panel, window), frame.max().to_numpy())
+    np.testing.assert_array_equal(rolling.rolling_min(panel, window), frame.min().to_numpy())
+
+
+@pytest.mark.parametrize('span', [9, 12, 20, 26, 50])
+def test_ewm_mean(stepped, panel, span):
+    expected = pd.DataFrame(panel).ewm(span=span, adjust=False).mean().to_numpy()
+    np.testing.assert_array_equal(rolling.ewm_mean(panel, span), expected)
+
+
+def test_trailing_padding_leaves_real_rows_exact(stepped, panel):
+    padded = panel.copy()
+    lengths = [400, 390, 300, 250, 399, 120]
+    for col, length in enumerate(lengths):
+        padded[length:, col] = np.nan
+    assert rolling._steppable(padded)
+
+    result = rolling.rolling_mean(padded, 20)
+    for col, length in enumerate(lengths):
+        expected = pd.Series(panel[:length, col]).rolling(20).mean().to_numpy()
+        np.testing.assert_array_equal(result[:length, col], expected)
+
+
+def test_nan_inside_a_column_falls_back_to_pandas(stepped, panel):
+    gapped = panel.copy()
+    gapped[50:55, 2] = np.nan
+    assert not rolling._steppable(gapped)
+    np.testing.assert_array_equal(rolling.rolling_std(gapped, 20),
+                                  pd.DataFrame(gapped).rolling(20).std().to_numpy())
+
+
+def running(indicator, values):
+    return np.array([indicator.update(value) for value in values.tolist()])
+
+
+@pytest.fixture
+def gapped_series(awkward_series):
+    values = awkward_series(600, seed=3)
+    values[[40, 41, 42, 300, 301, 450]] = np.nan
+    return values
+
+
+@pytest.mark.parametrize('window', WINDOWS)
+@pytest.mark.parametrize('min_periods', [None, 1])
+def test_running_mean(gapped_series, window, min_periods):
+    expected = pd.Series(gapped_series).rolling(window, min_periods=min_periods).mean().to_numpy()
+    np.testing.assert_array_equal(running(RollingMean(window, min_periods), gapped_series), expected)
+
+
+@pytest.mark.parametrize('window', WINDOWS)
+def test_running_std(gapped_series, window):
+    expected = pd.Series(gapped_series).rolling(window).std().to_numpy()
+    np.testing.assert_array_equal(running(RollingStd(window), gapped_series), expected)
+
+
+@pytest.mark.parametrize('window', WINDOWS)
+def test_running_extremes(gapped_series, window):
+    series = pd.Series(gapped_series).rolling(window)
+    np.testing.assert_array_equal(running(RollingExtreme(window), gapped_series), series.max().to_numpy())
+    np.testing.assert_array_equal(running(RollingExtreme(window, lowest=True), gapped_series),
+                                  series.min().to_numpy())
+
+
+@pytest.mark.parametrize('span', [9, 12, 20, 26, 50])
+def test_running_ewm_mean(gapped_series, span):
+    expected = pd.Series(gapped_series).ewm(span=span, adjust=False).mean().to_numpy()
+    np.testing.assert_array_equal(running(EWMean(span), gapped_series), expected)
@@ -0,0 +1,54 @@
+"""Strided LSTM windows against the original append-in-a-loop builder."""
+import numpy as np
+import pytest
+
+from legacy import legacy_sequences
+from stock_analytics.sequences import iter_sequence_batches, make_sequences
+
+
+@pytest.fixture
+def scaled():
+    return np.random.default_rng(0).random((200, 4))
+
+
+@pytest.mark.parametrize('time_steps', [1, 10, 60, 199])
+def test_matches_original(scaled, time_steps):
+    X, y = make_sequences(scaled, time_steps)
+    expected_X, expected_y = legacy_sequences(scaled, time_steps)
+    np.testing.assert_array_equal(X, expected_X)
+    np.testing.assert_array_equal(y, expected_y)
+
+
+def test_windows_are_read_only_views(scaled):
+    X, _ = make_sequences(scaled, 10)
+    assert np.shares_memory(X, scaled) and not X.flags.writeable
+
+
+@pytest.mark.parametrize('time_steps', [200, 250])
+def test_too_short_history(scaled, time_steps):
+    X, y = make_sequences(scaled, time_steps)
+    assert X.shape == (0, time_steps, 4) and y.shape == (0,)
+
+
+def test_one_dimensional_data_and_target_column(scaled):
+    X, y = make_sequences(scaled[:, 2], 10)
+    expected_X, expected_y = legacy_sequences(scaled[:, 2:3], 10)
+    np.testing.assert_array_equal(X, expected_X)
+    np.testing.assert_array_equal(y, expected_y)
+    np.testing.assert_array_equal(make_sequences(scaled, 10, target_col=3)[1], scaled[10:, 3])
+
+
+def test_dtype(scaled):
+    X, y = make_sequences(scaled, 10, dtype=np.float32)
+    assert X.dtype == y.dtype == np.float32
+    np.testing.assert_array_equal(X, legacy_sequences(scaled.astype(np.float32), 10)[0])
+
+
+@pytest.mark.parametrize('batch_size', [1, 32, 190, 500])
+def test_batches_cover_every_window(scaled, batch_size):
+    batches = list(iter_sequence_batches(scaled, 10, batch_size))
+    expected_X, expected_y = legacy_sequences(scaled, 10)
+    assert all(len(y) <= batch_size for _, y in batches)
+    assert all(X.flags.c_contiguous for X, _ in batches)
+    np.testing.assert_array_equal(np.concatenate([X for X, _ in batches]), expected_X)
+    np.testing.assert_array_equal(np.concatenate([y for _, y in batches]), expected_y)
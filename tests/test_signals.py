@@ -0,0 +1,44 @@
+"""Columnar signal generation against the original iloc-based loop."""
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench_signals import add_test_indicators, legacy_generate_signals
+from stock_analytics.indicators import add_indicators
+from stock_analytics.trading_signals import explain_signal, generate_signals
+
+
+def legacy_signals(df):
+    """The original loop prints a line per failed row; keep the test output clean"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return legacy_generate_signals(df)
+
+
+@pytest.mark.parametrize('n_rows', [1, 5, 6, 756])
+def test_matches_original(ohlcv, n_rows):
+    df = add_test_indicators(ohlcv(n_rows))
+    pd.testing.assert_frame_equal(generate_signals(df, reason_rows=None), legacy_signals(df))
+
+
+def test_app_indicators_match_original(ohlcv):
+    df = add_indicators(ohlcv(756))
+    pd.testing.assert_frame_equal(generate_signals(df, reason_rows=None), legacy_signals(df))
+
+
+def test_missing_indicator_columns_match_original(ohlcv):
+    df = add_test_indicators(ohlcv(300)).drop(columns=['MACD', 'MACD_Signal'])
+    df.iloc[50:60, df.columns.get_loc('RSI')] = np.nan
+    pd.testing.assert_frame_equal(generate_signals(df, reason_rows=None), legacy_signals(df))
+
+
+def test_reasons_on_demand(ohlcv):
+    df = add_test_indicators(ohlcv(300))
+    expected = legacy_signals(df)
+    latest = generate_signals(df)
+    pd.testing.assert_frame_equal(latest[['Signal', 'Confidence']], expected[['Signal', 'Confidence']])
+    assert latest['Reasoning'].iloc[-1] == expected['Reasoning'].iloc[-1]
+    assert latest['Reasoning'].iloc[100] is None
+    assert explain_signal(df, 100) == expected['Reasoning'].iloc[100]
@@ -0,0 +1,125 @@
+"""IncrementalIndicators against a full add_indicators() pass, refresh by refresh."""
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_analytics.indicators import add_indicators
+from stock_analytics.lstm_models import live_window_start
+from stock_analytics.streaming_indicators import IncrementalIndicators, IndicatorEngine
+
+
+@pytest.fixture(params=[False, True], ids=['copy', 'cow'])
+def copy_on_write(request):
+    """Run with pandas copy-on-write off (the default) and on (as in the app)"""
+    with pd.option_context('mode.copy_on_write', request.param):
+        yield request.param
+
+
+@pytest.fixture
+def extensions(monkeypatch):
+    """Record whether each refresh extended the cache (True) or was replayed (False)"""
+    calls = []
+    extend = IncrementalIndicators._extend
+
+    def recording(self, cached, df):
+        entry = extend(self, cached, df)
+        calls.append(entry is not None)
+        return entry
+    monkeypatch.setattr(IncrementalIndicators, '_extend', recording)
+    return calls
+
+
+def revise(df, row, factor=1.01):
+    """A copy of `df` with the prices of one bar changed"""
+    df = df.copy()
+    for col in ['Open', 'High', 'Low', 'Close']:
+        df.iloc[row, df.columns.get_loc(col)] *= factor
+    return df
+
+
+def test_appended_bars_match_full_pass(ohlcv, copy_on_write, extensions):
+    df = ohlcv(120)
+    cache = IncrementalIndicators()
+    # Starting from a few bars also covers the backward fill settling as columns get values
+    for end in [3, 4, 10, 30, 31, 60, 120]:
+        pd.testing.assert_frame_equal(cache.update('T', df.iloc[:end]), add_indicators(df.iloc[:end]))
+    assert all(extensions)
+
+
+def test_revised_last_bar_is_refolded(ohlcv, copy_on_write, extensions):
+    df = ohlcv(100)
+    cache = IncrementalIndicators()
+    cache.update('T', df.iloc[:80])
+    # The open session's bar changes between refreshes, then the next bar arrives
+    intraday = pd.concat([df.iloc[:79], revise(df, 79).iloc[79:80]])
+    pd.testing.assert_frame_equal(cache.update('T', intraday), add_indicators(intraday))
+    pd.testing.assert_frame_equal(cache.update('T', df), add_indicators(df))
+    assert extensions == [True, True]
+
+
+def test_revised_older_bar_is_replayed(ohlcv, copy_on_write, extensions):
+    df = ohlcv(100)
+    cache = IncrementalIndicators()
+    cache.update('T', df.iloc[:80])
+    revised = revise(df, 40)
+    pd.testing.assert_frame_equal(cache.update('T', revised), add_indicators(revised))
+    assert extensions == [False]
+
+
+def test_moved_window_start_is_replayed(ohlcv, copy_on_write, extensions):
+    df = ohlcv(100)
+    cache = IncrementalIndicators()
+    cache.update('T', df.iloc[:80])
+    pd.testing.assert_frame_equal(cache.update('T', df.iloc[20:]), add_indicators(df.iloc[20:]))
+    pd.testing.assert_frame_equal(cache.update('T', df.iloc[20:90]), add_indicators(df.iloc[20:90]))
+    assert extensions == [False, False]
+
+
+def test_live_window_refreshes_stay_incremental(ohlcv, copy_on_write, extensions):
+    df = ohlcv(400)
+    cache = IncrementalIndicators()
+    starts = set()
+    for now in df.index[200:260]:
+        start = live_window_start(now.to_pydatetime() + datetime.timedelta(hours=16))
+        window = df.loc[start:now]
+        starts.add(start)
+        pd.testing.assert_frame_equal(cache.update('T', window), add_indicators(window))
+    # Only the refreshes on which the start moved to the next month were replayed
+    assert extensions.count(False) == len(starts) - 1
+
+
+def test_returned_frames_are_independent(ohlcv, copy_on_write):
+    df = ohlcv(60)
+    cache = IncrementalIndicators()
+    first = cache.update('T', df.iloc[:50])
+    first.iloc[:, :] = 0.0
+    pd.testing.assert_frame_equal(cache.update('T', df), add_indicators(df))
+
+
+def test_tickers_and_clear(ohlcv, extensions):
+    cache = IncrementalIndicators()
+    a, b = ohlcv(50, seed=1), ohlcv(50, seed=2)
+    cache.update('A', a.iloc[:40])
+    cache.update('B', b.iloc[:40])
+    cache.clear('A')
+    pd.testing.assert_frame_equal(cache.update('A', a), add_indicators(a))
+    pd.testing.assert_frame_equal(cache.update('B', b), add_indicators(b))
+    assert extensions == [True]
+
+
+def test_frames_without_prices_fall_through(ohlcv):
+    cache = IncrementalIndicators()
+    empty = ohlcv(10).iloc[:0]
+    pd.testing.assert_frame_equal(cache.update('T', empty), add_indicators(empty))
+    no_high = ohlcv(10).drop(columns='High')
+    cache.update('T', no_high)
+    assert cache._cache == {}
+
+
+def test_engine_matches_add_indicators(ohlcv):
+    df = ohlcv(200)
+    df.iloc[50:53, df.columns.get_loc('Close')] = np.nan
+    engine = IndicatorEngine()
+    pd.testing.assert_frame_equal(IndicatorEngine.frame(df, engine.update_frame(df)), add_indicators(df))
@@ -0,0 +1,68 @@
+"""The vectorized buyer/seller split against the original row loop."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from legacy import legacy_buyer_seller_ratio
+from stock_analytics.volume_split import SPLIT_METHODS, buyer_seller_ratio, split_volume
+
+
+def assert_matches_original(df):
+    result, ratio = buyer_seller_ratio(df)
+    expected, expected_ratio = legacy_buyer_seller_ratio(df)
+    pd.testing.assert_frame_equal(result, expected)
+    np.testing.assert_equal(ratio, expected_ratio)
+
+
+@pytest.mark.parametrize('n_rows', [1, 2, 500])
+def test_matches_original(ohlcv, n_rows):
+    assert_matches_original(ohlcv(n_rows))
+
+
+def test_flat_and_missing_bars_match_original(ohlcv):
+    df = ohlcv(200)
+    df.iloc[10:15, df.columns.get_loc('Close')] = df['Open'].iloc[10:15]
+    df.iloc[20, df.columns.get_loc('Close')] = np.nan
+    df.iloc[30, df.columns.get_loc('Volume')] = np.nan
+    assert_matches_original(df)
+
+
+def test_unparseable_values_match_original(ohlcv):
+    df = ohlcv(200).astype({'Open': object, 'Volume': object})
+    df.iloc[5, df.columns.get_loc('Open')] = 'n/a'
+    df.iloc[8, df.columns.get_loc('Volume')] = '1,000'
+    df.iloc[9, df.columns.get_loc('Volume')] = None
+    assert_matches_original(df)
+
+
+def test_no_sell_volume_caps_ratio(ohlcv):
+    df = ohlcv(50)
+    df['Close'] = df['Open'] + 1
+    assert buyer_seller_ratio(df)[1] == legacy_buyer_seller_ratio(df)[1] == 5.0
+
+
+def test_copy_false_adds_columns_in_place(ohlcv):
+    df = ohlcv(50)
+    result, _ = buyer_seller_ratio(df, copy=False)
+    assert result is df and 'Cum_Sell_Volume' in df
+
+
+@pytest.mark.parametrize('method', SPLIT_METHODS)
+def test_split_conserves_volume(ohlcv, method):
+    df = ohlcv(500)
+    buy, sell = split_volume(df, method)
+    assert (buy >= 0).all() and (sell >= 0).all()
+    np.testing.assert_allclose(buy + sell, df['Volume'].to_numpy(dtype=np.float64))
+
+
+def test_tick_rule_keeps_direction_on_unchanged_close():
+    df = pd.DataFrame({'Open': [10.0, 10.0, 10.0, 10.0], 'Close': [11.0, 12.0, 12.0, 11.0],
+                       'Volume': [1.0, 2.0, 3.0, 4.0]})
+    buy, sell = split_volume(df, 'tick')
+    np.testing.assert_array_equal(buy, [1.0, 2.0, 3.0, 0.0])
+    np.testing.assert_array_equal(sell, [0.0, 0.0, 0.0, 4.0])
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        split_volume(pd.DataFrame({'Open': [], 'Close': [], 'Volume': []}), 'vwap')